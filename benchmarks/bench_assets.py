@@ -0,0 +1,60 @@
+"""Asset startup cost: drawing every asset at each cell size.
+
+For each cell size, a fresh AssetManager preloads every asset through
+SDL's dummy video driver, so surfaces are converted to the display format
+as in the game. Also shown: the cost of switching a renderer back to a scale the shared
+managers still hold, and the background memory, a single tile, next to
+what one surface covering a 200x120 board would take.
+
+Run from the repository root:
+    python -m benchmarks.bench_assets
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+from src.ui.asset_manager import AssetManager
+
+CELL_SIZES = [10, 20, 40]
+BOARD = (200, 120)
+
+def time_preload(runs: int, make_manager) -> float:
+    """Preload a new manager runs times; return the best time in seconds."""
+    best = float('inf')
+    for _ in range(runs):
+        manager = make_manager()
+        start = time.perf_counter()
+        manager.preload()
+        manager.finish_preload()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.display.set_mode((800, 600))
+
+    print(f"{'cell':>5} {'draw ms':>9} {'switch ms':>10} {'tile KB':>8} {'full bg MB':>11}")
+    for cell_size in CELL_SIZES:
+        draw = time_preload(args.runs, lambda: AssetManager(cell_size))
+        AssetManager.shared(cell_size).preload()
+        AssetManager.shared(cell_size).finish_preload()
+        start = time.perf_counter()
+        AssetManager.shared(cell_size).preload()
+        AssetManager.shared(cell_size).finish_preload()
+        switch = time.perf_counter() - start
+
+        tile = AssetManager.shared(cell_size).get_background()
+        tile_bytes = tile.get_height() * tile.get_pitch()
+        full_bytes = BOARD[0] * BOARD[1] * cell_size * cell_size * tile.get_bytesize()
+        print(f"{cell_size:>5} {draw * 1000:>9.3f} {switch * 1000:>10.3f} "
+              f"{tile_bytes / 1024:>8.1f} {full_bytes / 2 ** 20:>11.1f}")
+
+if __name__ == "__main__":
+    main()
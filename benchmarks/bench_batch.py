@@ -0,0 +1,61 @@
+"""Throughput of the scalar GameSimulation versus BatchSimulation.
+
+Both engines play random moves and restart finished games. Reported numbers
+are game ticks per second summed over all boards.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.core.batch import BatchSimulation
+from src.core.simulation import GameSimulation, DIRECTIONS
+
+BATCH_SIZES = [64, 1024, 4096]
+
+def bench_scalar(duration: float) -> float:
+    """Step scalar games one by one for duration seconds."""
+    simulation = GameSimulation()
+    rng = random.Random(0)
+    state = simulation.reset(seed=0)
+    ticks = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        for _ in range(1000):
+            simulation.step(state, rng.choice(DIRECTIONS))
+            if state.game_over:
+                state = simulation.reset(seed=ticks)
+        ticks += 1000
+    return ticks / (time.perf_counter() - start)
+
+def bench_batch(num_envs: int, duration: float) -> float:
+    """Step num_envs games in lockstep for duration seconds."""
+    batch = BatchSimulation(num_envs, seed=0)
+    rng = np.random.default_rng(0)
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        batch.step(rng.integers(0, 4, size=num_envs))
+        batch.reset(~batch.alive)
+        steps += 1
+    return steps * num_envs / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=float, default=2.0,
+                        help='seconds to run each case')
+    args = parser.parse_args()
+
+    scalar = bench_scalar(args.duration)
+    print(f"{'engine':>16} {'ticks/s':>14} {'vs scalar':>10}")
+    print(f"{'scalar':>16} {scalar:>14,.0f} {1:>9.1f}x")
+    for num_envs in BATCH_SIZES:
+        rate = bench_batch(num_envs, args.duration)
+        print(f"{f'batch x{num_envs}':>16} {rate:>14,.0f} {rate / scalar:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
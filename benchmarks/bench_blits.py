@@ -0,0 +1,73 @@
+"""Cost of submitting sprites one blit at a time versus in Surface.blits batches.
+
+For each sprite count, the sprites are drawn at scattered grid cells of a
+100x60 board through SDL's dummy video driver, once with a fresh Rect and
+a blit() call per sprite (the renderer's old loop) and once as a single
+blits(..., doreturn=False) call with rectangles precomputed per cell. The
+last rows time the same with the blitting itself taken out (a zero-size
+sprite), leaving only the per-sprite Python overhead.
+
+Run from the repository root:
+    python -m benchmarks.bench_blits
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+from src.utils.config import CELL_SIZE
+
+GRID_SIZE = (100, 60)
+COUNTS = [50, 500, 5000]
+
+def per_sprite(screen, sprite, cells) -> None:
+    """Blit each sprite on its own at a freshly built Rect."""
+    for x, y in cells:
+        screen.blit(sprite, pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+
+def batched(screen, sprite, cells, cell_rects) -> None:
+    """Blit every sprite in one call at precomputed rectangles."""
+    screen.blits([(sprite, cell_rects[cell]) for cell in cells], doreturn=False)
+
+def time_per_call(func, duration: float) -> float:
+    """Call func repeatedly for about duration seconds; return seconds per call."""
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        for _ in range(10):
+            func()
+        calls += 10
+    return (time.perf_counter() - start) / calls
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=float, default=0.5,
+                        help='seconds to spend timing each case')
+    args = parser.parse_args()
+
+    pygame.display.init()
+    width, height = GRID_SIZE
+    screen = pygame.display.set_mode((width * CELL_SIZE, height * CELL_SIZE))
+    sprite = pygame.Surface((CELL_SIZE, CELL_SIZE)).convert()
+    sprite.fill((0, 200, 0))
+    empty = pygame.Surface((0, 0)).convert()
+    cell_rects = {(x, y): pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                  for x in range(width) for y in range(height)}
+    all_cells = list(cell_rects)
+    rng = random.Random(0)
+
+    print(f"{'sprites':>8} {'size':>6} {'blit us':>9} {'blits us':>9} {'speedup':>8}")
+    for source, label in ((sprite, 'cell'), (empty, 'empty')):
+        for count in COUNTS:
+            cells = rng.sample(all_cells, count)
+            loop = time_per_call(lambda: per_sprite(screen, source, cells), args.duration)
+            batch = time_per_call(lambda: batched(screen, source, cells, cell_rects),
+                                  args.duration)
+            print(f"{count:>8} {label:>6} {loop * 1e6:>9.0f} {batch * 1e6:>9.0f} "
+                  f"{loop / batch:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Frame-time trace across music switches: streaming versus crossfading.
+
+Runs the game headlessly (SDL's dummy video and audio drivers) and times
+every frame's update and render while the music switches between the
+normal and the fast game track every --period frames, as it does when a
+speed power-up starts and ends. Two ways of switching are compared:
+
+    stream     pygame.mixer.music.load() and play(), opening and decoding
+               the file on the main thread (the previous behaviour)
+    crossfade  SoundManager.play_music(fade_ms=...), which starts the
+               pre-decoded track on the second music channel
+
+The music files in src/assets/music are streamed if present, otherwise
+WAV copies of the synthesized tracks. Frames around the first switches
+are printed, then the worst frame with and without a switch.
+
+Run from the repository root:
+    python -m benchmarks.bench_music_switch
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import wave
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pygame
+
+from src.audio import MusicTrack
+from src.audio.sound_manager import MUSIC_CROSSFADE_MS
+from src.main import Game
+
+MUSIC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src', 'assets', 'music')
+FILES = {MusicTrack.GAME: 'game.mp3', MusicTrack.GAME_FAST: 'game_fast.mp3'}
+
+def stream_files(manager, directory: str) -> dict:
+    """Get a file to stream for each game track, writing WAVs of synthesized ones."""
+    files = {}
+    for track, filename in FILES.items():
+        path = os.path.join(MUSIC_DIR, filename)
+        if not os.path.exists(path):
+            path = os.path.join(directory, f'{track.name.lower()}.wav')
+            frequency, _, channels = pygame.mixer.get_init()
+            with wave.open(path, 'wb') as file:
+                file.setnchannels(channels)
+                file.setsampwidth(2)
+                file.setframerate(frequency)
+                file.writeframes(manager.music_tracks[track].get_raw())
+        files[track] = path
+    return files
+
+def trace(game: Game, frames: int, period: int, switch) -> list:
+    """Time frames, calling switch(track) every period frames.
+
+    Returns:
+        (milliseconds, switched) for each frame
+    """
+    times = []
+    track = MusicTrack.GAME
+    for frame in range(frames):
+        switched = frame % period == period // 2
+        start = time.perf_counter()
+        if switched:
+            track = MusicTrack.GAME_FAST if track == MusicTrack.GAME else MusicTrack.GAME
+            switch(track)
+        game.handle_input([])
+        game.update()
+        game.render()
+        times.append(((time.perf_counter() - start) * 1000, switched))
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--period', type=int, default=60, help='frames between switches')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.setdefault('SNAKE_ASSET_CACHE', directory)
+        game = Game(unbounded=True, max_ticks_per_frame=1)
+        game.update_music = lambda: None  # Switches come from the trace only
+        manager = game.sound_manager
+        manager.load()
+        # Keep first-use drawing out of the trace
+        game.renderer.asset_manager.preload()
+        game.renderer.asset_manager.finish_preload()
+        files = stream_files(manager, directory)
+
+        def stream(track):
+            pygame.mixer.music.load(files[track])
+            pygame.mixer.music.play(-1)
+
+        def crossfade(track):
+            manager.play_music(track, fade_ms=MUSIC_CROSSFADE_MS)
+
+        results = {}
+        for name, switch in (('stream', stream), ('crossfade', crossfade)):
+            random.seed(1)  # The same game for both
+            game.reset_game()
+            game.render()  # The first frame repaints everything
+            results[name] = trace(game, args.frames, args.period, switch)
+            manager.stop_music()
+            pygame.mixer.music.stop()
+
+    first = args.period // 2
+    print('frame ' + ' '.join(f'{name:>10}' for name in results) + '  (ms)')
+    for frame in list(range(first - 2, first + 3)) + list(range(first + args.period - 2,
+                                                                 first + args.period + 3)):
+        marker = '  <- switch' if results['stream'][frame][1] else ''
+        print(f'{frame:>5} ' + ' '.join(f'{times[frame][0]:>10.3f}' for times in results.values())
+              + marker)
+
+    print()
+    print(f"{'':>9} {'median':>8} {'worst without switch':>21} {'worst switch':>13}")
+    for name, times in results.items():
+        plain = [ms for ms, switched in times if not switched]
+        switches = [ms for ms, switched in times if switched]
+        print(f'{name:>9} {statistics.median(plain):>8.3f} {max(plain):>21.3f} '
+              f'{max(switches):>13.3f}')
+
+if __name__ == "__main__":
+    main()
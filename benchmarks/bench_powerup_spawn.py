@@ -0,0 +1,83 @@
+"""Micro-benchmark for power-up spawn placement.
+
+Compares the old approach (build a set of every cell, subtract the occupied
+ones and pick from the remainder) with sampling the shared FreeCellIndex.
+
+Run from the repository root:
+    python -m benchmarks.bench_powerup_spawn
+"""
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+from src.core.grid import FreeCellIndex
+from src.core.powerup import PowerUpManager
+
+BOARD_SIZES = [(40, 30), (100, 100), (300, 300), (1000, 1000)]
+
+def legacy_spawn_position(width: int, height: int,
+                          snake_positions: List[Tuple[int, int]],
+                          power_up_positions: List[Tuple[int, int]]) -> Tuple[int, int]:
+    """Pick a spawn cell the way PowerUpManager used to."""
+    all_positions = {(x, y) for x in range(width) for y in range(height)}
+    occupied = set(snake_positions)
+    occupied.update(power_up_positions)
+    available = list(all_positions - occupied)
+    return random.choice(available)
+
+def make_snake(width: int, height: int, fill: float) -> List[Tuple[int, int]]:
+    """Lay out a serpentine snake covering a fraction of the board."""
+    length = int(width * height * fill)
+    positions = []
+    for i in range(length):
+        y, x = divmod(i, width)
+        positions.append((x if y % 2 == 0 else width - 1 - x, y))
+    return positions
+
+def time_per_call(func, min_time: float) -> float:
+    """Run func repeatedly for at least min_time seconds, return seconds per call."""
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time or calls < 3:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return elapsed / calls
+
+def bench_board(width: int, height: int, fill: float, min_time: float) -> Tuple[float, float]:
+    """Time one spawn with each approach on a width x height board."""
+    snake = make_snake(width, height, fill)
+
+    legacy = time_per_call(
+        lambda: legacy_spawn_position(width, height, snake, []), min_time
+    )
+
+    free_cells = FreeCellIndex.from_occupied(width, height, snake)
+    manager = PowerUpManager(free_cells)
+
+    def indexed_spawn():
+        manager._spawn_power_up(snake)
+        # Hand the cell back so every call sees the same board
+        free_cells.release(manager.power_ups.pop().get_position())
+
+    indexed = time_per_call(indexed_spawn, min_time)
+    return legacy, indexed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fill', type=float, default=0.25,
+                        help='fraction of the board covered by the snake')
+    parser.add_argument('--min-time', type=float, default=0.5,
+                        help='minimum seconds to spend timing each case')
+    args = parser.parse_args()
+
+    print(f"{'board':>11} {'legacy':>12} {'indexed':>12} {'speedup':>10}")
+    for width, height in BOARD_SIZES:
+        legacy, indexed = bench_board(width, height, args.fill, args.min_time)
+        print(f"{width:>5}x{height:<5} {legacy * 1e6:>10.1f}us {indexed * 1e6:>10.2f}us "
+              f"{legacy / indexed:>9.0f}x")
+
+if __name__ == "__main__":
+    main()
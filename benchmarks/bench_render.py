@@ -0,0 +1,76 @@
+"""Frame time of full redraws versus dirty-rectangle updates.
+
+A snake of each length crawls one cell per frame along a cycle covering a
+100x60 board, with the score changing now and then, rendered headlessly
+through SDL's dummy video driver. The "rebuilt" column passes no move
+counter, so the snake layer is recomputed every frame; the "incremental"
+one repaints only the cells each move touched and should stay flat as the
+snake grows.
+
+Run from the repository root:
+    python -m benchmarks.bench_render
+"""
+import argparse
+import os
+import time
+from collections import deque
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+from src.ui.renderer import Renderer
+from src.utils.config import CELL_SIZE, Difficulty
+
+GRID_SIZE = (100, 60)
+LENGTHS = [10, 500, 5000]
+
+def cycle_path(width: int, height: int):
+    """Cells of a closed path visiting every cell once (height must be even)."""
+    path = [(x, 0) for x in range(width)]
+    for y in range(1, height):
+        xs = range(width - 1, 0, -1) if y % 2 else range(1, width)
+        path.extend((x, y) for x in xs)
+    path.extend((0, y) for y in range(height - 1, 0, -1))
+    return path
+
+def run(renderer: Renderer, path, length: int, frames: int, incremental: bool) -> float:
+    """Render frames with the snake advancing each frame; return seconds per frame."""
+    size = len(path)
+    food = path[size // 2]
+    # Head first, walking forwards along the path
+    body = deque(path[length - 1::-1])
+    start = time.perf_counter()
+    for frame in range(frames):
+        body.appendleft(path[(frame + length) % size])
+        body.pop()
+        renderer.clear_screen()
+        renderer.draw_snake(body, moves=frame if incremental else None)
+        renderer.draw_food(food)
+        renderer.draw_power_ups([])
+        renderer.draw_score(frame // 50)
+        renderer.draw_difficulty(Difficulty.MEDIUM)
+        renderer.draw_active_effects([])
+        renderer.present()
+    return (time.perf_counter() - start) / frames
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    width, height = GRID_SIZE
+    screen = pygame.display.set_mode((width * CELL_SIZE, height * CELL_SIZE))
+    path = cycle_path(width, height)
+
+    print(f"{'length':>7} {'full ms':>9} {'rebuilt ms':>11} {'incremental ms':>15} {'speedup':>8}")
+    for length in LENGTHS:
+        full = run(Renderer(screen, dirty_rects=False), path, length, args.frames, False)
+        rebuilt = run(Renderer(screen, dirty_rects=True), path, length, args.frames, False)
+        incremental = run(Renderer(screen, dirty_rects=True), path, length, args.frames, True)
+        print(f"{length:>7} {full * 1000:>9.2f} {rebuilt * 1000:>11.2f} "
+              f"{incremental * 1000:>15.2f} {full / incremental:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
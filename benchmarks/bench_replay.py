@@ -0,0 +1,63 @@
+"""Replay file size and seek latency for a long recorded game.
+
+Records a game driven by the cycle policy, then compares seeking through
+the snapshot index against re-simulating from the first tick.
+
+Run from the repository root:
+    python -m benchmarks.bench_replay --ticks 1000000
+"""
+import argparse
+import random
+import time
+
+from src.core.policies import POLICIES
+from src.core.replay import Replay, ReplayRecorder, DEFAULT_SNAPSHOT_INTERVAL
+from src.core.simulation import GameSimulation
+
+def record(ticks: int, width: int, height: int, snapshot_interval: int):
+    """Play and record a game of up to ticks ticks."""
+    simulation = GameSimulation(width, height)
+    state = simulation.reset(seed=0)
+    recorder = ReplayRecorder(simulation, state, snapshot_interval)
+    policy = POLICIES['cycle'](random.Random(0))
+    while state.ticks < ticks and not state.game_over:
+        action = policy(state)
+        recorder.record_action(state, action)
+        simulation.step(state, action)
+        recorder.on_tick(state)
+    return recorder.to_bytes()
+
+def seek_from_start(replay: Replay, tick: int) -> None:
+    """Reach tick by simulating every input from the beginning."""
+    state, index = replay.start()
+    while state.ticks < tick:
+        index, _ = replay.step(state, index)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ticks', type=int, default=1_000_000)
+    parser.add_argument('--width', type=int, default=80)
+    parser.add_argument('--height', type=int, default=60)
+    parser.add_argument('--snapshot-interval', type=int, default=DEFAULT_SNAPSHOT_INTERVAL)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    data = record(args.ticks, args.width, args.height, args.snapshot_interval)
+    record_time = time.perf_counter() - start
+    replay = Replay(data)
+    print(f"recorded {replay.total_ticks:,} ticks in {record_time:.2f}s")
+    print(f"file size: {len(data):,} bytes ({len(data) / replay.total_ticks:.3f} bytes/tick), "
+          f"{len(replay.snapshot_ticks)} snapshots")
+
+    target = replay.total_ticks * 3 // 4
+    start = time.perf_counter()
+    replay.state_at(target)
+    seek_time = time.perf_counter() - start
+    start = time.perf_counter()
+    seek_from_start(replay, target)
+    full_time = time.perf_counter() - start
+    print(f"seek to tick {target:,}: {seek_time * 1000:.1f} ms via snapshots, "
+          f"{full_time * 1000:.1f} ms from the start ({full_time / seek_time:.0f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Cold start: time from launching Python to the game's first frame.
+
+Starts fresh interpreters that import src.main, create a Game and draw
+one frame on SDL's dummy video and audio drivers, and reports the median
+time from process launch to that frame. A second set of runs under
+python -X importtime breaks the imports down: pygame (which pulls in
+NumPy itself), the game's own modules and the slowest of them, next to
+the startup phases timed by StartupTrace.
+
+With --max-ms the exit status is 1 if the median exceeds the budget, so
+CI can track time to first frame as a regression metric. The sound cache
+is warmed by one untimed run first.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 10 --max-ms 600
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+CHILD = '''
+import json, time
+started = time.perf_counter()
+import src.main as main
+game = main.Game(trace=main.StartupTrace(started))
+game.render()
+print(json.dumps({'first_frame': time.time(), 'phases': game.trace.phases}))
+'''
+
+def launch(env: dict, importtime: bool):
+    """Run one cold start; return (seconds to first frame, child output, stderr)."""
+    flags = ['-X', 'importtime'] if importtime else []
+    start = time.time()
+    result = subprocess.run([sys.executable, *flags, '-c', CHILD], env=env,
+                            capture_output=True, text=True, check=True)
+    output = json.loads(result.stdout.strip().splitlines()[-1])
+    return output['first_frame'] - start, output, result.stderr
+
+def parse_importtime(stderr: str) -> dict:
+    """Map each module to its (self, cumulative) import time in milliseconds."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(own) / 1000, int(cumulative) / 1000)
+    return modules
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, help='fail if the median exceeds this')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache:
+        env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy',
+                   SNAKE_ASSET_CACHE=cache, PYGAME_HIDE_SUPPORT_PROMPT='1',
+                   PYTHONPATH=os.getcwd())
+        launch(env, importtime=False)
+        first_frames = [launch(env, importtime=False)[0] * 1000 for _ in range(args.runs)]
+
+        own = defaultdict(list)
+        pygame_ms = []
+        phases = defaultdict(list)
+        for _ in range(args.runs):
+            _, output, stderr = launch(env, importtime=True)
+            modules = parse_importtime(stderr)
+            pygame_ms.append(modules['pygame'][1])
+            for name, (self_ms, _) in modules.items():
+                if name == 'src' or name.startswith('src.'):
+                    own[name].append(self_ms)
+            for name, _, begin, end in output['phases']:
+                phases[name].append((end - begin) * 1000)
+
+    median = statistics.median(first_frames)
+    print(f"time to first frame: median {median:.1f} ms "
+          f"(min {min(first_frames):.1f}, max {max(first_frames):.1f}) over {args.runs} runs")
+    own_total = sum(statistics.median(times) for times in own.values())
+    print(f"imports: pygame {statistics.median(pygame_ms):.1f} ms, "
+          f"game modules {own_total:.1f} ms (self time, under -X importtime)")
+    slowest = sorted(own.items(), key=lambda item: -statistics.median(item[1]))[:5]
+    print("slowest game modules: "
+          + ', '.join(f"{name} {statistics.median(times):.1f}" for name, times in slowest))
+    print("phases: " + ', '.join(f"{name} {statistics.median(times):.1f} ms"
+                                 for name, times in phases.items()))
+
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"time to first frame {median:.1f} ms exceeds the budget of {args.max_ms:.0f} ms",
+              file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Clone cost and memory per game state, snapshots versus deepcopy.
+
+Snakes are grown to each length along the cycle policy's path on the
+default board, then copied with copy.deepcopy, snapshot(), restore() into
+a reused state, and clone().
+
+Run from the repository root:
+    python -m benchmarks.bench_state
+"""
+import argparse
+import copy
+import random
+import time
+import tracemalloc
+
+from src.core.policies import POLICIES
+from src.core.simulation import GameSimulation
+
+LENGTHS = [3, 100, 1000]
+
+def grown_state(length: int):
+    """Play a seeded game, growing the snake every tick until it is length long."""
+    simulation = GameSimulation()
+    state = simulation.reset(seed=0)
+    policy = POLICIES['cycle'](random.Random(0))
+    while state.snake.get_length() < length:
+        state.snake.grow()
+        simulation.step(state, policy(state))
+    return simulation, state
+
+def time_per_call(func, duration: float) -> float:
+    """Call func repeatedly for about duration seconds; return seconds per call."""
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        for _ in range(100):
+            func()
+        calls += 100
+    return (time.perf_counter() - start) / calls
+
+def bytes_per_copy(func, copies: int = 200) -> float:
+    """Measure the memory retained by each result of func."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [func() for _ in range(copies)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / copies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=float, default=0.5,
+                        help='seconds to run each case')
+    args = parser.parse_args()
+
+    print(f"{'length':>7} {'method':>10} {'us/copy':>10} {'bytes/copy':>12}")
+    for length in LENGTHS:
+        simulation, state = grown_state(length)
+        snapshot = state.snapshot()
+        target = simulation.reset(seed=1)
+        cases = [
+            ('deepcopy', lambda: copy.deepcopy(state), True),
+            ('snapshot', state.snapshot, True),
+            ('restore', lambda: target.restore(snapshot), False),
+            ('clone', state.clone, True),
+        ]
+        for name, func, keeps in cases:
+            seconds = time_per_call(func, args.duration)
+            size = f"{bytes_per_copy(func):>12,.0f}" if keeps else f"{'-':>12}"
+            print(f"{length:>7} {name:>10} {seconds * 1e6:>10.1f} {size}")
+
+if __name__ == "__main__":
+    main()
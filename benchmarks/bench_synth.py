@@ -0,0 +1,68 @@
+"""Sound startup cost: synthesizing every sound versus loading it from the cache.
+
+Each patch is rendered with NumPy, then a fresh Synthesizer gets it with
+an empty cache directory (cold start: render and save) and with a filled
+one (warm start: SDL loads the cached WAV), as a mixer Sound. The mixer runs on
+SDL's dummy audio driver.
+
+Run from the repository root:
+    python -m benchmarks.bench_synth
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pygame
+
+from src.audio.synth import MUSIC_PATCHES, SOUND_PATCHES, Synthesizer, render_patch
+
+def best_time(runs: int, function) -> float:
+    """Run function runs times; return the best time in seconds."""
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    pygame.mixer.init()
+    rate, _, channels = pygame.mixer.get_init()
+    root = tempfile.mkdtemp()
+    warm_dir = os.path.join(root, 'warm')
+    cold_dir = os.path.join(root, 'cold')
+
+    def cold(name):
+        shutil.rmtree(cold_dir, ignore_errors=True)
+        Synthesizer(cold_dir).sound(name)
+
+    print(f"{rate} Hz, {channels} channels")
+    print(f"{'sound':>10} {'seconds':>8} {'KB':>7} {'render ms':>10} {'cold ms':>8} {'warm ms':>8}")
+    totals = [0.0, 0.0, 0.0]
+    try:
+        for name, patch in {**SOUND_PATCHES, **MUSIC_PATCHES}.items():
+            frames = len(render_patch(patch, rate, channels))
+            Synthesizer(warm_dir).sound(name)
+            times = (
+                best_time(args.runs, lambda: render_patch(patch, rate, channels)),
+                best_time(args.runs, lambda: cold(name)),
+                best_time(args.runs, lambda: Synthesizer(warm_dir).sound(name)),
+            )
+            totals = [total + seconds for total, seconds in zip(totals, times)]
+            print(f"{name:>10} {frames / rate:>8.2f} {frames * channels * 2 / 1024:>7.0f} "
+                  + ' '.join(f"{seconds * 1000:>{width}.3f}"
+                             for seconds, width in zip(times, (10, 8, 8))))
+        print(f"{'total':>10} {'':>8} {'':>7} "
+              + ' '.join(f"{seconds * 1000:>{width}.3f}" for seconds, width in zip(totals, (10, 8, 8))))
+    finally:
+        shutil.rmtree(root)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 """Game launcher."""
-from src.main import Game
+import time
+
+def launch():
+    """Start the game, timing startup from before its imports."""
+    started = time.perf_counter()
+    from src.main import main
+    main(started=started)
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    launch()
@@ -1,8 +1,31 @@
-"""Sound management system for the game."""
+"""Sound management system for the game.
+
+Sound effects play on a fixed pool of mixer channels owned by the
+SoundManager. Each effect has a SoundPolicy: a request that follows the
+last play of the same effect too closely is coalesced into it, an effect
+never holds more than its own number of voices, and when every channel is
+busy a new sound steals the voice of the least important, oldest sound,
+unless that one matters more. Game over and eating therefore stay audible
+however fast the arrow keys are hammered.
+
+Music tracks are decoded into Sounds when loading, like effects, and play
+on two channels of their own, so switching tracks never decodes or opens
+a file on the main thread and one track can crossfade into the next.
+Sounds and music missing from src/assets are synthesized instead (see
+src.audio.synth).
+
+Loading, which also opens the mixer, can be deferred to a worker thread
+with load=False and load(). Until then, effects are silent and the music
+asked for starts once start_pending_music() runs after loading. Without
+an audio device the game simply stays silent.
+"""
 import os
 from enum import Enum, auto
+from typing import List, NamedTuple, Optional
 import pygame
 
+from src.utils.timing import RealClock
+
 class SoundEffect(Enum):
     """Enumeration of available sound effects."""
     MOVE = auto()
@@ -13,6 +36,39 @@ class SoundEffect(Enum):
     SCORE = auto()
     GAME_OVER = auto()
 
+class SoundPolicy(NamedTuple):
+    """How an effect competes for mixer channels."""
+    priority: int  # Higher steals voices from lower, never the reverse
+    min_interval: float  # Seconds; requests closer than this are coalesced
+    max_voices: int  # Channels the effect may hold at once
+
+SOUND_CHANNELS = 8
+MUSIC_CROSSFADE_MS = 800  # Length of the fade when the music changes with the game
+
+SOUND_POLICIES = {
+    SoundEffect.MOVE: SoundPolicy(0, 0.06, 1),
+    SoundEffect.EAT: SoundPolicy(2, 0.0, 2),
+    SoundEffect.POWER_UP: SoundPolicy(1, 0.1, 1),
+    SoundEffect.SHIELD: SoundPolicy(1, 0.1, 1),
+    SoundEffect.SPEED: SoundPolicy(1, 0.1, 1),
+    SoundEffect.SCORE: SoundPolicy(1, 0.1, 1),
+    SoundEffect.GAME_OVER: SoundPolicy(3, 0.0, 1),
+}
+
+class SoundStats:
+    """Counters of sound effect requests and what became of them."""
+
+    def __init__(self):
+        self.requested = 0  # Calls to play_sound while sounds are enabled
+        self.played = 0  # Started on a channel, stolen or not
+        self.coalesced = 0  # Merged into a play of the same effect just before
+        self.stolen = 0  # Started by cutting off another sound
+        self.dropped = 0  # Every channel held something more important
+
+    def __str__(self) -> str:
+        return (f'sfx {self.played}/{self.requested} played, {self.coalesced} coalesced, '
+                f'{self.stolen} stolen, {self.dropped} dropped')
+
 class MusicTrack(Enum):
     """Enumeration of available music tracks."""
     MENU = auto()
@@ -22,21 +78,83 @@ class MusicTrack(Enum):
 class SoundManager:
     """Manages all game audio including sound effects and music."""
     
-    def __init__(self):
-        """Initialize the sound system."""
+    def __init__(self, clock=None, channels: int = SOUND_CHANNELS, load: bool = True):
+        """Initialize the sound system.
+
+        Args:
+            clock: Any object with a now() method, used for rate limits;
+                defaults to RealClock
+            channels: Size of the sound effect channel pool
+            load: Load sounds now; otherwise call load(), e.g. on a
+                worker thread, and start_pending_music() afterwards
+        """
         self.sounds = {}
         self.music_tracks = {}
         self.sound_volume = 0.7
         self.music_volume = 0.5
         self.sounds_enabled = True
         self.music_enabled = True
-        
-        # Ensure pygame mixer is initialized
-        if not pygame.mixer.get_init():
-            pygame.mixer.init()
-        
-        self._load_sounds()
-        self._load_music()
+        self.clock = clock or RealClock()
+        self.stats = SoundStats()
+        self.channel_count = channels
+        self.channels = []  # Effect pool, once the mixer is open
+        self.music_channels = []  # The current track's, then the fading one's
+        self.current_music: Optional[MusicTrack] = None
+        self._voices: List[Optional[SoundEffect]] = [None] * channels
+        self._started = [0] * channels  # Play order, to find the oldest voice
+        self._plays = 0
+        self._last_played = {}
+        self.loaded = False
+        self.synth = None
+        self._pending_music = None  # (track, loop) asked for before loading finished
+        self._music_paused = False
+
+        if load:
+            self.load()
+
+    def load(self):
+        """Open the mixer, then load effects and music, synthesizing missing ones.
+
+        Only touches the manager's own state, so it may run on a worker
+        thread while the game plays silently.
+        """
+        if self._open_mixer():
+            # Imported here, off the main thread when loading in the background
+            from src.audio.synth import Synthesizer
+            try:
+                self.synth = Synthesizer()
+            except pygame.error:
+                self.synth = None  # Mixer format it cannot render; files only
+            self._load_sounds()
+            self._load_music()
+        self.loaded = True
+
+    def _open_mixer(self) -> bool:
+        """Initialize the mixer and claim its channels; return False if there is no audio."""
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except pygame.error as error:
+            print(f"Warning: No audio, playing without sound ({error})")
+            return False
+
+        # Keep Sound.play() elsewhere from taking the pool's channels, and
+        # add two for music: the current track and the one fading out
+        count = self.channel_count
+        pygame.mixer.set_num_channels(count + 2)
+        pygame.mixer.set_reserved(count + 2)
+        self.music_channels = [pygame.mixer.Channel(count), pygame.mixer.Channel(count + 1)]
+        self.channels = [pygame.mixer.Channel(i) for i in range(count)]
+        return True
+
+    def start_pending_music(self):
+        """Start the music asked for while loading, once load() has finished."""
+        if self.loaded and self._pending_music:
+            track, loop = self._pending_music
+            self._pending_music = None
+            self.play_music(track, loop)
+            if self._music_paused:
+                self.pause_music()
     
     def _load_sounds(self):
         """Load all sound effects."""
@@ -53,18 +171,24 @@ class SoundManager:
             SoundEffect.GAME_OVER: 'gameover.wav'
         }
         
-        # Load each sound if file exists
+        # Load each sound if file exists, or synthesize it
         for effect, filename in sound_files.items():
             path = os.path.join(sound_dir, filename)
-            if os.path.exists(path):
-                try:
-                    self.sounds[effect] = pygame.mixer.Sound(path)
-                    self.sounds[effect].set_volume(self.sound_volume)
-                except pygame.error:
-                    print(f"Warning: Could not load sound {filename}")
+            try:
+                if os.path.exists(path):
+                    sound = pygame.mixer.Sound(path)
+                elif self.synth:
+                    sound = self.synth.sound(os.path.splitext(filename)[0])
+                else:
+                    continue
+                sound.set_volume(self.sound_volume)
+                # Replace rather than update the dict, which may be in use elsewhere
+                self.sounds = {**self.sounds, effect: sound}
+            except pygame.error:
+                print(f"Warning: Could not load sound {filename}")
     
     def _load_music(self):
-        """Load all music tracks."""
+        """Load and decode all music tracks."""
         music_dir = os.path.join(os.path.dirname(__file__), '..', 'assets', 'music')
         
         # Define music mappings
@@ -74,44 +198,120 @@ class SoundManager:
             MusicTrack.GAME_FAST: 'game_fast.mp3'
         }
         
-        # Store music track paths
+        # Decode each track if the file exists, or synthesize it
+        tracks = {}
         for track, filename in music_files.items():
             path = os.path.join(music_dir, filename)
-            if os.path.exists(path):
-                self.music_tracks[track] = path
+            try:
+                if os.path.exists(path):
+                    tracks[track] = pygame.mixer.Sound(path)
+                elif self.synth:
+                    tracks[track] = self.synth.sound(os.path.splitext(filename)[0])
+            except pygame.error:
+                print(f"Warning: Could not load music track {filename}")
+        self.music_tracks = tracks
     
     def play_sound(self, effect: SoundEffect):
-        """Play a sound effect."""
+        """Play a sound effect on a channel of the pool.
+
+        Returns:
+            True if the sound started
+        """
         if not self.sounds_enabled:
-            return
-            
-        if effect in self.sounds:
-            self.sounds[effect].play()
+            return False
+        self.stats.requested += 1
+        sound = self.sounds.get(effect)
+        if sound is None:
+            return False
+
+        policy = SOUND_POLICIES[effect]
+        now = self.clock.now()
+        last = self._last_played.get(effect)
+        if last is not None and now - last < policy.min_interval:
+            self.stats.coalesced += 1
+            return False
+
+        index = self._find_channel(effect, policy)
+        if index is None:
+            self.stats.dropped += 1
+            return False
+        if self.channels[index].get_busy():
+            self.stats.stolen += 1
+        self.channels[index].play(sound)
+        self._voices[index] = effect
+        self._plays += 1
+        self._started[index] = self._plays
+        self._last_played[effect] = now
+        self.stats.played += 1
+        return True
+
+    def _find_channel(self, effect: SoundEffect, policy: SoundPolicy) -> Optional[int]:
+        """Get the channel to play effect on: a free one, or the voice to steal."""
+        own = []
+        free = None
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                self._voices[index] = None
+                if free is None:
+                    free = index
+            elif self._voices[index] == effect:
+                own.append(index)
+        if len(own) >= policy.max_voices:
+            # Restart the effect's oldest voice rather than stack another
+            return min(own, key=self._started.__getitem__)
+        if free is not None:
+            return free
+
+        def importance(index):
+            voice = self._voices[index]
+            priority = SOUND_POLICIES[voice].priority if voice else -1
+            return (priority, self._started[index])
+        victim = min(range(len(self.channels)), key=importance)
+        if importance(victim)[0] > policy.priority:
+            return None
+        return victim
     
-    def play_music(self, track: MusicTrack, loop: bool = True):
-        """Play a music track."""
+    def play_music(self, track: MusicTrack, loop: bool = True, fade_ms: int = 0):
+        """Play a music track, crossfading from the current one over fade_ms."""
         if not self.music_enabled:
             return
-            
-        if track in self.music_tracks:
-            try:
-                pygame.mixer.music.load(self.music_tracks[track])
-                pygame.mixer.music.set_volume(self.music_volume)
-                pygame.mixer.music.play(-1 if loop else 0)
-            except pygame.error:
-                print(f"Warning: Could not play music track {track.name}")
+        if not self.loaded:
+            self._pending_music = (track, loop)
+            return
+        sound = self.music_tracks.get(track)
+        if sound is None:
+            return
+        self._music_paused = False
+
+        # The mixer does the fading, so this returns at once
+        outgoing, incoming = self.music_channels
+        if fade_ms:
+            outgoing.fadeout(fade_ms)
+        else:
+            outgoing.stop()
+        incoming.set_volume(self.music_volume)
+        incoming.play(sound, loops=-1 if loop else 0, fade_ms=fade_ms)
+        self.music_channels.reverse()
+        self.current_music = track
     
     def stop_music(self):
         """Stop currently playing music."""
-        pygame.mixer.music.stop()
+        self._pending_music = None
+        self.current_music = None
+        for channel in self.music_channels:
+            channel.stop()
     
     def pause_music(self):
         """Pause currently playing music."""
-        pygame.mixer.music.pause()
+        self._music_paused = True
+        for channel in self.music_channels:
+            channel.pause()
     
     def unpause_music(self):
         """Unpause currently playing music."""
-        pygame.mixer.music.unpause()
+        self._music_paused = False
+        for channel in self.music_channels:
+            channel.unpause()
     
     def set_sound_volume(self, volume: float):
         """Set volume for sound effects (0.0 to 1.0)."""
@@ -122,7 +322,8 @@ class SoundManager:
     def set_music_volume(self, volume: float):
         """Set volume for music (0.0 to 1.0)."""
         self.music_volume = max(0.0, min(1.0, volume))
-        pygame.mixer.music.set_volume(self.music_volume)
+        if self.music_channels:
+            self.music_channels[0].set_volume(self.music_volume)
     
     def toggle_sounds(self, enabled: bool):
         """Enable or disable sound effects."""
@@ -0,0 +1,175 @@
+"""Procedural 8-bit sound effects and music.
+
+A sound is described by a patch: one or more Voices, each a classic
+chiptune waveform (pulse, triangle, sawtooth or noise) stepping through a
+sequence of notes. Synthesizer renders patches with NumPy into 16-bit PCM
+at the mixer's sample rate, as pygame.mixer.Sound buffers: short loops
+for music as well as effects, so switching tracks never decodes anything.
+
+Rendered sounds are cached on disk as WAV files, keyed by a hash of the
+patch, the mixer format and SYNTH_CACHE_VERSION, so later launches have
+SDL load the samples back instead of synthesizing them again.
+"""
+import hashlib
+import io
+import os
+import wave
+from typing import Dict, NamedTuple, Optional, Tuple
+import numpy as np
+import pygame
+
+from src.utils.cache import cache_dir, write_atomic
+
+# Bump to discard every cached sound, e.g. when the synthesis changes
+SYNTH_CACHE_VERSION = 2
+# Samples faded in and out at the ends of each note so notes do not click
+FADE_SAMPLES = 64
+
+class Voice(NamedTuple):
+    """One chiptune channel: a waveform playing a sequence of notes."""
+    wave: str  # 'pulse', 'triangle', 'saw' or 'noise'
+    notes: Tuple[Optional[int], ...]  # MIDI note numbers, None for a rest
+    step: float  # Seconds per note
+    volume: float = 0.5
+    duty: float = 0.5  # Fraction of each pulse period spent high
+    slide: float = 0.0  # Semitones the pitch bends over each note
+    decay: float = 0.0  # Fraction of the volume lost by the end of each note
+
+Patch = Tuple[Voice, ...]
+
+def _song(lead: Tuple[Optional[int], ...], roots: Tuple[int, ...], step: float) -> Patch:
+    """Build a loop of lead, bass and drums, one bar of eight steps per root note."""
+    bass = tuple(note for root in roots
+                 for note in (root, None, root + 12, None, root, None, root + 12, root + 7))
+    drums = (96, None, 72, None, 96, 96, 72, None) * len(roots)
+    return (
+        Voice('pulse', lead, step, 0.25, duty=0.25, decay=0.4),
+        Voice('triangle', bass, step, 0.45, decay=0.2),
+        Voice('noise', drums, step, 0.12, decay=1.0),
+    )
+
+GAME_LEAD = (69, None, 72, 69, 76, None, 74, 72, 69, None, 72, 74, 76, 74, 72, None,
+             65, None, 69, 65, 72, None, 71, 69, 67, None, 71, 74, 71, None, 67, None)
+MENU_LEAD = (72, None, 76, None, 79, None, 76, None, 77, None, 81, None, 79, 77, 76, None,
+             74, None, 79, None, 83, None, 79, 77, 76, 74, 72, None, 72, None, None, None)
+
+# Name -> patch, named after the sound files they stand in for
+SOUND_PATCHES: Dict[str, Patch] = {
+    'move': (Voice('pulse', (84,), 0.035, 0.2, duty=0.25, decay=1.0),),
+    'eat': (Voice('pulse', (72, 76, 79, 84), 0.045, 0.35, decay=0.4),),
+    'powerup': (Voice('pulse', (60, 64, 67, 72, 76, 79, 84), 0.04, 0.3, duty=0.25, decay=0.3),),
+    'shield': (
+        Voice('triangle', (55, 62, 67, 74), 0.08, 0.6, slide=2, decay=0.3),
+        Voice('pulse', (67, 74, 79, 86), 0.08, 0.15, duty=0.125, decay=0.5),
+    ),
+    'speed': (Voice('saw', (48,), 0.35, 0.3, slide=36, decay=0.7),),
+    'score': (Voice('pulse', (79, 84, 79, 84, 91), 0.05, 0.3, duty=0.125, decay=0.3),),
+    'gameover': (
+        Voice('pulse', (67, 63, 60, 55), 0.2, 0.35, slide=-1, decay=0.5),
+        Voice('noise', (None, None, None, 60), 0.2, 0.3, decay=1.0),
+    ),
+}
+MUSIC_PATCHES: Dict[str, Patch] = {
+    'menu': _song(MENU_LEAD, (48, 53, 55, 48), 0.2),
+    'game': _song(GAME_LEAD, (45, 45, 41, 43), 0.14),
+    'game_fast': _song(GAME_LEAD, (45, 45, 41, 43), 0.1),
+}
+
+# Levels the noise channel holds, each for an eighth of a period, like the NES
+_NOISE = np.random.default_rng(0).choice([-1.0, 1.0], 4096)
+
+_WAVES = {
+    'pulse': lambda phase, duty: np.where(phase % 1.0 < duty, 1.0, -1.0),
+    'triangle': lambda phase, duty: 4.0 * np.abs(phase % 1.0 - 0.5) - 1.0,
+    'saw': lambda phase, duty: 2.0 * (phase % 1.0) - 1.0,
+    'noise': lambda phase, duty: _NOISE[(phase * 8).astype(np.int64) % len(_NOISE)],
+}
+
+def default_cache_dir() -> str:
+    """Get the versioned directory cached sounds live in."""
+    return cache_dir(f'sounds-v{SYNTH_CACHE_VERSION}')
+
+def render_voice(voice: Voice, sample_rate: int) -> np.ndarray:
+    """Render a voice to float samples between -volume and volume."""
+    length = round(voice.step * sample_rate)
+    t = np.arange(length) / sample_rate
+    edges = np.minimum(np.arange(length), np.arange(length)[::-1])
+    envelope = voice.volume * (1.0 - voice.decay * t / voice.step) \
+        * np.minimum(1.0, edges / FADE_SAMPLES)
+    bend = 2.0 ** (voice.slide * t / voice.step / 12)
+    wave_of = _WAVES[voice.wave]
+
+    samples = np.zeros(length * len(voice.notes))
+    for index, note in enumerate(voice.notes):
+        if note is None:
+            continue
+        frequency = 440.0 * 2.0 ** ((note - 69) / 12) * bend
+        phase = np.cumsum(frequency) / sample_rate
+        samples[index * length:(index + 1) * length] = wave_of(phase, voice.duty) * envelope
+    return samples
+
+def render_patch(patch: Patch, sample_rate: int, channels: int) -> np.ndarray:
+    """Mix a patch's voices into 16-bit samples shaped (frames, channels)."""
+    voices = [render_voice(voice, sample_rate) for voice in patch]
+    mixed = np.zeros(max(len(samples) for samples in voices))
+    for samples in voices:
+        mixed[:len(samples)] += samples
+    pcm = (np.clip(mixed, -1.0, 1.0) * 32767).astype(np.int16)
+    return np.repeat(pcm[:, None], channels, axis=1)
+
+class Synthesizer:
+    """Renders patches in the open mixer's format, through the on-disk cache."""
+
+    def __init__(self, cache_dir: Optional[str] = None, use_cache: bool = True):
+        """
+        Args:
+            cache_dir: Where rendered sounds are cached, by default
+                default_cache_dir()
+            use_cache: Read and write the on-disk cache at all
+
+        Raises:
+            pygame.error: If the mixer is closed or not 16-bit signed
+        """
+        init = pygame.mixer.get_init()
+        if not init or init[1] != -16:
+            raise pygame.error(f'cannot synthesize for mixer format {init}')
+        self.sample_rate, _, self.channels = init
+        self.cache_dir = (cache_dir or default_cache_dir()) if use_cache else None
+        self.synthesized = 0  # Sounds rendered because the cache had no copy
+        self.loaded = 0  # Sounds read from the cache
+
+    def _cache_path(self, name: str, patch: Patch) -> str:
+        """Get the cache file of a patch rendered in this mixer format."""
+        digest = hashlib.sha1(
+            f'{SYNTH_CACHE_VERSION}:{self.sample_rate}:{self.channels}:{patch!r}'.encode())
+        return os.path.join(self.cache_dir, f'{name}-{digest.hexdigest()[:16]}.wav')
+
+    def _wav(self, pcm: bytes) -> bytes:
+        """Wrap interleaved 16-bit PCM in a WAV file of the mixer's format."""
+        file = io.BytesIO()
+        with wave.open(file, 'wb') as writer:
+            writer.setnchannels(self.channels)
+            writer.setsampwidth(2)
+            writer.setframerate(self.sample_rate)
+            writer.writeframes(pcm)
+        return file.getvalue()
+
+    def sound(self, name: str) -> pygame.mixer.Sound:
+        """Get one of SOUND_PATCHES or MUSIC_PATCHES as a Sound, from the cache if possible."""
+        patch = SOUND_PATCHES[name] if name in SOUND_PATCHES else MUSIC_PATCHES[name]
+        if self.cache_dir is not None:
+            path = self._cache_path(name, patch)
+            try:
+                # SDL reads the file straight into the Sound, already in the
+                # mixer's format, so the samples never pass through Python
+                sound = pygame.mixer.Sound(file=path)
+                self.loaded += 1
+                return sound
+            except (OSError, pygame.error):
+                pass  # Not rendered yet, or unreadable
+
+        pcm = render_patch(patch, self.sample_rate, self.channels).tobytes()
+        self.synthesized += 1
+        if self.cache_dir is not None:
+            write_atomic(path, self._wav(pcm))
+        return pygame.mixer.Sound(buffer=pcm)
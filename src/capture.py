@@ -0,0 +1,213 @@
+"""Headless frame capture, for render regression tests and benchmarks.
+
+Drives the Renderer through SDL's dummy video driver from a seeded game
+played by an autoplay policy, or from a recorded replay, one frame per
+tick. Every frame is hashed, and can be written to a memory-mapped .npy
+array of shape (frames, height, width, 3) or to a numbered PNG sequence.
+Hashes are compared against, or saved as, a golden file so CI can spot a
+frame that changed without storing images. Golden hashes are only stable
+for one pygame/SDL build, since blending and antialiasing may differ
+between versions.
+
+Usage:
+    python -m src.capture --seed 1 --frames 600 --golden tests/golden.json
+    python -m src.capture --replay run.snkr --raw frames.npy --png frames/
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from typing import Iterator, List, Optional
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+from src.utils.config import CELL_SIZE, Difficulty
+from src.core.policies import POLICIES
+from src.core.powerup import PowerUpType
+from src.core.replay import Replay, ReplayPlayer
+from src.core.simulation import GameSimulation, SimulationState
+from src.ui.renderer import Renderer
+
+class CaptureResult:
+    """Hashes and timings of a capture run."""
+
+    def __init__(self):
+        self.hashes: List[str] = []
+        self.render_seconds = 0.0  # Drawing and presenting only
+        self.total_seconds = 0.0  # Including reading back and writing frames
+
+    @property
+    def frames(self) -> int:
+        """Number of frames captured."""
+        return len(self.hashes)
+
+    @property
+    def render_fps(self) -> float:
+        """Frames rendered per second, excluding capture overhead."""
+        return self.frames / self.render_seconds if self.render_seconds else 0.0
+
+    @property
+    def total_fps(self) -> float:
+        """Frames captured per second, end to end."""
+        return self.frames / self.total_seconds if self.total_seconds else 0.0
+
+def open_display(grid_width: int, grid_height: int, cell_size: int = CELL_SIZE) -> pygame.Surface:
+    """Open a display fitting the board, on the dummy driver unless told otherwise."""
+    pygame.display.init()
+    pygame.font.init()
+    return pygame.display.set_mode((grid_width * cell_size, grid_height * cell_size))
+
+def seeded_states(seed: int, policy_name: str, frames: int,
+                  difficulty: str = Difficulty.MEDIUM,
+                  simulation: Optional[GameSimulation] = None) -> Iterator[SimulationState]:
+    """Play a seeded game with a policy, yielding the state after each tick."""
+    simulation = simulation or GameSimulation()
+    state = simulation.reset(seed=seed, difficulty=difficulty)
+    policy = POLICIES[policy_name](random.Random(seed))
+    for _ in range(frames):
+        if state.game_over:
+            return
+        simulation.step(state, policy(state))
+        yield state
+
+def replay_states(replay: Replay, frames: int) -> Iterator[SimulationState]:
+    """Play back a replay, yielding the state after each tick."""
+    player = ReplayPlayer(replay)
+    for _ in range(frames):
+        if player.is_finished():
+            return
+        player.step()
+        yield player.state
+
+def draw_state(renderer: Renderer, state: SimulationState) -> None:
+    """Draw and present one frame of a game the way Game.render does."""
+    manager = state.power_up_manager
+    renderer.clear_screen()
+    renderer.draw_snake(state.snake.get_body_positions(),
+                        manager.has_active_effect(PowerUpType.SHIELD), state.snake.moves)
+    renderer.draw_food(state.food.get_position())
+    renderer.draw_power_ups(manager.power_ups)
+    renderer.draw_score(state.score)
+    renderer.draw_difficulty(state.difficulty)
+    renderer.draw_active_effects(manager.get_active_effects(), state.time)
+    if state.game_over:
+        renderer.draw_game_over()
+    renderer.present()
+
+def frame_hash(pixels: bytes) -> str:
+    """Get a short, stable hash of a frame's RGB bytes."""
+    # SHA-256 is the fastest strong hash in hashlib on common CPUs
+    return hashlib.sha256(pixels).hexdigest()[:16]
+
+def capture(renderer: Renderer, states, frames: int, raw_path: Optional[str] = None,
+            png_dir: Optional[str] = None) -> CaptureResult:
+    """Render up to frames states, hashing each frame and optionally saving it.
+
+    Args:
+        renderer: Renderer drawing onto the display surface
+        states: Iterable of game states, one per frame
+        frames: Size of the raw array; states beyond it are not drawn
+        raw_path: Write frames to this memory-mapped .npy file. Frames
+            never drawn, if the game ends early, are left black.
+        png_dir: Write frames as frame-00000.png and so on
+    """
+    result = CaptureResult()
+    screen = renderer.screen
+    width, height = screen.get_size()
+    raw = None
+    if raw_path:
+        import numpy as np
+        raw = np.lib.format.open_memmap(raw_path, mode='w+', dtype=np.uint8,
+                                        shape=(frames, height, width, 3))
+    if png_dir:
+        os.makedirs(png_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    for index, state in enumerate(states):
+        if index >= frames:
+            break
+        render_start = time.perf_counter()
+        draw_state(renderer, state)
+        result.render_seconds += time.perf_counter() - render_start
+
+        pixels = pygame.image.tobytes(screen, 'RGB')
+        result.hashes.append(frame_hash(pixels))
+        if raw is not None:
+            raw[index] = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 3)
+        if png_dir:
+            pygame.image.save(screen, os.path.join(png_dir, f'frame-{index:05d}.png'))
+    result.total_seconds = time.perf_counter() - start
+    if raw is not None:
+        raw.flush()
+    return result
+
+def compare_hashes(hashes: List[str], golden: List[str]) -> List[int]:
+    """Get the indices of frames that differ from the golden ones, or are missing."""
+    mismatched = [i for i, (actual, expected) in enumerate(zip(hashes, golden))
+                  if actual != expected]
+    mismatched.extend(range(min(len(hashes), len(golden)), max(len(hashes), len(golden))))
+    return mismatched
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Render game frames headlessly and check them.")
+    parser.add_argument('--replay', metavar='FILE', help='render a recorded replay')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the game to play')
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--difficulty', default=Difficulty.MEDIUM,
+                        choices=[Difficulty.EASY, Difficulty.MEDIUM, Difficulty.HARD])
+    parser.add_argument('--frames', type=int, default=600, help='most frames to render')
+    parser.add_argument('--cell-size', type=int, default=CELL_SIZE)
+    parser.add_argument('--full-redraw', action='store_true',
+                        help='redraw the whole window every frame')
+    parser.add_argument('--raw', metavar='FILE', help='write frames to a memory-mapped .npy file')
+    parser.add_argument('--png', metavar='DIR', help='write frames as PNG files')
+    parser.add_argument('--golden', metavar='FILE', help='compare frame hashes with this file')
+    parser.add_argument('--update-golden', action='store_true',
+                        help='write the frame hashes to --golden instead of comparing')
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Capture frames from the command line; return the exit status."""
+    args = parse_args(argv)
+    if args.replay:
+        replay = Replay.load(args.replay)
+        grid = (replay.grid_width, replay.grid_height)
+        states = replay_states(replay, args.frames)
+        source = {'replay': os.path.basename(args.replay)}
+    else:
+        simulation = GameSimulation()
+        grid = (simulation.grid_width, simulation.grid_height)
+        states = seeded_states(args.seed, args.policy, args.frames, args.difficulty, simulation)
+        source = {'seed': args.seed, 'policy': args.policy, 'difficulty': args.difficulty}
+
+    screen = open_display(*grid, args.cell_size)
+    renderer = Renderer(screen, not args.full_redraw, args.cell_size)
+    result = capture(renderer, states, args.frames, args.raw, args.png)
+    print(f"{result.frames} frames of {screen.get_width()}x{screen.get_height()}: "
+          f"render {result.render_fps:,.0f} fps, with capture {result.total_fps:,.0f} fps")
+
+    if not args.golden:
+        return 0
+    if args.update_golden:
+        with open(args.golden, 'w') as file:
+            json.dump({**source, 'cell_size': args.cell_size, 'frames': result.hashes},
+                      file, indent=1)
+        print(f"wrote {result.frames} golden hashes to {args.golden}")
+        return 0
+    with open(args.golden) as file:
+        golden = json.load(file)['frames']
+    mismatched = compare_hashes(result.hashes, golden)
+    if mismatched:
+        print(f"{len(mismatched)} frames differ from {args.golden}, first at frame {mismatched[0]}",
+              file=sys.stderr)
+        return 1
+    print(f"all {result.frames} frames match {args.golden}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
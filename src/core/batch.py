@@ -0,0 +1,303 @@
+"""NumPy-vectorized simulation of many games at once.
+
+BatchSimulation applies the same rules as GameSimulation (wrapping, shield,
+score multiplier, speed boost, power-up spawning) to N independent boards
+stored as arrays, so one step() call advances every game with a handful of
+vectorized operations instead of N Python-level ticks.
+
+Actions are direction indices into DIRECTIONS (0=up, 1=right, 2=down,
+3=left), or -1 to keep going.
+"""
+from typing import NamedTuple, Optional, Sequence, Union
+import numpy as np
+
+from src.utils.config import (
+    Difficulty, SPEED_SETTINGS, INITIAL_SNAKE_LENGTH, GRID_WIDTH, GRID_HEIGHT
+)
+from src.core.simulation import DIRECTIONS, POWER_UP_BONUS
+from src.core.powerup import (
+    PowerUpType, POWER_UP_EFFECTS, POWER_UP_SPAWN_WEIGHTS,
+    BASE_SPAWN_INTERVAL, MIN_SPAWN_INTERVAL, MAX_POWER_UPS
+)
+
+NO_ACTION = -1
+EMPTY = -1  # Marks an unused food or power-up slot
+
+DIR_DX = np.array([d[0] for d in DIRECTIONS], dtype=np.int64)
+DIR_DY = np.array([d[1] for d in DIRECTIONS], dtype=np.int64)
+RIGHT_INDEX = DIRECTIONS.index((1, 0))
+
+# Power-up types by index, matching the columns of the effect arrays
+POWER_UP_TYPES = list(PowerUpType)
+SPEED = POWER_UP_TYPES.index(PowerUpType.SPEED)
+SHIELD = POWER_UP_TYPES.index(PowerUpType.SHIELD)
+SCORE = POWER_UP_TYPES.index(PowerUpType.SCORE)
+EFFECT_DURATIONS = np.array([POWER_UP_EFFECTS[t.value]["duration"] for t in POWER_UP_TYPES])
+EFFECT_MAGNITUDES = np.array([POWER_UP_EFFECTS[t.value]["magnitude"] for t in POWER_UP_TYPES])
+SPAWN_PROBABILITIES = np.array([POWER_UP_SPAWN_WEIGHTS[t] for t in POWER_UP_TYPES])
+SPAWN_PROBABILITIES = SPAWN_PROBABILITIES / SPAWN_PROBABILITIES.sum()
+
+class BatchEvents(NamedTuple):
+    """Per-game events from one step, each an array of length num_envs."""
+    ate_food: np.ndarray  # bool
+    power_up: np.ndarray  # Index into POWER_UP_TYPES, or EMPTY
+    died: np.ndarray  # bool
+    board_full: np.ndarray  # bool
+
+class BatchSimulation:
+    """Steps num_envs independent games in lockstep.
+
+    Each snake is a ring buffer of flat cell indices (``y * width + x``)
+    with a head index and length, next to a per-board count of segments on
+    each cell. Effects are tracked by the start time of the latest effect of
+    each type, which is enough because durations are fixed per type.
+    Finished games stay frozen until reset().
+    """
+
+    def __init__(self, num_envs: int, grid_width: int = GRID_WIDTH,
+                 grid_height: int = GRID_HEIGHT,
+                 initial_length: int = INITIAL_SNAKE_LENGTH,
+                 difficulty: Union[str, Sequence[str]] = Difficulty.MEDIUM,
+                 seed: Optional[int] = None):
+        """Allocate the arrays and start every game."""
+        self.num_envs = num_envs
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.num_cells = grid_width * grid_height
+        self.initial_length = initial_length
+        self.rng = np.random.default_rng(seed)
+
+        if isinstance(difficulty, str):
+            difficulty = [difficulty] * num_envs
+        self.base_speed = np.array([SPEED_SETTINGS[d] for d in difficulty], dtype=np.float64)
+
+        # Shielded snakes can overlap themselves, so allow more segments than cells
+        self.capacity = 2 * self.num_cells
+        self.body = np.zeros((num_envs, self.capacity), dtype=np.int32)
+        self.head_index = np.zeros(num_envs, dtype=np.int64)
+        self.length = np.zeros(num_envs, dtype=np.int64)
+        self.occupancy = np.zeros((num_envs, self.num_cells), dtype=np.uint16)
+        self.direction = np.zeros(num_envs, dtype=np.int64)
+        self.next_direction = np.zeros(num_envs, dtype=np.int64)
+        self.growing = np.zeros(num_envs, dtype=bool)
+
+        self.food = np.full(num_envs, EMPTY, dtype=np.int64)
+        self.power_up_cells = np.full((num_envs, MAX_POWER_UPS), EMPTY, dtype=np.int64)
+        self.power_up_types = np.zeros((num_envs, MAX_POWER_UPS), dtype=np.int64)
+        self.effect_start = np.full((num_envs, len(POWER_UP_TYPES)), -np.inf)
+        self.last_spawn_time = np.zeros(num_envs)
+        self.spawn_interval = np.zeros(num_envs)
+
+        self.time = np.zeros(num_envs)
+        self.ticks = np.zeros(num_envs, dtype=np.int64)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.power_ups_collected = np.zeros(num_envs, dtype=np.int64)
+        self.alive = np.zeros(num_envs, dtype=bool)
+
+        self.reset()
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> None:
+        """Start new games on the selected boards (all boards by default)."""
+        envs = np.arange(self.num_envs) if mask is None else np.flatnonzero(mask)
+        if not len(envs):
+            return
+
+        x = self.grid_width // 2
+        y = self.grid_height // 2
+        start_cells = y * self.grid_width + x - np.arange(self.initial_length)
+
+        self.body[envs] = 0
+        self.body[envs, :self.initial_length] = start_cells
+        self.head_index[envs] = 0
+        self.length[envs] = self.initial_length
+        self.occupancy[envs] = 0
+        self.occupancy[envs[:, None], start_cells] = 1
+        self.direction[envs] = RIGHT_INDEX
+        self.next_direction[envs] = RIGHT_INDEX
+        self.growing[envs] = False
+
+        self.power_up_cells[envs] = EMPTY
+        self.effect_start[envs] = -np.inf
+        self.last_spawn_time[envs] = 0.0
+        self.spawn_interval[envs] = BASE_SPAWN_INTERVAL
+        self.time[envs] = 0.0
+        self.ticks[envs] = 0
+        self.score[envs] = 0
+        self.power_ups_collected[envs] = 0
+        self.alive[envs] = True
+
+        self.food[envs] = EMPTY
+        self._place_food(envs)
+
+    def _free_cells(self, envs: np.ndarray) -> np.ndarray:
+        """Get a (len(envs), num_cells) mask of cells free for spawning."""
+        free = self.occupancy[envs] == 0
+        rows = np.arange(len(envs))
+        food = self.food[envs]
+        has_food = food != EMPTY
+        free[rows[has_food], food[has_food]] = False
+        cells = self.power_up_cells[envs]
+        used = cells != EMPTY
+        free[np.broadcast_to(rows[:, None], cells.shape)[used], cells[used]] = False
+        return free
+
+    def _sample_free_cells(self, envs: np.ndarray) -> np.ndarray:
+        """Pick a uniformly random free cell on each board, EMPTY if full."""
+        free = self._free_cells(envs)
+        keys = self.rng.random(free.shape)
+        keys[~free] = -1.0
+        cells = keys.argmax(axis=1)
+        return np.where(free.any(axis=1), cells, EMPTY)
+
+    def _place_food(self, envs: np.ndarray) -> np.ndarray:
+        """Respawn food on the given boards, returning where it was placed."""
+        self.food[envs] = EMPTY
+        cells = self._sample_free_cells(envs)
+        self.food[envs] = cells
+        return cells != EMPTY
+
+    def _spawn_power_ups(self, envs: np.ndarray) -> np.ndarray:
+        """Spawn one power-up on each given board, returning where one was placed."""
+        cells = self._sample_free_cells(envs)
+        placed = cells != EMPTY
+        envs = envs[placed]
+        slots = (self.power_up_cells[envs] == EMPTY).argmax(axis=1)
+        self.power_up_cells[envs, slots] = cells[placed]
+        self.power_up_types[envs, slots] = self.rng.choice(
+            len(POWER_UP_TYPES), size=len(envs), p=SPAWN_PROBABILITIES
+        )
+        return placed
+
+    def _effect_active(self, envs: np.ndarray, effect: int, now: np.ndarray) -> np.ndarray:
+        """Check which boards have an unexpired effect of one type."""
+        return ~(now - self.effect_start[envs, effect] >= EFFECT_DURATIONS[effect])
+
+    def move_interval(self) -> np.ndarray:
+        """Get the game time until the next move on every board."""
+        envs = np.arange(self.num_envs)
+        speed = self._effect_active(envs, SPEED, self.time)
+        return 1.0 / (self.base_speed * np.where(speed, EFFECT_MAGNITUDES[SPEED], 1.0))
+
+    def step(self, actions: Optional[np.ndarray] = None) -> BatchEvents:
+        """
+        Advance every running game by one snake move.
+
+        Args:
+            actions: Direction index per board, or NO_ACTION. None keeps
+                every snake going straight.
+
+        Returns:
+            The events of this step for every board
+        """
+        n = self.num_envs
+        events = BatchEvents(
+            np.zeros(n, dtype=bool), np.full(n, EMPTY, dtype=np.int64),
+            np.zeros(n, dtype=bool), np.zeros(n, dtype=bool)
+        )
+        envs = np.flatnonzero(self.alive)
+        if not len(envs):
+            return events
+
+        # Turn, but never straight back
+        if actions is not None:
+            action = np.asarray(actions)[envs]
+            turn = (action != NO_ACTION) & (action != (self.direction[envs] + 2) % 4)
+            self.next_direction[envs[turn]] = action[turn]
+
+        # Advance game time by the current move interval
+        speed = self._effect_active(envs, SPEED, self.time[envs])
+        interval = 1.0 / (self.base_speed[envs] * np.where(speed, EFFECT_MAGNITUDES[SPEED], 1.0))
+        now = self.time[envs] + interval
+        self.time[envs] = now
+        self.ticks[envs] += 1
+
+        # Spawn power-ups
+        count = (self.power_up_cells[envs] != EMPTY).sum(axis=1)
+        spawn = (now - self.last_spawn_time[envs] >= self.spawn_interval[envs]) & (count < MAX_POWER_UPS)
+        if spawn.any():
+            spawn_envs = envs[spawn]
+            count[spawn] += self._spawn_power_ups(spawn_envs)
+            self.spawn_interval[spawn_envs] = np.maximum(
+                MIN_SPAWN_INTERVAL, BASE_SPAWN_INTERVAL - count[spawn]
+            )
+            self.last_spawn_time[spawn_envs] = now[spawn]
+        has_shield = self._effect_active(envs, SHIELD, now)
+
+        # Move, wrapping around the edges
+        direction = self.next_direction[envs]
+        self.direction[envs] = direction
+        head = self.body[envs, self.head_index[envs]]
+        x = (head % self.grid_width + DIR_DX[direction]) % self.grid_width
+        y = (head // self.grid_width + DIR_DY[direction]) % self.grid_height
+        new_head = y * self.grid_width + x
+
+        growing = self.growing[envs]
+        shrink = envs[~growing]
+        tail_index = (self.head_index[shrink] + self.length[shrink] - 1) % self.capacity
+        self.occupancy[shrink, self.body[shrink, tail_index]] -= 1
+        self.length[envs[growing]] += 1
+        self.growing[envs] = False
+
+        head_index = (self.head_index[envs] - 1) % self.capacity
+        self.head_index[envs] = head_index
+        self.body[envs, head_index] = new_head
+        self.occupancy[envs, new_head] += 1
+
+        # Collect power-ups
+        match = self.power_up_cells[envs] == new_head[:, None]
+        hit = match.any(axis=1)
+        if hit.any():
+            hit_envs = envs[hit]
+            slots = match[hit].argmax(axis=1)
+            types = self.power_up_types[hit_envs, slots]
+            self.power_up_cells[hit_envs, slots] = EMPTY
+            self.effect_start[hit_envs, types] = now[hit]
+            self.power_ups_collected[hit_envs] += 1
+            self.score[hit_envs] += np.where(types == SCORE, POWER_UP_BONUS, 0)
+            events.power_up[hit_envs] = types
+
+        # Eat food
+        ate = new_head == self.food[envs]
+        board_full = np.zeros(len(envs), dtype=bool)
+        if ate.any():
+            ate_envs = envs[ate]
+            self.growing[ate_envs] = True
+            board_full[ate] = ~self._place_food(ate_envs)
+            # Power-ups give up their cells before the board counts as full
+            retry = envs[board_full & (self.power_up_cells[envs] != EMPTY).any(axis=1)]
+            if len(retry):
+                self.power_up_cells[retry] = EMPTY
+                board_full[np.isin(envs, retry)] = ~self._place_food(retry)
+            multiplier = np.where(
+                self._effect_active(ate_envs, SCORE, now[ate]), EFFECT_MAGNITUDES[SCORE], 1.0
+            )
+            self.score[ate_envs] += (1 * multiplier).astype(np.int64)
+            events.ate_food[ate_envs] = True
+            events.board_full[envs[board_full]] = True
+
+        # Self collision unless shielded
+        died = ~has_shield & ~board_full & (self.occupancy[envs, new_head] > 1)
+        events.died[envs[died]] = True
+        self.alive[envs[died | board_full]] = False
+        return events
+
+    def get_body_positions(self, env: int):
+        """Get one snake's cells as (x, y) tuples from head to tail."""
+        indices = (self.head_index[env] + np.arange(self.length[env])) % self.capacity
+        return [(int(c) % self.grid_width, int(c) // self.grid_width) for c in self.body[env, indices]]
+
+    def get_food_position(self, env: int):
+        """Get one board's food cell as (x, y), or None."""
+        cell = int(self.food[env])
+        if cell == EMPTY:
+            return None
+        return (cell % self.grid_width, cell // self.grid_width)
+
+    def get_power_ups(self, env: int):
+        """Get one board's live power-ups as ((x, y), type value) pairs."""
+        power_ups = []
+        for cell, type_index in zip(self.power_up_cells[env], self.power_up_types[env]):
+            if cell != EMPTY:
+                position = (int(cell) % self.grid_width, int(cell) // self.grid_width)
+                power_ups.append((position, POWER_UP_TYPES[type_index].value))
+        return power_ups
@@ -1,28 +1,77 @@
 """Food entity module."""
 import random
-from typing import Tuple
+from typing import Iterable, Optional, Tuple
 from pygame import Vector2
-from src.utils.config import WINDOW_WIDTH, WINDOW_HEIGHT, CELL_SIZE
+from src.utils.config import GRID_WIDTH, GRID_HEIGHT
+from src.core.grid import FreeCellIndex
 
 class Food:
-    def __init__(self):
-        """Initialize food at a random position."""
-        self.position = self.generate_position()
+    __slots__ = ('free_cells', 'rng', 'position')
+
+    def __init__(self, free_cells: Optional[FreeCellIndex] = None, rng=random):
+        """Initialize food at a random position.
+
+        Args:
+            free_cells: Shared index of unoccupied cells. When given, food
+                spawns by sampling it and holds its own cell in the index.
+            rng: Random source for spawn positions.
+        """
+        self.free_cells = free_cells
+        self.rng = rng
+        self.position = None
+        if free_cells is None:
+            self.position = self.generate_position()
+        else:
+            self._place(free_cells.sample(rng))
 
     def generate_position(self) -> Vector2:
-        """Generate a random position for the food."""
-        x = random.randint(0, (WINDOW_WIDTH // CELL_SIZE) - 1)
-        y = random.randint(0, (WINDOW_HEIGHT // CELL_SIZE) - 1)
+        """Generate a random position for the food on the board, free or not."""
+        if self.free_cells is None:
+            width, height = GRID_WIDTH, GRID_HEIGHT
+        else:
+            width, height = self.free_cells.width, self.free_cells.height
+        x = self.rng.randint(0, width - 1)
+        y = self.rng.randint(0, height - 1)
         return Vector2(x, y)
 
-    def respawn(self, snake_positions: list) -> None:
-        """Respawn food at a new position, avoiding snake's body."""
-        while True:
-            new_pos = self.generate_position()
-            if (int(new_pos.x), int(new_pos.y)) not in snake_positions:
-                self.position = new_pos
-                break
+    def _place(self, position: Optional[Tuple[int, int]]) -> bool:
+        """Move the food to a cell, keeping the shared index in sync."""
+        if self.free_cells is not None and self.position is not None:
+            self.free_cells.release(self.get_position())
+        if position is None:
+            self.position = None
+            return False
+        self.position = Vector2(position)
+        if self.free_cells is not None:
+            self.free_cells.occupy(position)
+        return True
+
+    def respawn(self, snake_positions: Iterable[Tuple[int, int]] = ()) -> bool:
+        """Respawn food at a new position, avoiding snake's body.
+
+        With a shared index the snake is already accounted for and
+        snake_positions is ignored. Otherwise a temporary index is built from
+        snake_positions.
+
+        Returns:
+            False if the board is full and the food could not be placed.
+        """
+        if self.free_cells is not None:
+            # Release our own cell first so it is not counted as taken
+            self._place(None)
+            return self._place(self.free_cells.sample(self.rng))
+
+        free_cells = FreeCellIndex.from_occupied(GRID_WIDTH, GRID_HEIGHT, snake_positions)
+        current = self.get_position()
+        if current is not None and free_cells.is_free(current):
+            # Prefer a different cell, but fall back to the current one
+            free_cells.occupy(current)
+            if free_cells.is_full():
+                free_cells.release(current)
+        return self._place(free_cells.sample(self.rng))
 
-    def get_position(self) -> Tuple[int, int]:
-        """Get the current position of the food."""
+    def get_position(self) -> Optional[Tuple[int, int]]:
+        """Get the current position of the food, or None if the board is full."""
+        if self.position is None:
+            return None
         return (int(self.position.x), int(self.position.y))
@@ -0,0 +1,111 @@
+"""Free-cell index for constant-time spawning on the game grid."""
+import random
+from array import array
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+# Free count plus the raw bytes of the cell, slot and reference arrays
+IndexSnapshot = Tuple[int, bytes, bytes, bytes]
+
+@lru_cache(maxsize=8)
+def _identity(typecode: str, size: int) -> array:
+    """Get the array 0..size-1. Copying it is far cheaper than rebuilding it."""
+    return array(typecode, range(size))
+
+class FreeCellIndex:
+    """Tracks which grid cells are unoccupied.
+
+    Cells are stored as flat indices (``y * width + x``) in a single array
+    partitioned into a free prefix and an occupied suffix, with a second
+    array mapping each cell to its slot. Occupying or releasing a cell is a
+    swap across the partition boundary, and sampling picks a random slot in
+    the free prefix, so every operation is O(1) regardless of how full the
+    board is.
+
+    Each cell keeps a reference count, so several entities (snake segments,
+    food, power-ups) can share a cell and it only becomes free again once
+    all of them have released it.
+    """
+
+    __slots__ = ('width', 'height', '_cells', '_slots', '_refs', '_free_count')
+
+    def __init__(self, width: int, height: int):
+        """Create an index where every cell of a width x height grid is free."""
+        self.width = width
+        self.height = height
+        size = width * height
+        # Two bytes per cell index on any board up to 256x256
+        typecode = 'H' if size <= 1 << 16 else 'I'
+        self._cells = _identity(typecode, size)[:]  # Free cells first, then occupied
+        self._slots = _identity(typecode, size)[:]  # Cell -> slot in self._cells
+        self._refs = array('H', bytes(2 * size))  # Cell -> occupant count
+        self._free_count = size
+
+    @classmethod
+    def from_occupied(cls, width: int, height: int,
+                      positions: Iterable[Tuple[int, int]]) -> 'FreeCellIndex':
+        """Build an index with the given positions already occupied."""
+        index = cls(width, height)
+        for position in positions:
+            index.occupy(position)
+        return index
+
+    def snapshot(self) -> IndexSnapshot:
+        """Copy the index into immutable buffers."""
+        return (self._free_count, self._cells.tobytes(),
+                self._slots.tobytes(), self._refs.tobytes())
+
+    def restore(self, snapshot: IndexSnapshot) -> None:
+        """Return to a snapshot taken from an index of the same size."""
+        self._free_count, cells, slots, refs = snapshot
+        self._cells = array(self._cells.typecode, cells)
+        self._slots = array(self._slots.typecode, slots)
+        self._refs = array('H', refs)
+
+    def __len__(self) -> int:
+        """Get the number of free cells."""
+        return self._free_count
+
+    def _swap(self, cell: int, slot: int) -> None:
+        """Move a cell into the given slot, swapping out its current occupant."""
+        cells = self._cells
+        slots = self._slots
+        old_slot = slots[cell]
+        other = cells[slot]
+        cells[slot] = cell
+        cells[old_slot] = other
+        slots[cell] = slot
+        slots[other] = old_slot
+
+    def occupy(self, position: Tuple[int, int]) -> None:
+        """Mark a cell as occupied by one more entity."""
+        cell = position[1] * self.width + position[0]
+        refs = self._refs[cell]
+        self._refs[cell] = refs + 1
+        if not refs:
+            self._free_count -= 1
+            self._swap(cell, self._free_count)
+
+    def release(self, position: Tuple[int, int]) -> None:
+        """Release one entity's hold on a cell."""
+        cell = position[1] * self.width + position[0]
+        refs = self._refs[cell] - 1
+        self._refs[cell] = refs
+        if not refs:
+            self._swap(cell, self._free_count)
+            self._free_count += 1
+
+    def is_free(self, position: Tuple[int, int]) -> bool:
+        """Check if a cell is unoccupied."""
+        return not self._refs[position[1] * self.width + position[0]]
+
+    def is_full(self) -> bool:
+        """Check if no free cell is left."""
+        return not self._free_count
+
+    def sample(self, rng=random) -> Optional[Tuple[int, int]]:
+        """Pick a uniformly random free cell, or None if the board is full."""
+        if not self._free_count:
+            return None
+        cell = self._cells[rng.randrange(self._free_count)]
+        return (cell % self.width, cell // self.width)
@@ -0,0 +1,89 @@
+"""Autoplay policies for driving a GameSimulation.
+
+A policy is created from a random.Random and called with the simulation
+state before every tick; it returns the Action to apply.
+"""
+import random
+from typing import Callable, Dict
+
+from src.core.simulation import Action, DIRECTIONS, SimulationState, UP, DOWN, LEFT, RIGHT
+
+Policy = Callable[[SimulationState], Action]
+
+def _current_direction(state: SimulationState):
+    """Get the snake's direction as a (dx, dy) tuple."""
+    direction = state.snake.get_direction()
+    return (int(direction.x), int(direction.y))
+
+def _is_safe(state: SimulationState, position) -> bool:
+    """Check if moving the head onto a cell will not hit the body."""
+    snake = state.snake
+    if not snake.is_occupied(position):
+        return True
+    # The tail moves away this tick unless the snake is growing
+    return (position == snake.get_tail_position() and not snake.growing
+            and snake.occupancy[position] == 1)
+
+def _wrap_distance(a: int, b: int, size: int) -> int:
+    """Distance between two coordinates on a wrapping axis."""
+    d = abs(a - b)
+    return min(d, size - d)
+
+def random_policy(rng: random.Random) -> Policy:
+    """Turn to a random direction now and then."""
+    def act(state: SimulationState) -> Action:
+        if rng.random() < 0.2:
+            return rng.choice(DIRECTIONS)
+        return None
+    return act
+
+def greedy_policy(rng: random.Random) -> Policy:
+    """Head for the food along the shortest wrapped path, avoiding the body."""
+    def act(state: SimulationState) -> Action:
+        head = state.snake.get_head_position()
+        dx, dy = _current_direction(state)
+        target = state.food.get_position() or head
+        best = None
+        best_key = None
+        for direction in DIRECTIONS:
+            if direction == (-dx, -dy):
+                continue
+            position = ((head[0] + direction[0]) % state.grid_width,
+                        (head[1] + direction[1]) % state.grid_height)
+            distance = (_wrap_distance(position[0], target[0], state.grid_width) +
+                        _wrap_distance(position[1], target[1], state.grid_height))
+            key = (not _is_safe(state, position), distance, rng.random())
+            if best_key is None or key < best_key:
+                best, best_key = direction, key
+        return best
+    return act
+
+def cycle_policy(rng: random.Random) -> Policy:
+    """Follow a fixed Hamiltonian cycle, which never dies before the board is full.
+
+    The cycle runs right along the top row, snakes down through columns
+    1..width-1 and returns up column 0, so it needs an even grid height.
+    """
+    def act(state: SimulationState) -> Action:
+        x, y = state.snake.get_head_position()
+        width, height = state.grid_width, state.grid_height
+        if x == 0:
+            direction = RIGHT if y == 0 else UP
+        elif y % 2 == 0:
+            direction = RIGHT if x < width - 1 else DOWN
+        elif x > 1 or y == height - 1:
+            direction = LEFT
+        else:
+            direction = DOWN
+        dx, dy = _current_direction(state)
+        if direction == (-dx, -dy):
+            # Only happens at the start; step onto the next row to join the cycle
+            direction = DOWN if y < height - 1 else UP
+        return direction
+    return act
+
+POLICIES: Dict[str, Callable[[random.Random], Policy]] = {
+    'random': random_policy,
+    'greedy': greedy_policy,
+    'cycle': cycle_policy,
+}
@@ -1,8 +1,11 @@
 """Power-up system module."""
 import time
+import heapq
 import random
-from typing import List, Tuple, Optional, Dict
+from typing import Callable, List, Tuple, Optional, Dict
 from enum import Enum, auto
+from src.utils.config import GRID_WIDTH, GRID_HEIGHT
+from src.core.grid import FreeCellIndex
 
 class PowerUpType(Enum):
     """Available power-up types."""
@@ -10,24 +13,49 @@ class PowerUpType(Enum):
     SHIELD = "shield"
     SCORE = "score"
 
+# Effect parameters for each power-up type
+POWER_UP_EFFECTS = {
+    PowerUpType.SPEED.value: {"duration": 5.0, "magnitude": 1.5},
+    PowerUpType.SHIELD.value: {"duration": 8.0, "magnitude": 1.0},
+    PowerUpType.SCORE.value: {"duration": 10.0, "magnitude": 2.0}
+}
+
+# Spawn chance weights for different power-up types
+POWER_UP_SPAWN_WEIGHTS = {
+    PowerUpType.SPEED: 0.4,
+    PowerUpType.SHIELD: 0.3,
+    PowerUpType.SCORE: 0.3
+}
+
+BASE_SPAWN_INTERVAL = 10.0  # Seconds between spawns with no power-ups on the board
+MIN_SPAWN_INTERVAL = 5.0
+MAX_POWER_UPS = 3
+
 class PowerUpEffect:
     """Represents an active power-up effect."""
-    def __init__(self, type_: PowerUpType, duration: float, magnitude: float = 2.0):
+    __slots__ = ('type', 'duration', 'magnitude', 'start_time', 'is_active')
+
+    def __init__(self, type_: PowerUpType, duration: float, magnitude: float = 2.0,
+                 start_time: Optional[float] = None):
         self.type = type_.value
         self.duration = duration
         self.magnitude = magnitude
-        self.start_time = time.time()
+        self.start_time = time.time() if start_time is None else start_time
         self.is_active = True
 
-    def is_expired(self) -> bool:
-        """Check if the effect has expired."""
-        return time.time() - self.start_time >= self.duration
+    def is_expired(self, current_time: Optional[float] = None) -> bool:
+        """Check if the effect has expired (defaults to the wall clock)."""
+        if current_time is None:
+            current_time = time.time()
+        return current_time - self.start_time >= self.duration
 
-    def get_remaining_time(self) -> float:
+    def get_remaining_time(self, current_time: Optional[float] = None) -> float:
         """Get remaining effect duration in seconds."""
         if not self.is_active:
             return 0
-        return max(0, self.duration - (time.time() - self.start_time))
+        if current_time is None:
+            current_time = time.time()
+        return max(0, self.duration - (current_time - self.start_time))
 
     def deactivate(self) -> None:
         """Deactivate the effect."""
@@ -35,125 +63,169 @@ class PowerUpEffect:
 
 class PowerUp:
     """Represents a collectible power-up in the game."""
-    def __init__(self, position: Tuple[int, int], type_: PowerUpType):
+    __slots__ = ('position', 'type', 'collected', 'spawn_time', 'effect_params')
+
+    def __init__(self, position: Tuple[int, int], type_: PowerUpType,
+                 spawn_time: Optional[float] = None):
         self.position = position
         self.type = type_.value
         self.collected = False
-        self.spawn_time = time.time()
+        self.spawn_time = time.time() if spawn_time is None else spawn_time
         
         # Configure effect parameters based on type
-        self.effect_params = {
-            PowerUpType.SPEED.value: {"duration": 5.0, "magnitude": 1.5},
-            PowerUpType.SHIELD.value: {"duration": 8.0, "magnitude": 1.0},
-            PowerUpType.SCORE.value: {"duration": 10.0, "magnitude": 2.0}
-        }
+        self.effect_params = POWER_UP_EFFECTS
 
     def get_position(self) -> Tuple[int, int]:
         """Get the power-up's position."""
         return self.position
 
-    def collect(self) -> PowerUpEffect:
+    def collect(self, current_time: Optional[float] = None) -> PowerUpEffect:
         """Mark as collected and return the associated effect."""
         self.collected = True
         params = self.effect_params[self.type]
         return PowerUpEffect(
             PowerUpType(self.type),
             params["duration"],
-            params["magnitude"]
+            params["magnitude"],
+            current_time
         )
 
 class PowerUpManager:
-    """Manages power-ups and their effects."""
-    def __init__(self):
-        self.power_ups: List[PowerUp] = []
+    """Manages power-ups and their effects.
+
+    Effects expire through a heap ordered by expiry time, and the strongest
+    magnitude of each active effect type is kept in a table that is rebuilt
+    only when an effect starts or ends. The time is sampled once per tick in
+    update(), so effect queries are dictionary lookups against that time.
+    """
+    def __init__(self, free_cells: Optional[FreeCellIndex] = None,
+                 clock: Callable[[], float] = time.time, rng=random):
+        """Initialize the manager.
+
+        Args:
+            free_cells: Shared index of unoccupied cells. Spawned power-ups
+                are placed by sampling it and hold their cell until collected.
+            clock: Returns the starting time in seconds. Afterwards time
+                comes from the current_time passed to update().
+            rng: Random source for spawn positions and types.
+        """
+        self.free_cells = free_cells
+        self.rng = rng
+        self.current_time = clock()
+        self.power_ups: List[PowerUp] = []  # Uncollected power-ups only
         self.active_effects: List[PowerUpEffect] = []
-        self.last_spawn_time = time.time()
-        self.spawn_interval = 10.0  # Base spawn interval
-        self.min_spawn_interval = 5.0
-        self.max_power_ups = 3
+        self._expiry_heap: List[Tuple[float, int, PowerUpEffect]] = []
+        self._effect_count = 0  # Tie-breaker for effects expiring together
+        self._magnitudes: Dict[str, float] = {}  # Effect type -> strongest magnitude
+        self.last_spawn_time = self.current_time
+        self.spawn_interval = BASE_SPAWN_INTERVAL
+        self.min_spawn_interval = MIN_SPAWN_INTERVAL
+        self.max_power_ups = MAX_POWER_UPS
         
         # Spawn chance weights for different power-up types
-        self.spawn_weights = {
-            PowerUpType.SPEED: 0.4,
-            PowerUpType.SHIELD: 0.3,
-            PowerUpType.SCORE: 0.3
-        }
+        self.spawn_weights = dict(POWER_UP_SPAWN_WEIGHTS)
 
     def update(self, snake_positions: List[Tuple[int, int]], current_time: float) -> None:
         """Update power-up states and manage spawning."""
+        self.current_time = current_time
+
         # Update active effects
         self._update_effects()
         
         # Check if we should spawn a new power-up
         if (current_time - self.last_spawn_time >= self.spawn_interval and
-            len([p for p in self.power_ups if not p.collected]) < self.max_power_ups):
+            len(self.power_ups) < self.max_power_ups):
             
             self._spawn_power_up(snake_positions)
             
             # Dynamically adjust spawn interval based on number of active power-ups
-            active_count = len([p for p in self.power_ups if not p.collected])
+            active_count = len(self.power_ups)
             self.spawn_interval = max(
                 self.min_spawn_interval,
-                10.0 - active_count
+                BASE_SPAWN_INTERVAL - active_count
             )
             self.last_spawn_time = current_time
 
     def _update_effects(self) -> None:
-        """Update and clean up expired effects."""
-        # Remove expired effects
-        active_effects = []
+        """Pop effects that have expired by the current time."""
+        heap = self._expiry_heap
+        changed = False
+        while heap and (not heap[0][2].is_active or heap[0][2].is_expired(self.current_time)):
+            heapq.heappop(heap)[2].deactivate()
+            changed = True
+        if changed:
+            self._rebuild_effect_table()
+
+    def _start_effect(self, effect: PowerUpEffect) -> None:
+        """Schedule an effect's expiry and apply it."""
+        self._effect_count += 1
+        heapq.heappush(
+            self._expiry_heap,
+            (effect.start_time + effect.duration, self._effect_count, effect)
+        )
+        self._rebuild_effect_table()
+
+    def _rebuild_effect_table(self) -> None:
+        """Recompute the active effect list and per-type magnitudes."""
+        self.active_effects = [entry[2] for entry in sorted(self._expiry_heap)
+                               if entry[2].is_active]
+        magnitudes: Dict[str, float] = {}
         for effect in self.active_effects:
-            if effect.is_active and not effect.is_expired():
-                active_effects.append(effect)
-            else:
-                effect.deactivate()
-        self.active_effects = active_effects
+            # Use the highest magnitude if multiple effects are active
+            if effect.magnitude > magnitudes.get(effect.type, float('-inf')):
+                magnitudes[effect.type] = effect.magnitude
+        self._magnitudes = magnitudes
 
     def _spawn_power_up(self, snake_positions: List[Tuple[int, int]]) -> None:
         """Spawn a new power-up at a random valid position."""
-        # Get available positions (20x20 grid, excluding snake positions)
-        all_positions = {(x, y) for x in range(40) for y in range(30)}
-        occupied = set(snake_positions)
-        occupied.update(p.get_position() for p in self.power_ups if not p.collected)
-        available = list(all_positions - occupied)
+        if self.free_cells is not None:
+            # Snake and live power-ups are already tracked by the shared index
+            position = self.free_cells.sample(self.rng)
+        else:
+            occupied = list(snake_positions)
+            occupied.extend(p.get_position() for p in self.power_ups)
+            position = FreeCellIndex.from_occupied(
+                GRID_WIDTH, GRID_HEIGHT, occupied
+            ).sample(self.rng)
         
-        if available:
-            # Choose random position and power-up type
-            position = random.choice(available)
-            power_up_type = random.choices(
+        if position is not None:
+            # Choose power-up type
+            power_up_type = self.rng.choices(
                 list(self.spawn_weights.keys()),
                 list(self.spawn_weights.values())
             )[0]
             
-            self.power_ups.append(PowerUp(position, power_up_type))
+            self.power_ups.append(PowerUp(position, power_up_type, self.current_time))
+            if self.free_cells is not None:
+                self.free_cells.occupy(position)
 
     def check_collision(self, head_pos: Tuple[int, int]) -> Optional[PowerUpEffect]:
         """Check for collision with power-ups and return effect if collected."""
-        for power_up in self.power_ups:
-            if not power_up.collected and power_up.get_position() == head_pos:
-                effect = power_up.collect()
-                self.active_effects.append(effect)
+        for i, power_up in enumerate(self.power_ups):
+            if power_up.get_position() == head_pos:
+                effect = power_up.collect(self.current_time)
+                self._start_effect(effect)
+                del self.power_ups[i]
+                if self.free_cells is not None:
+                    self.free_cells.release(head_pos)
                 return effect
         return None
 
+    def clear_power_ups(self) -> None:
+        """Remove every uncollected power-up, releasing its cell."""
+        if self.free_cells is not None:
+            for power_up in self.power_ups:
+                self.free_cells.release(power_up.get_position())
+        self.power_ups = []
+
     def get_active_effects(self) -> List[PowerUpEffect]:
-        """Get list of currently active effects."""
-        return [e for e in self.active_effects if e.is_active and not e.is_expired()]
+        """Get list of currently active effects, soonest to expire first."""
+        return self.active_effects
 
     def has_active_effect(self, type_: PowerUpType) -> bool:
         """Check if a specific effect type is currently active."""
-        return any(
-            e.type == type_.value and e.is_active and not e.is_expired()
-            for e in self.active_effects
-        )
+        return type_.value in self._magnitudes
 
     def get_effect_magnitude(self, type_: PowerUpType) -> float:
         """Get the current magnitude of an effect type (1.0 if not active)."""
-        active = [e for e in self.active_effects 
-                 if e.type == type_.value and e.is_active and not e.is_expired()]
-        
-        if not active:
-            return 1.0
-            
-        # Return the highest magnitude if multiple effects are active
-        return max(effect.magnitude for effect in active)
+        return self._magnitudes.get(type_.value, 1.0)
@@ -0,0 +1,353 @@
+"""Compact binary replays with seekable snapshots.
+
+A game is fully determined by its seed, its settings and the inputs given on
+each tick, so a replay stores only those. Inputs are (tick, code) pairs,
+delta-encoded as varints, where the code is a direction or a difficulty
+change. Every snapshot_interval ticks a zlib-compressed copy of the whole
+simulation state is added, so playback can jump to any tick by restoring
+the nearest earlier snapshot and simulating at most one interval forward.
+Seeking to a game time works the same way, since game time only grows
+from tick to tick; ticks are not all equally long, as the difficulty
+and the speed power-up change their length.
+
+File layout (little-endian):
+    header     magic, version, seed, grid size, initial length,
+               difficulty, snapshot interval, total ticks
+    inputs     count, byte length, varint stream
+    snapshots  count, then (tick, input index, byte length, payload) each
+"""
+import bisect
+import struct
+import zlib
+from array import array
+from itertools import chain
+from typing import List, Optional, Tuple
+
+from src.utils.config import Difficulty
+from src.core.powerup import PowerUpType
+from src.core.simulation import (
+    GameSimulation, SimulationState, StateSnapshot, Action, Event, DIRECTIONS
+)
+
+MAGIC = b'SNKR'
+VERSION = 2
+DEFAULT_SNAPSHOT_INTERVAL = 10000
+
+DIFFICULTIES = [Difficulty.EASY, Difficulty.MEDIUM, Difficulty.HARD]
+POWER_UP_TYPES = list(PowerUpType)
+
+# Input codes: 0-3 turn to DIRECTIONS[code], 4-6 switch to DIFFICULTIES[code - 4]
+DIFFICULTY_CODE = len(DIRECTIONS)
+CODE_BITS = 3
+
+_HEADER = struct.Struct('<4sBQHHHBIQ')
+_COUNTS = struct.Struct('<II')
+_SNAPSHOT = struct.Struct('<QII')
+_STATE = struct.Struct('<dqqqBBB??ddd')
+_GAUSS = struct.Struct('<?d')
+_FOOD = struct.Struct('<?HH')
+_POWER_UP = struct.Struct('<HHBd')
+_EFFECT = struct.Struct('<Bddd')
+_INDEX = struct.Struct('<IIII')
+_RNG_WORDS = 625
+
+class ReplayError(Exception):
+    """Raised when a replay file is malformed or unsupported."""
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Append an unsigned LEB128 varint."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varints(data: bytes) -> List[int]:
+    """Decode a stream of unsigned LEB128 varints."""
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+def encode_state(state: SimulationState) -> bytes:
+    """Serialize a simulation state into a compact compressed blob."""
+    snapshot = state.snapshot()
+    out = bytearray(_STATE.pack(
+        snapshot.time, snapshot.ticks, snapshot.score, snapshot.power_ups_collected,
+        DIFFICULTIES.index(snapshot.difficulty), snapshot.direction,
+        snapshot.next_direction, snapshot.growing, snapshot.game_over,
+        snapshot.manager_time, snapshot.last_spawn_time, snapshot.spawn_interval
+    ))
+
+    out += snapshot.rng_words.tobytes()
+    gauss_next = snapshot.gauss_next
+    out += _GAUSS.pack(gauss_next is not None, gauss_next or 0.0)
+
+    out += struct.pack('<I', len(snapshot.body))
+    out += array('H', chain.from_iterable(snapshot.body)).tobytes()
+    food = snapshot.food
+    out += _FOOD.pack(food is not None, *(food or (0, 0)))
+
+    out.append(len(snapshot.power_ups))
+    for x, y, type_, spawn_time in snapshot.power_ups:
+        out += _POWER_UP.pack(x, y, POWER_UP_TYPES.index(PowerUpType(type_)), spawn_time)
+    out.append(len(snapshot.effects))
+    for type_, start_time, duration, magnitude in snapshot.effects:
+        out += _EFFECT.pack(POWER_UP_TYPES.index(PowerUpType(type_)),
+                            start_time, duration, magnitude)
+
+    free_count, cells, slots, refs = snapshot.free_cells
+    out += _INDEX.pack(free_count, len(cells), len(slots), len(refs))
+    out += cells + slots + refs
+    return zlib.compress(bytes(out))
+
+def decode_state(data: bytes, simulation: GameSimulation, seed: Optional[int]) -> SimulationState:
+    """Rebuild a simulation state from encode_state() output."""
+    data = zlib.decompress(data)
+    snapshot = StateSnapshot()
+    (snapshot.time, snapshot.ticks, snapshot.score, snapshot.power_ups_collected,
+     difficulty, snapshot.direction, snapshot.next_direction, snapshot.growing,
+     snapshot.game_over, snapshot.manager_time, snapshot.last_spawn_time,
+     snapshot.spawn_interval) = _STATE.unpack_from(data)
+    snapshot.difficulty = DIFFICULTIES[difficulty]
+    offset = _STATE.size
+
+    snapshot.rng_words = array('I', data[offset:offset + _RNG_WORDS * 4])
+    offset += _RNG_WORDS * 4
+    has_gauss, gauss_next = _GAUSS.unpack_from(data, offset)
+    snapshot.gauss_next = gauss_next if has_gauss else None
+    offset += _GAUSS.size
+
+    (length,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    coords = array('H', data[offset:offset + length * 4])
+    snapshot.body = tuple(zip(coords[0::2], coords[1::2]))
+    offset += length * 4
+    has_food, x, y = _FOOD.unpack_from(data, offset)
+    snapshot.food = (x, y) if has_food else None
+    offset += _FOOD.size
+
+    power_ups = []
+    for _ in range(data[offset]):
+        x, y, type_index, spawn_time = _POWER_UP.unpack_from(data, offset + 1)
+        offset += _POWER_UP.size
+        power_ups.append((x, y, POWER_UP_TYPES[type_index].value, spawn_time))
+    snapshot.power_ups = tuple(power_ups)
+    offset += 1
+    effects = []
+    for _ in range(data[offset]):
+        type_index, start_time, duration, magnitude = _EFFECT.unpack_from(data, offset + 1)
+        offset += _EFFECT.size
+        effects.append((POWER_UP_TYPES[type_index].value, start_time, duration, magnitude))
+    snapshot.effects = tuple(effects)
+    offset += 1
+
+    free_count, *lengths = _INDEX.unpack_from(data, offset)
+    offset += _INDEX.size
+    buffers = []
+    for length in lengths:
+        buffers.append(data[offset:offset + length])
+        offset += length
+    snapshot.free_cells = (free_count, *buffers)
+
+    state = simulation.reset(seed, snapshot.difficulty)
+    state.restore(snapshot)
+    return state
+
+class ReplayRecorder:
+    """Collects inputs and snapshots while a game is played.
+
+    Call record_action()/record_difficulty() for inputs applied on the next
+    tick and on_tick() after every tick.
+    """
+
+    def __init__(self, simulation: GameSimulation, state: SimulationState,
+                 snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL):
+        """Start recording a game freshly reset by simulation."""
+        if state.seed is None:
+            raise ReplayError("Only seeded games can be recorded")
+        self.seed = state.seed
+        self.grid_width = state.grid_width
+        self.grid_height = state.grid_height
+        self.initial_length = simulation.initial_length
+        self.difficulty = state.difficulty
+        self.snapshot_interval = snapshot_interval
+        self.input_ticks: List[int] = []
+        self.input_codes: List[int] = []
+        self.snapshots: List[Tuple[int, int, bytes]] = []
+        self.total_ticks = 0
+
+    def _record(self, tick: int, code: int) -> None:
+        """Append one input."""
+        self.input_ticks.append(tick)
+        self.input_codes.append(code)
+
+    def record_action(self, state: SimulationState, action: Action) -> None:
+        """Record a direction applied on the tick after state.ticks."""
+        if action is None:
+            return
+        # Skip inputs that would not change the buffered direction
+        current = state.snake.next_direction
+        if action[0] == int(current.x) and action[1] == int(current.y):
+            return
+        self._record(state.ticks, DIRECTIONS.index(tuple(action)))
+
+    def record_difficulty(self, state: SimulationState, difficulty: str) -> None:
+        """Record a difficulty change taking effect on the next tick."""
+        self._record(state.ticks, DIFFICULTY_CODE + DIFFICULTIES.index(difficulty))
+
+    def on_tick(self, state: SimulationState) -> None:
+        """Note a finished tick, snapshotting on interval boundaries."""
+        self.total_ticks = state.ticks
+        if state.ticks % self.snapshot_interval == 0:
+            self.snapshots.append((state.ticks, len(self.input_ticks), encode_state(state)))
+
+    def to_bytes(self) -> bytes:
+        """Serialize the replay."""
+        out = bytearray(_HEADER.pack(
+            MAGIC, VERSION, self.seed, self.grid_width, self.grid_height,
+            self.initial_length, DIFFICULTIES.index(self.difficulty),
+            self.snapshot_interval, self.total_ticks
+        ))
+        stream = bytearray()
+        previous = 0
+        for tick, code in zip(self.input_ticks, self.input_codes):
+            _write_varint(stream, ((tick - previous) << CODE_BITS) | code)
+            previous = tick
+        out += _COUNTS.pack(len(self.input_ticks), len(stream))
+        out += stream
+        out += struct.pack('<I', len(self.snapshots))
+        for tick, input_index, payload in self.snapshots:
+            out += _SNAPSHOT.pack(tick, input_index, len(payload))
+            out += payload
+        return bytes(out)
+
+    def save(self, path: str) -> None:
+        """Write the replay to a file."""
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+class Replay:
+    """A loaded replay that can be played back from any tick."""
+
+    def __init__(self, data: bytes):
+        """Parse a serialized replay."""
+        if len(data) < _HEADER.size:
+            raise ReplayError("Replay is truncated")
+        (magic, version, self.seed, self.grid_width, self.grid_height,
+         self.initial_length, difficulty, self.snapshot_interval,
+         self.total_ticks) = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("Not a replay file")
+        if version != VERSION:
+            raise ReplayError(f"Unsupported replay version {version}")
+        self.difficulty = DIFFICULTIES[difficulty]
+        offset = _HEADER.size
+
+        count, length = _COUNTS.unpack_from(data, offset)
+        offset += _COUNTS.size
+        self.input_ticks: List[int] = []
+        self.input_codes: List[int] = []
+        tick = 0
+        for value in _read_varints(data[offset:offset + length]):
+            tick += value >> CODE_BITS
+            self.input_ticks.append(tick)
+            self.input_codes.append(value & ((1 << CODE_BITS) - 1))
+        if len(self.input_ticks) != count:
+            raise ReplayError("Input stream is corrupt")
+        offset += length
+
+        (count,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        self.snapshot_ticks: List[int] = []
+        self.snapshots: List[Tuple[int, bytes]] = []
+        for _ in range(count):
+            tick, input_index, length = _SNAPSHOT.unpack_from(data, offset)
+            offset += _SNAPSHOT.size
+            self.snapshot_ticks.append(tick)
+            self.snapshots.append((input_index, data[offset:offset + length]))
+            offset += length
+
+        self.simulation = GameSimulation(self.grid_width, self.grid_height, self.initial_length)
+        self._snapshot_times: Optional[List[float]] = None  # Read on the first seek by time
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        """Read a replay file."""
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def start(self) -> Tuple[SimulationState, int]:
+        """Get the initial state and the index of its first input."""
+        return self.simulation.reset(self.seed, self.difficulty), 0
+
+    def state_at(self, tick: int) -> Tuple[SimulationState, int]:
+        """Get the state after the given tick and the index of the next input."""
+        i = bisect.bisect_right(self.snapshot_ticks, tick) - 1
+        if i < 0:
+            state, input_index = self.start()
+        else:
+            input_index, payload = self.snapshots[i]
+            state = decode_state(payload, self.simulation, self.seed)
+        while state.ticks < tick and not state.game_over:
+            input_index = self.step(state, input_index)[0]
+        return state, input_index
+
+    def state_at_time(self, time: float) -> Tuple[SimulationState, int]:
+        """Get the state after the first tick to reach a game time, and the next input's index."""
+        if self._snapshot_times is None:
+            self._snapshot_times = [_STATE.unpack_from(zlib.decompress(payload))[0]
+                                    for _, payload in self.snapshots]
+        i = bisect.bisect_right(self._snapshot_times, time) - 1
+        if i < 0:
+            state, input_index = self.start()
+        else:
+            input_index, payload = self.snapshots[i]
+            state = decode_state(payload, self.simulation, self.seed)
+        while state.time < time and state.ticks < self.total_ticks and not state.game_over:
+            input_index = self.step(state, input_index)[0]
+        return state, input_index
+
+    def step(self, state: SimulationState, input_index: int) -> Tuple[int, List[Event]]:
+        """Apply the recorded inputs for the next tick and simulate it."""
+        action = None
+        ticks = self.input_ticks
+        while input_index < len(ticks) and ticks[input_index] == state.ticks:
+            code = self.input_codes[input_index]
+            if code < DIFFICULTY_CODE:
+                action = DIRECTIONS[code]
+            else:
+                state.difficulty = DIFFICULTIES[code - DIFFICULTY_CODE]
+            input_index += 1
+        events = self.simulation.step(state, action)[1]
+        return input_index, events
+
+class ReplayPlayer:
+    """Plays a replay tick by tick, with seeking."""
+
+    def __init__(self, replay: Replay):
+        self.replay = replay
+        self.state, self.input_index = replay.start()
+
+    def step(self) -> List[Event]:
+        """Advance playback by one tick."""
+        self.input_index, events = self.replay.step(self.state, self.input_index)
+        return events
+
+    def seek(self, tick: int) -> None:
+        """Jump to the state after the given tick."""
+        tick = max(0, min(tick, self.replay.total_ticks))
+        self.state, self.input_index = self.replay.state_at(tick)
+
+    def seek_time(self, time: float) -> None:
+        """Jump to the first tick ending at or after a game time in seconds."""
+        self.state, self.input_index = self.replay.state_at_time(max(0.0, time))
+
+    def is_finished(self) -> bool:
+        """Check if playback reached the end of the recording."""
+        return self.state.game_over or self.state.ticks >= self.replay.total_ticks
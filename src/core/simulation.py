@@ -0,0 +1,304 @@
+"""Headless game rules with a pure (state, action) step API.
+
+Nothing in this module touches the pygame display, mixer or wall clock, so
+games can be stepped as fast as Python allows for tests and bots. Game time
+only advances when a tick is simulated.
+"""
+import random
+from array import array
+from collections import Counter, deque
+from enum import Enum
+from typing import List, Optional, Tuple
+from pygame.math import Vector2
+
+from src.utils.config import (
+    Difficulty, SPEED_SETTINGS, INITIAL_SNAKE_LENGTH, GRID_WIDTH, GRID_HEIGHT
+)
+from src.core.grid import FreeCellIndex, IndexSnapshot
+from src.core.snake import Snake
+from src.core.food import Food
+from src.core.powerup import PowerUp, PowerUpEffect, PowerUpManager, PowerUpType
+
+# A direction (dx, dy) to turn to, or None to keep going
+Action = Optional[Tuple[int, int]]
+
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (UP, RIGHT, DOWN, LEFT)
+
+POWER_UP_BONUS = 10  # Points for collecting a score power-up
+
+class EventType(Enum):
+    """Things that can happen during a tick."""
+    ATE_FOOD = "ate_food"
+    POWER_UP_COLLECTED = "power_up_collected"
+    DIED = "died"
+    BOARD_FULL = "board_full"
+
+# An event type plus optional detail (the power-up type for collections)
+Event = Tuple[EventType, Optional[str]]
+
+def direction_code(direction: Vector2) -> int:
+    """Map a direction vector to its index in DIRECTIONS."""
+    return DIRECTIONS.index((int(direction.x), int(direction.y)))
+
+class StateSnapshot:
+    """Immutable copy of a SimulationState in flat buffers.
+
+    The RNG and free-cell index, which make up most of a state, are stored
+    as raw arrays and bytes; directions are indices into DIRECTIONS; the
+    body is a tuple sharing the snake's immutable position tuples. Taking or
+    restoring a snapshot therefore copies a handful of buffers instead of
+    walking the state's object graph, and a snapshot holds no references to
+    mutable game objects.
+    """
+
+    __slots__ = (
+        'difficulty', 'time', 'ticks', 'score', 'power_ups_collected', 'game_over',
+        'rng_words', 'gauss_next', 'body', 'direction', 'next_direction', 'growing',
+        'food', 'power_ups', 'effects', 'manager_time', 'last_spawn_time',
+        'spawn_interval', 'free_cells',
+    )
+
+    difficulty: str
+    time: float
+    ticks: int
+    score: int
+    power_ups_collected: int
+    game_over: bool
+    rng_words: array  # Mersenne Twister state, 625 words
+    gauss_next: Optional[float]
+    body: Tuple[Tuple[int, int], ...]  # Head to tail
+    direction: int
+    next_direction: int
+    growing: bool
+    food: Optional[Tuple[int, int]]
+    power_ups: Tuple[Tuple[int, int, str, float], ...]  # x, y, type, spawn time
+    effects: Tuple[Tuple[str, float, float, float], ...]  # type, start, duration, magnitude
+    manager_time: float
+    last_spawn_time: float
+    spawn_interval: float
+    free_cells: IndexSnapshot
+
+class SimulationState:
+    """Complete state of a single game."""
+
+    __slots__ = (
+        'grid_width', 'grid_height', 'difficulty', 'seed', 'rng', 'time', 'ticks',
+        'score', 'power_ups_collected', 'game_over', 'free_cells', 'snake', 'food',
+        'power_up_manager',
+    )
+
+    def __init__(self, grid_width: int, grid_height: int, initial_length: int,
+                 difficulty: str, seed: Optional[int] = None):
+        """Set up a fresh game."""
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.difficulty = difficulty
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.time = 0.0  # Game time in seconds, excluding pauses
+        self.ticks = 0
+        self.score = 0
+        self.power_ups_collected = 0
+        self.game_over = False
+
+        start_pos = (grid_width // 2, grid_height // 2)
+        self.free_cells = FreeCellIndex(grid_width, grid_height)
+        self.snake = Snake(start_pos, initial_length, self.free_cells)
+        self.food = Food(self.free_cells, self.rng)
+        self.power_up_manager = PowerUpManager(self.free_cells, self.get_time, self.rng)
+
+    def get_time(self) -> float:
+        """Get the current game time in seconds."""
+        return self.time
+
+    def snapshot(self) -> StateSnapshot:
+        """Capture everything needed to continue this game exactly."""
+        snake = self.snake
+        manager = self.power_up_manager
+        snapshot = StateSnapshot()
+        snapshot.difficulty = self.difficulty
+        snapshot.time = self.time
+        snapshot.ticks = self.ticks
+        snapshot.score = self.score
+        snapshot.power_ups_collected = self.power_ups_collected
+        snapshot.game_over = self.game_over
+        _, words, snapshot.gauss_next = self.rng.getstate()
+        snapshot.rng_words = array('I', words)
+        snapshot.body = tuple(snake.body)
+        snapshot.direction = direction_code(snake.direction)
+        snapshot.next_direction = direction_code(snake.next_direction)
+        snapshot.growing = snake.growing
+        snapshot.food = self.food.get_position()
+        snapshot.power_ups = tuple(
+            (*p.position, p.type, p.spawn_time) for p in manager.power_ups
+        )
+        snapshot.effects = tuple(
+            (e.type, e.start_time, e.duration, e.magnitude)
+            for e in manager.get_active_effects()
+        )
+        snapshot.manager_time = manager.current_time
+        snapshot.last_spawn_time = manager.last_spawn_time
+        snapshot.spawn_interval = manager.spawn_interval
+        snapshot.free_cells = self.free_cells.snapshot()
+        return snapshot
+
+    def restore(self, snapshot: StateSnapshot) -> None:
+        """Return to a snapshot taken from a game on a board of the same size.
+
+        Subsequent ticks replay exactly as they did after the snapshot was
+        taken, including random spawns.
+        """
+        self.difficulty = snapshot.difficulty
+        self.time = snapshot.time
+        self.ticks = snapshot.ticks
+        self.score = snapshot.score
+        self.power_ups_collected = snapshot.power_ups_collected
+        self.game_over = snapshot.game_over
+        self.rng.setstate((3, tuple(snapshot.rng_words), snapshot.gauss_next))
+
+        # The free-cell index is restored wholesale, so entities are rebuilt
+        # without going through their occupy/release bookkeeping
+        snake = self.snake
+        body = deque(snapshot.body)
+        occupancy = dict.fromkeys(body, 1)
+        if len(occupancy) != len(body):
+            # Overlapping segments after a collision or under a shield
+            occupancy = dict(Counter(body))
+        snake.body = body
+        snake.occupancy = occupancy
+        snake.direction = Vector2(DIRECTIONS[snapshot.direction])
+        snake.next_direction = Vector2(DIRECTIONS[snapshot.next_direction])
+        snake.growing = snapshot.growing
+        snake.wrapped_next_pos = None
+        food = snapshot.food
+        self.food.position = None if food is None else Vector2(food)
+
+        manager = self.power_up_manager
+        manager.current_time = snapshot.manager_time
+        manager.last_spawn_time = snapshot.last_spawn_time
+        manager.spawn_interval = snapshot.spawn_interval
+        manager.power_ups = [
+            PowerUp((x, y), PowerUpType(type_), spawn_time)
+            for x, y, type_, spawn_time in snapshot.power_ups
+        ]
+        manager._expiry_heap = []
+        for type_, start_time, duration, magnitude in snapshot.effects:
+            manager._start_effect(
+                PowerUpEffect(PowerUpType(type_), duration, magnitude, start_time)
+            )
+        manager._rebuild_effect_table()
+
+        self.free_cells.restore(snapshot.free_cells)
+
+    def clone(self) -> 'SimulationState':
+        """Make an independent copy of this game.
+
+        Search code that explores many futures of one position should
+        prefer restoring a single snapshot into a reused state, which
+        skips building the entities.
+        """
+        state = SimulationState(self.grid_width, self.grid_height, 1,
+                                self.difficulty, self.seed)
+        state.restore(self.snapshot())
+        return state
+
+class GameSimulation:
+    """Applies the game rules one tick (one snake move) at a time."""
+
+    def __init__(self, grid_width: int = GRID_WIDTH, grid_height: int = GRID_HEIGHT,
+                 initial_length: int = INITIAL_SNAKE_LENGTH):
+        """Configure the board used by new games."""
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.initial_length = initial_length
+
+    def reset(self, seed: Optional[int] = None,
+              difficulty: str = Difficulty.MEDIUM) -> SimulationState:
+        """Start a new game. The same seed always produces the same game."""
+        return SimulationState(
+            self.grid_width, self.grid_height, self.initial_length, difficulty, seed
+        )
+
+    def move_interval(self, state: SimulationState) -> float:
+        """Get the game time in seconds until the next snake move."""
+        base_speed = SPEED_SETTINGS[state.difficulty]
+        speed_multiplier = state.power_up_manager.get_effect_magnitude(PowerUpType.SPEED)
+        return 1.0 / (base_speed * speed_multiplier)
+
+    def step(self, state: SimulationState,
+             action: Action = None) -> Tuple[SimulationState, List[Event]]:
+        """
+        Advance a game by one snake move.
+
+        The state is updated in place and returned for convenience. Ticks on
+        a finished game are ignored.
+
+        Args:
+            state: Game to advance
+            action: Direction to turn to before moving, or None
+
+        Returns:
+            The advanced state and the events that happened during the tick
+        """
+        events: List[Event] = []
+        if state.game_over:
+            return state, events
+
+        snake = state.snake
+        power_up_manager = state.power_up_manager
+        if action is not None:
+            snake.change_direction(Vector2(action))
+
+        state.time += self.move_interval(state)
+        state.ticks += 1
+
+        # Expire effects and spawn power-ups at the new time
+        power_up_manager.update(snake.get_body_positions(), state.time)
+        has_shield = power_up_manager.has_active_effect(PowerUpType.SHIELD)
+
+        # Wrap around screen edges
+        next_pos = snake.get_next_head_position()
+        snake.wrap_next_position(
+            (next_pos[0] % state.grid_width, next_pos[1] % state.grid_height)
+        )
+        snake.move()
+        head_pos = snake.get_head_position()
+
+        # Check for power-up collision
+        effect = power_up_manager.check_collision(head_pos)
+        if effect:
+            state.power_ups_collected += 1
+            if effect.type == PowerUpType.SCORE.value:
+                state.score += POWER_UP_BONUS
+            events.append((EventType.POWER_UP_COLLECTED, effect.type))
+
+        # Check for food collision
+        if head_pos == state.food.get_position():
+            snake.grow()
+            board_full = not state.food.respawn()
+            if board_full and power_up_manager.power_ups:
+                # The snake never covered the power-ups' cells, so the
+                # board is not full yet: give one of them to the food
+                power_up_manager.clear_power_ups()
+                board_full = not state.food.respawn()
+            # Apply score multiplier if active
+            base_score = 1
+            score_multiplier = power_up_manager.get_effect_magnitude(PowerUpType.SCORE)
+            state.score += int(base_score * score_multiplier)
+            events.append((EventType.ATE_FOOD, None))
+            if board_full:
+                # The snake covers every cell, nothing left to eat
+                state.game_over = True
+                events.append((EventType.BOARD_FULL, None))
+                return state, events
+
+        # Check for self collision if no shield
+        if not has_shield and snake.check_collision():
+            state.game_over = True
+            events.append((EventType.DIED, None))
+
+        return state, events
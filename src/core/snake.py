@@ -1,28 +1,74 @@
 """Snake module for managing snake behavior."""
-from typing import List, Tuple, Optional
+from collections import deque
+from typing import Deque, Dict, Tuple, Optional
 from pygame.math import Vector2
 from src.utils.config import CELL_SIZE, COLORS
+from src.core.grid import FreeCellIndex
 
 class Snake:
-    def __init__(self, start_pos: Tuple[int, int], initial_length: int = 3):
-        """Initialize the snake with starting position and length."""
+    __slots__ = ('free_cells', 'direction', 'next_direction', 'body', 'occupancy',
+                 'growing', 'wrapped_next_pos', 'moves')
+
+    def __init__(self, start_pos: Tuple[int, int], initial_length: int = 3,
+                 free_cells: Optional[FreeCellIndex] = None):
+        """Initialize the snake with starting position and length.
+
+        Args:
+            start_pos: Cell of the head.
+            initial_length: Number of segments, laid out to the left.
+            free_cells: Shared index of unoccupied cells, updated as the
+                snake moves so other entities can spawn around it.
+        """
+        self.free_cells = free_cells
         self.direction = Vector2(1, 0)  # Start moving right
         self.next_direction = Vector2(1, 0)  # Buffer for next direction
-        self.positions = []
+        self.body: Deque[Tuple[int, int]] = deque()  # Head at index 0
+        self.occupancy: Dict[Tuple[int, int], int] = {}  # Cell -> segment count
         self.growing = False
-        self.movement_locked = False  # Prevent multiple turns in one frame
         self.wrapped_next_pos = None  # Store wrapped position for next move
-        
+        self.moves = 0  # Moves made with this body, for incremental redraws
+
         # Initialize snake body
         x, y = start_pos
         for i in range(initial_length):
-            self.positions.append((x - i, y))
+            self._push_tail((x - i, y))
+
+    @property
+    def positions(self) -> Deque[Tuple[int, int]]:
+        """Body positions from head to tail (kept for older callers)."""
+        return self.body
+
+    def _push_head(self, position: Tuple[int, int]) -> None:
+        """Add a segment at the head and mark its cell as occupied."""
+        self.body.appendleft(position)
+        self.occupancy[position] = self.occupancy.get(position, 0) + 1
+        if self.free_cells is not None:
+            self.free_cells.occupy(position)
+
+    def _push_tail(self, position: Tuple[int, int]) -> None:
+        """Add a segment at the tail and mark its cell as occupied."""
+        self.body.append(position)
+        self.occupancy[position] = self.occupancy.get(position, 0) + 1
+        if self.free_cells is not None:
+            self.free_cells.occupy(position)
+
+    def _pop_tail(self) -> Tuple[int, int]:
+        """Remove the tail segment and release its cell."""
+        position = self.body.pop()
+        count = self.occupancy[position] - 1
+        if count:
+            self.occupancy[position] = count
+        else:
+            del self.occupancy[position]
+        if self.free_cells is not None:
+            self.free_cells.release(position)
+        return position
 
     def change_direction(self, new_direction: Vector2) -> None:
-        """Change the snake's direction, preventing 180-degree turns."""
-        if self.movement_locked:
-            return
-            
+        """Change the snake's direction, preventing 180-degree turns.
+
+        The last change before the next move wins.
+        """
         # Prevent 180-degree turns
         if self.direction.dot(new_direction) != -1:  # Not opposite direction
             self.next_direction = new_direction
@@ -35,45 +81,56 @@ class Snake:
         """Move the snake in the current direction."""
         # Update direction
         self.direction = self.next_direction
-        self.movement_locked = False  # Unlock movement for next frame
-        
+
         # Use wrapped position if available, otherwise calculate new head position
         if self.wrapped_next_pos:
             new_head = self.wrapped_next_pos
             self.wrapped_next_pos = None
         else:
-            head = self.positions[0]
+            head = self.body[0]
             new_head = (
                 head[0] + int(self.direction.x),
                 head[1] + int(self.direction.y)
             )
-        
-        # Add new head
-        self.positions.insert(0, new_head)
-        
-        # Remove tail if not growing
+
+        # Remove tail first so its cell is free if the head moves into it
         if not self.growing:
-            self.positions.pop()
+            self._pop_tail()
         else:
             self.growing = False
 
+        # Add new head
+        self._push_head(new_head)
+        self.moves += 1
+
     def grow(self) -> None:
         """Mark the snake to grow on next move."""
         self.growing = True
 
     def check_collision(self) -> bool:
         """Check if snake has collided with itself."""
-        head = self.positions[0]
-        # Check collision with body (excluding head)
-        return head in self.positions[1:]
+        # The head shares its cell with another segment
+        return self.occupancy[self.body[0]] > 1
+
+    def is_occupied(self, position: Tuple[int, int]) -> bool:
+        """Check if any segment of the snake occupies a cell."""
+        return position in self.occupancy
 
     def get_head_position(self) -> Tuple[int, int]:
         """Get the position of the snake's head."""
-        return self.positions[0]
+        return self.body[0]
+
+    def get_tail_position(self) -> Tuple[int, int]:
+        """Get the position of the snake's tail."""
+        return self.body[-1]
 
-    def get_body_positions(self) -> List[Tuple[int, int]]:
-        """Get all positions occupied by the snake."""
-        return self.positions
+    def get_body_positions(self) -> Deque[Tuple[int, int]]:
+        """Get all positions occupied by the snake, from head to tail."""
+        return self.body
+
+    def get_length(self) -> int:
+        """Get the number of segments in the snake."""
+        return len(self.body)
 
     def get_direction(self) -> Vector2:
         """Get the current direction of the snake."""
@@ -81,7 +138,7 @@ class Snake:
 
     def get_next_head_position(self) -> Tuple[int, int]:
         """Calculate the next position of the head (for collision prediction)."""
-        head = self.positions[0]
+        head = self.body[0]
         return (
             head[0] + int(self.next_direction.x),
             head[1] + int(self.next_direction.y)
@@ -89,8 +146,8 @@ class Snake:
 
     def reset(self, start_pos: Tuple[int, int], initial_length: int = 3) -> None:
         """Reset the snake to initial state."""
-        self.__init__(start_pos, initial_length)
-
-    def unlock_movement(self) -> None:
-        """Unlock movement after pause."""
-        self.movement_locked = False
+        free_cells = self.free_cells
+        if free_cells is not None:
+            for position in self.body:
+                free_cells.release(position)
+        self.__init__(start_pos, initial_length, free_cells)
@@ -1,85 +1,220 @@
 """Main game module."""
+import os
 import sys
 import time
+import threading
+import random
+import argparse
+from typing import TYPE_CHECKING
 import pygame
-from pygame.math import Vector2
 
 from src.utils.config import (
-    WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE,
-    FPS, CELL_SIZE, INITIAL_SNAKE_LENGTH, GameState,
-    Difficulty, SPEED_SETTINGS
+    WINDOW_TITLE, CELL_SIZE, GRID_WIDTH, GRID_HEIGHT, MIN_CELL_SIZE, MAX_CELL_SIZE,
+    FPS, IDLE_TIMEOUT, GameState, Difficulty
 )
-from src.core.snake import Snake
-from src.core.food import Food
-from src.core.powerup import PowerUpManager, PowerUpType
+from src.core.simulation import GameSimulation, EventType, UP, DOWN, LEFT, RIGHT
+from src.core.powerup import PowerUpType
 from src.ui.renderer import Renderer
+from src.utils.timing import FixedTimestepScheduler, FrameStats, ScaledClock, StartupTrace
 from src.audio import SoundManager, SoundEffect, MusicTrack
+from src.audio.sound_manager import MUSIC_CROSSFADE_MS
+
+if TYPE_CHECKING:
+    # Imported when recording or replaying, to keep it out of startup
+    from src.core.replay import Replay
+
+POWER_UP_SOUNDS = {
+    PowerUpType.SCORE.value: SoundEffect.SCORE,
+    PowerUpType.SHIELD.value: SoundEffect.SHIELD,
+    PowerUpType.SPEED.value: SoundEffect.SPEED
+}
+
+# Change in cell size, in pixels, for each zoom key
+ZOOM_KEYS = {
+    pygame.K_MINUS: -4,
+    pygame.K_EQUALS: 4
+}
 
 class Game:
-    def __init__(self):
-        """Initialize the game."""
-        pygame.init()
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption(WINDOW_TITLE)
+    def __init__(self, clock=None, max_ticks_per_frame: int = 8, unbounded: bool = False,
+                 record_dir: str = None, replay: 'Replay' = None, dirty_rects: bool = True,
+                 debug_stats: bool = False, cell_size: int = CELL_SIZE,
+                 grid_size=(GRID_WIDTH, GRID_HEIGHT), trace: StartupTrace = None):
+        """
+        Initialize the game.
+
+        Args:
+            clock: Time source for the tick scheduler (see src.utils.timing).
+                Defaults to the real clock; a ScaledClock fast-forwards.
+            max_ticks_per_frame: How many ticks one frame may catch up on
+            unbounded: Run max_ticks_per_frame ticks every frame regardless
+                of the clock, for soak tests
+            record_dir: Save a replay of every round into this directory
+            replay: Play back this replay instead of taking keyboard control
+            dirty_rects: Update only the changed parts of the display
+                instead of flipping the whole window every frame
+            debug_stats: Show the frame rate, CPU load and sound counters
+            cell_size: Width and height of a grid cell in pixels
+            grid_size: Board size in cells, ignored when playing a replay
+            trace: Time the startup phases and print them once every
+                asset has loaded
+        """
+        self.print_trace = trace is not None
+        self.trace = trace or StartupTrace()
+        # Only what the first frame needs; the mixer opens on the loader
+        # thread and joysticks and the rest are never used
+        with self.trace.phase('display and font init'):
+            pygame.display.init()
+            pygame.font.init()
+        if replay is not None:
+            grid_size = (replay.grid_width, replay.grid_height)
+        self.grid_size = grid_size
+        self.cell_size = cell_size
+        with self.trace.phase('open window'):
+            self.screen = pygame.display.set_mode(self.window_size())
+            pygame.display.set_caption(WINDOW_TITLE)
         self.clock = pygame.time.Clock()
-        self.renderer = Renderer(self.screen)
-        self.sound_manager = SoundManager()
+        self.scheduler = FixedTimestepScheduler(clock, max_ticks_per_frame, unbounded)
+        self.frame_limit = 0 if unbounded else FPS
+        with self.trace.phase('renderer'):
+            self.renderer = Renderer(self.screen, dirty_rects, cell_size)
+        self.stats = FrameStats() if debug_stats else None
+        # Sounds load on a worker thread once the first frame is up; see run()
+        self.sound_manager = SoundManager(load=False)
+        self.loader = None
+        self.simulation = GameSimulation(*grid_size)
         self.difficulty = Difficulty.MEDIUM  # Default difficulty
-        self.last_move_time = 0
-        self.pause_start_time = 0
-        self.total_pause_time = 0
-        self.power_up_manager = PowerUpManager()
+        self.record_dir = record_dir
+        self.recorder = None
+        self.replay = replay
+        self.player = None
         self.reset_game()
         
         # Start game music
         self.sound_manager.play_music(MusicTrack.GAME)
 
+    @property
+    def snake(self):
+        """The snake of the current game."""
+        return self.state.snake
+
+    @property
+    def food(self):
+        """The food of the current game."""
+        return self.state.food
+
+    @property
+    def power_up_manager(self):
+        """The power-up manager of the current game."""
+        return self.state.power_up_manager
+
+    @property
+    def score(self) -> int:
+        """The score of the current game."""
+        return self.state.score
+
     def reset_game(self):
         """Reset the game state."""
-        start_pos = (WINDOW_WIDTH // CELL_SIZE // 2, WINDOW_HEIGHT // CELL_SIZE // 2)
-        self.snake = Snake(start_pos, INITIAL_SNAKE_LENGTH)
-        self.food = Food()
-        self.score = 0
+        if self.replay is not None:
+            from src.core.replay import ReplayPlayer
+            self.player = ReplayPlayer(self.replay)
+            self.state = self.player.state
+            self.difficulty = self.state.difficulty
+        else:
+            self.state = self.simulation.reset(random.getrandbits(32), self.difficulty)
+            if self.record_dir:
+                from src.core.replay import ReplayRecorder
+                self.recorder = ReplayRecorder(self.simulation, self.state)
+        self.pending_action = None  # Turn for the next tick; the last key pressed wins
         self.game_state = GameState.PLAYING
-        self.last_move_time = time.time()
-        self.pause_start_time = 0
-        self.total_pause_time = 0
-        self.power_up_manager = PowerUpManager()
-        self.food.respawn([])  # Initial food spawn
-
-    def handle_input(self):
-        """Handle user input."""
-        for event in pygame.event.get():
+        self.scheduler.reset()
+        self.scheduler.resume()
+
+    def window_size(self):
+        """Get the window size that fits the board at the current cell size."""
+        return (self.grid_size[0] * self.cell_size, self.grid_size[1] * self.cell_size)
+
+    def set_cell_size(self, cell_size: int):
+        """Zoom the board, resizing the window to match."""
+        cell_size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, cell_size))
+        if cell_size == self.cell_size:
+            return
+        self.cell_size = cell_size
+        self.screen = pygame.display.set_mode(self.window_size())
+        self.renderer.resize(self.screen, cell_size)
+
+    def set_difficulty(self, difficulty: str):
+        """Change the difficulty of the running game."""
+        self.difficulty = difficulty
+        self.state.difficulty = difficulty
+        if self.recorder:
+            self.recorder.record_difficulty(self.state, difficulty)
+
+    def save_recording(self):
+        """Write the replay of the current round, if recording."""
+        if self.recorder and self.recorder.total_ticks:
+            os.makedirs(self.record_dir, exist_ok=True)
+            name = time.strftime('replay-%Y%m%d-%H%M%S.snkr')
+            self.recorder.save(os.path.join(self.record_dir, name))
+            self.recorder = None
+
+    def seek_replay(self, seconds: float):
+        """Jump forwards or backwards in the replay being played, in game time."""
+        self.player.seek_time(self.state.time + seconds)
+        self.state = self.player.state
+        self.scheduler.reset()
+
+    def handle_input(self, events=None):
+        """Handle user input, from the event queue unless events are given."""
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
+                self.save_recording()
                 pygame.quit()
                 sys.exit()
+
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # The window system may have discarded what is on screen
+                self.renderer.invalidate()
             
             if event.type == pygame.KEYDOWN:
-                if self.game_state == GameState.PLAYING:
+                if event.key in ZOOM_KEYS:
+                    self.set_cell_size(self.cell_size + ZOOM_KEYS[event.key])
+                elif self.game_state == GameState.PLAYING and self.player:
+                    # Replay controls
+                    if event.key == pygame.K_LEFT:
+                        self.seek_replay(-10)
+                    elif event.key == pygame.K_RIGHT:
+                        self.seek_replay(10)
+                    elif event.key == pygame.K_ESCAPE:
+                        self.game_state = GameState.PAUSED
+                        self.scheduler.pause()
+                        self.sound_manager.pause_music()
+
+                elif self.game_state == GameState.PLAYING:
                     # Movement controls
                     if event.key == pygame.K_UP and self.snake.get_direction().y != 1:
-                        self.snake.change_direction(Vector2(0, -1))
+                        self.pending_action = UP
                         self.sound_manager.play_sound(SoundEffect.MOVE)
                     elif event.key == pygame.K_DOWN and self.snake.get_direction().y != -1:
-                        self.snake.change_direction(Vector2(0, 1))
+                        self.pending_action = DOWN
                         self.sound_manager.play_sound(SoundEffect.MOVE)
                     elif event.key == pygame.K_LEFT and self.snake.get_direction().x != 1:
-                        self.snake.change_direction(Vector2(-1, 0))
+                        self.pending_action = LEFT
                         self.sound_manager.play_sound(SoundEffect.MOVE)
                     elif event.key == pygame.K_RIGHT and self.snake.get_direction().x != -1:
-                        self.snake.change_direction(Vector2(1, 0))
+                        self.pending_action = RIGHT
                         self.sound_manager.play_sound(SoundEffect.MOVE)
                     elif event.key == pygame.K_ESCAPE:
                         self.game_state = GameState.PAUSED
-                        self.pause_start_time = time.time()
+                        self.scheduler.pause()
                         self.sound_manager.pause_music()
                     # Difficulty controls
                     elif event.key == pygame.K_1:
-                        self.difficulty = Difficulty.EASY
+                        self.set_difficulty(Difficulty.EASY)
                     elif event.key == pygame.K_2:
-                        self.difficulty = Difficulty.MEDIUM
+                        self.set_difficulty(Difficulty.MEDIUM)
                     elif event.key == pygame.K_3:
-                        self.difficulty = Difficulty.HARD
+                        self.set_difficulty(Difficulty.HARD)
                 
                 elif self.game_state == GameState.GAME_OVER:
                     if event.key == pygame.K_SPACE:
@@ -90,85 +225,59 @@ class Game:
                     if event.key == pygame.K_ESCAPE or event.key == pygame.K_SPACE:
                         self.game_state = GameState.PLAYING
                         self.sound_manager.unpause_music()
-                        # Add pause duration to total pause time
-                        self.total_pause_time += time.time() - self.pause_start_time
-                        # Reset movement state
-                        self.snake.unlock_movement()
-                        # Adjust last move time to account for pause duration
-                        self.last_move_time = time.time()
+                        # Game time does not advance while paused
+                        self.scheduler.resume()
 
     def update(self):
         """Update game state."""
+        self.scheduler.update()
         if self.game_state != GameState.PLAYING:
             return
 
-        # Get pause-adjusted current time
-        current_time = self.get_adjusted_time()
+        # Run as many ticks as the elapsed time covers
+        while self.scheduler.consume(self.simulation.move_interval(self.state)):
+            if self.player:
+                events = self.player.step()
+                self.state = self.player.state
+            else:
+                if self.recorder:
+                    self.recorder.record_action(self.state, self.pending_action)
+                self.state, events = self.simulation.step(self.state, self.pending_action)
+                self.pending_action = None
+                if self.recorder:
+                    self.recorder.on_tick(self.state)
+            self.handle_events(events)
+            if self.player and self.player.is_finished():
+                self.game_state = GameState.GAME_OVER
+            if self.game_state != GameState.PLAYING:
+                break
+        self.update_music()
 
-        # Update power-ups with adjusted time
-        self.power_up_manager.update(self.snake.get_body_positions(), current_time)
+    def update_music(self):
+        """Crossfade to the fast track while the speed power-up lasts, and back."""
+        if self.sound_manager.current_music not in (MusicTrack.GAME, MusicTrack.GAME_FAST):
+            return  # Stopped at game over, or still loading
+        fast = self.power_up_manager.has_active_effect(PowerUpType.SPEED)
+        track = MusicTrack.GAME_FAST if fast else MusicTrack.GAME
+        if track != self.sound_manager.current_music:
+            self.sound_manager.play_music(track, fade_ms=MUSIC_CROSSFADE_MS)
 
-        # Check if it's time to move the snake
-        base_speed = SPEED_SETTINGS[self.difficulty]
-        
-        # Apply speed boost if active
-        speed_multiplier = self.power_up_manager.get_effect_magnitude(PowerUpType.SPEED)
-        move_interval = 1.0 / (base_speed * speed_multiplier)
-        
-        if current_time - self.last_move_time >= move_interval:
-            # Predict next position for collision check
-            next_pos = self.snake.get_next_head_position()
-            has_shield = self.power_up_manager.has_active_effect(PowerUpType.SHIELD)
-
-            # Wrap around screen edges
-            next_pos = (
-                next_pos[0] % (WINDOW_WIDTH // CELL_SIZE),
-                next_pos[1] % (WINDOW_HEIGHT // CELL_SIZE)
-            )
-            
-            # Update snake's next position to wrapped position
-            self.snake.wrap_next_position(next_pos)
-            
-            # Move snake
-            self.snake.move()
-            self.last_move_time = current_time
-
-            # Check for power-up collision
-            head_pos = self.snake.get_head_position()
-            effect = self.power_up_manager.check_collision(head_pos)
-            if effect:
-                if effect.type == PowerUpType.SCORE:
-                    self.score += 10  # Bonus points for collecting power-up
-                    self.sound_manager.play_sound(SoundEffect.SCORE)
-                elif effect.type == PowerUpType.SHIELD:
-                    self.sound_manager.play_sound(SoundEffect.SHIELD)
-                elif effect.type == PowerUpType.SPEED:
-                    self.sound_manager.play_sound(SoundEffect.SPEED)
-
-            # Check for food collision
-            if self.snake.get_head_position() == self.food.get_position():
-                self.snake.grow()
-                self.food.respawn(self.snake.get_body_positions())
+    def handle_events(self, events):
+        """Play sounds and switch game state for simulation events."""
+        for event_type, detail in events:
+            if event_type == EventType.POWER_UP_COLLECTED:
+                self.sound_manager.play_sound(POWER_UP_SOUNDS[detail])
+            elif event_type == EventType.ATE_FOOD:
                 self.sound_manager.play_sound(SoundEffect.EAT)
-                # Apply score multiplier if active
-                base_score = 1
-                score_multiplier = self.power_up_manager.get_effect_magnitude(PowerUpType.SCORE)
-                self.score += int(base_score * score_multiplier)
-
-            # Check for self collision if no shield
-            if not has_shield and self.snake.check_collision():
+            elif event_type == EventType.BOARD_FULL:
+                self.game_state = GameState.GAME_OVER
+                self.sound_manager.stop_music()
+                self.save_recording()
+            elif event_type == EventType.DIED:
                 self.game_state = GameState.GAME_OVER
                 self.sound_manager.play_sound(SoundEffect.GAME_OVER)
                 self.sound_manager.stop_music()
-
-    def get_adjusted_time(self) -> float:
-        """Get current time adjusted for pause duration."""
-        current_time = time.time()
-        if self.game_state == GameState.PAUSED:
-            # If paused, subtract the current pause duration
-            return current_time - (current_time - self.pause_start_time) - self.total_pause_time
-        # If not paused, just subtract total pause time
-        return current_time - self.total_pause_time
+                self.save_recording()
 
     def render(self):
         """Render the game."""
@@ -176,12 +285,18 @@ class Game:
         
         # Draw game elements
         has_shield = self.power_up_manager.has_active_effect(PowerUpType.SHIELD)
-        self.renderer.draw_snake(self.snake.get_body_positions(), has_shield)
+        self.renderer.draw_snake(self.snake.get_body_positions(), has_shield,
+                                 self.snake.moves)
         self.renderer.draw_food(self.food.get_position())
         self.renderer.draw_power_ups(self.power_up_manager.power_ups)
         self.renderer.draw_score(self.score)
-        self.renderer.draw_difficulty(self.difficulty)
-        self.renderer.draw_active_effects(self.power_up_manager.get_active_effects())
+        # The state's, which a replay changes as it plays and seeks
+        self.renderer.draw_difficulty(self.state.difficulty)
+        self.renderer.draw_active_effects(
+            self.power_up_manager.get_active_effects(), self.state.time
+        )
+        if self.stats:
+            self.renderer.draw_debug_stats(f'{self.stats}, {self.sound_manager.stats}')
 
         # Draw game over or pause screen if needed
         if self.game_state == GameState.GAME_OVER:
@@ -189,16 +304,139 @@ class Game:
         elif self.game_state == GameState.PAUSED:
             self.renderer.draw_paused()
 
-        pygame.display.flip()
+        self.renderer.present()
+
+    def is_idle(self) -> bool:
+        """Check if nothing on screen moves until the player does something."""
+        return self.game_state != GameState.PLAYING
+
+    def wait_for_next_frame(self):
+        """Sleep until the next frame is due.
+
+        While idle this blocks until an event arrives, or IDLE_TIMEOUT
+        passes so the debug stats stay current, instead of spinning at the
+        full frame rate.
+
+        Returns:
+            The events that ended an idle wait, or None to read the queue
+        """
+        if not self.is_idle():
+            self.clock.tick(self.frame_limit)
+            return None
+        event = pygame.event.wait(int(IDLE_TIMEOUT * 1000))
+        self.clock.tick()
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def start_loading(self):
+        """Load sounds and draw the sprites not drawn yet on a worker thread.
+
+        Until a sound has loaded it is silent, and sprites still missing
+        when first drawn are made on the spot, so nothing waits for this.
+        The drawn sprites are converted to the display format on the main
+        thread by check_loading().
+        """
+        self.loader = threading.Thread(target=self._load_assets, name='asset loader',
+                                       daemon=True)
+        self.loader.start()
+
+    def _load_assets(self):
+        """Body of the loader thread."""
+        with self.trace.phase('sounds and music'):
+            self.sound_manager.load()
+        with self.trace.phase('sprites'):
+            self.renderer.asset_manager.preload()
+
+    def check_loading(self):
+        """Finish startup on the main thread once the loader is done."""
+        if self.loader is None or self.loader.is_alive():
+            return
+        self.loader = None
+        self.renderer.asset_manager.finish_preload()
+        self.sound_manager.start_pending_music()
+        self.trace.mark('all assets ready')
+        if self.print_trace:
+            print(self.trace.report())
 
     def run(self):
         """Main game loop."""
+        events = None
+        self.render()
+        self.trace.mark('first frame')
+        self.start_loading()
         while True:
-            self.handle_input()
+            self.handle_input(events)
             self.update()
+            self.check_loading()
             self.render()
-            self.clock.tick(FPS)
+            if self.stats:
+                self.stats.frame()
+            events = self.wait_for_next_frame()
 
-if __name__ == "__main__":
-    game = Game()
+def parse_grid_size(text: str):
+    """Parse a board size written as WIDTHxHEIGHT."""
+    try:
+        width, height = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got '{text}'")
+    return width, height
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description=WINDOW_TITLE)
+    parser.add_argument('--speed', default='1',
+                        help="game speed multiplier, e.g. 10 or 100, or 'unbounded'")
+    parser.add_argument('--record', metavar='DIR',
+                        help='save a replay of every round into DIR')
+    parser.add_argument('--replay', metavar='FILE',
+                        help='play back a recorded replay (LEFT/RIGHT seek 10s)')
+    parser.add_argument('--full-redraw', action='store_true',
+                        help='redraw and flip the whole window every frame')
+    parser.add_argument('--cell-size', type=int, default=CELL_SIZE,
+                        help='pixels per grid cell (-/= zoom while playing)')
+    parser.add_argument('--grid', type=parse_grid_size, default=(GRID_WIDTH, GRID_HEIGHT),
+                        metavar='WxH', help='board size in cells, e.g. 100x60')
+    parser.add_argument('--debug-stats', action='store_true',
+                        help='show the frame rate, CPU time per second and sound counters')
+    parser.add_argument('--startup-trace', action='store_true',
+                        help='print how long each startup phase took')
+    return parser.parse_args(argv)
+
+def main(argv=None, started: float = None):
+    """Start the game from the command line.
+
+    Args:
+        argv: Command line arguments, by default sys.argv[1:]
+        started: time.perf_counter() when the launcher started, before
+            importing the game, so --startup-trace includes the imports
+    """
+    args = parse_args(argv)
+    replay = None
+    if args.replay:
+        from src.core.replay import Replay
+        replay = Replay.load(args.replay)
+    trace = None
+    if args.startup_trace:
+        trace = StartupTrace(started)
+        if started is not None:
+            trace.add('imports', 0.0, trace.now())
+    options = {
+        'record_dir': args.record,
+        'replay': replay,
+        'dirty_rects': not args.full_redraw,
+        'debug_stats': args.debug_stats,
+        'cell_size': args.cell_size,
+        'grid_size': args.grid,
+        'trace': trace,
+    }
+    if args.speed == 'unbounded':
+        game = Game(max_ticks_per_frame=1000, unbounded=True, **options)
+    else:
+        speed = float(args.speed)
+        clock = ScaledClock(speed) if speed != 1 else None
+        game = Game(clock, max_ticks_per_frame=max(8, int(8 * speed)), **options)
     game.run()
+
+if __name__ == "__main__":
+    main()
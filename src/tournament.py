@@ -0,0 +1,141 @@
+"""Multi-core tournament runner for autoplay policies.
+
+Plays many seeded headless games with a policy, spread over worker
+processes, and reports per-game results and overall throughput.
+
+Usage:
+    python -m src.tournament --policy greedy --games 10000 --workers 8
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional
+
+from src.utils.config import Difficulty
+from src.core.simulation import GameSimulation
+from src.core.policies import POLICIES
+
+GameResult = Dict[str, int]
+
+def play_game(simulation: GameSimulation, policy_name: str, seed: int,
+              difficulty: str, max_ticks: int) -> GameResult:
+    """Play one seeded game to the end (or max_ticks) and summarize it."""
+    state = simulation.reset(seed=seed, difficulty=difficulty)
+    policy = POLICIES[policy_name](random.Random(seed))
+    step = simulation.step
+    while not state.game_over and state.ticks < max_ticks:
+        step(state, policy(state))
+    return {
+        'seed': seed,
+        'score': state.score,
+        'length': state.snake.get_length(),
+        'ticks': state.ticks,
+        'power_ups': state.power_ups_collected,
+    }
+
+def play_shard(policy_name: str, seeds: List[int], difficulty: str,
+               max_ticks: int) -> List[GameResult]:
+    """Worker entry point: play a batch of seeds in one process."""
+    simulation = GameSimulation()
+    return [play_game(simulation, policy_name, seed, difficulty, max_ticks) for seed in seeds]
+
+def run_tournament(policy_name: str, seeds: List[int], workers: int,
+                   batch_size: int, difficulty: str = Difficulty.MEDIUM,
+                   max_ticks: int = 10000) -> Iterator[List[GameResult]]:
+    """
+    Play every seed and yield results in batches as workers finish them.
+
+    Args:
+        policy_name: Key into POLICIES
+        seeds: One game per seed
+        workers: Number of worker processes (1 plays in this process)
+        batch_size: Seeds handed to a worker at a time
+        difficulty: Difficulty of every game
+        max_ticks: Games still running after this many ticks are cut off
+
+    Yields:
+        Lists of per-game results, in completion order
+    """
+    shards = [seeds[i:i + batch_size] for i in range(0, len(seeds), batch_size)]
+    if workers <= 1:
+        for shard in shards:
+            yield play_shard(policy_name, shard, difficulty, max_ticks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(play_shard, policy_name, shard, difficulty, max_ticks)
+            for shard in shards
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+def summarize(results: List[GameResult], elapsed: float, workers: int) -> Dict[str, float]:
+    """Aggregate per-game results into tournament statistics."""
+    games = len(results)
+    total_ticks = sum(r['ticks'] for r in results)
+    summary = {
+        'games': games,
+        'workers': workers,
+        'elapsed_s': elapsed,
+        'games_per_s': games / elapsed if elapsed else 0.0,
+        'ticks_per_s': total_ticks / elapsed if elapsed else 0.0,
+    }
+    for key in ('score', 'length', 'ticks', 'power_ups'):
+        values = [r[key] for r in results]
+        summary[f'mean_{key}'] = sum(values) / games if games else 0.0
+        summary[f'max_{key}'] = max(values, default=0)
+    return summary
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Evaluate an autoplay policy over many seeded games.")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: all cores)')
+    parser.add_argument('--batch-size', type=int, default=50,
+                        help='games per work unit sent to a worker')
+    parser.add_argument('--difficulty', default=Difficulty.MEDIUM,
+                        choices=[Difficulty.EASY, Difficulty.MEDIUM, Difficulty.HARD])
+    parser.add_argument('--max-ticks', type=int, default=10000,
+                        help='cut games off after this many ticks')
+    parser.add_argument('--output', help='write per-game results to this JSON lines file')
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    """Run a tournament from the command line."""
+    args = parse_args(argv)
+    seeds = list(range(args.first_seed, args.first_seed + args.games))
+    output = open(args.output, 'w') if args.output else None
+    results: List[GameResult] = []
+
+    start = time.perf_counter()
+    try:
+        for batch in run_tournament(args.policy, seeds, args.workers, args.batch_size,
+                                    args.difficulty, args.max_ticks):
+            results.extend(batch)
+            if output:
+                output.writelines(json.dumps(r) + '\n' for r in batch)
+            print(f"\r{len(results)}/{len(seeds)} games", end='', file=sys.stderr, flush=True)
+    finally:
+        if output:
+            output.close()
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    summary = summarize(results, elapsed, args.workers)
+    print(f"policy {args.policy}, {summary['games']} games on {summary['workers']} workers "
+          f"in {summary['elapsed_s']:.2f}s")
+    print(f"  throughput: {summary['games_per_s']:,.1f} games/s, "
+          f"{summary['ticks_per_s']:,.0f} ticks/s")
+    for key in ('score', 'length', 'ticks', 'power_ups'):
+        print(f"  {key:>9}: mean {summary[f'mean_{key}']:.1f}, max {summary[f'max_{key}']}")
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,156 @@
-"""Asset manager for loading and managing game assets."""
+"""Asset manager for loading and managing game assets.
+
+Assets are drawn procedurally, each by a _create_* method, at any cell
+size: the drawing code works in design units, DESIGN_SIZE to a cell, that
+are scaled to pixels. They are drawn the first time they are asked for,
+and the background is a single cell tiled across the playfield, so memory
+does not grow with the window.
+
+Drawing every asset takes well under a millisecond, so nothing is cached
+on disk: reading a file back would cost as much as drawing it again.
+
+preload() may draw assets ahead of time on a worker thread. It only fills
+a staging dict, under the manager's lock; converting to the display
+format and filling the stores the renderer reads happen on the main
+thread, in finish_preload() or on first use.
+"""
 import os
 import math
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 import pygame
 from pygame import Surface, transform
+from src.utils.config import CELL_SIZE
+from src.core.simulation import UP, DOWN, LEFT, RIGHT
+
+# Counter-clockwise rotation turning a right-facing sprite to each direction
+ANGLES = {RIGHT: 0, UP: 90, LEFT: 180, DOWN: 270}
+
+# Cell size, in pixels, that the drawing code's coordinates are written for
+DESIGN_SIZE = 20
+# How many cell sizes shared() keeps managers for, least recently used dropped
+SCALE_VARIANTS = 4
+
+# Name -> generator method of each kind of asset
+SPRITES = {
+    'snake_head': '_create_snake_head',
+    'snake_body': '_create_snake_body',
+    'snake_tail': '_create_snake_tail',
+    'snake_corner': '_create_snake_corner',
+    'food': '_create_food',
+    'powerup_speed': '_create_speed_powerup',
+    'powerup_shield': '_create_shield_powerup',
+    'powerup_score': '_create_score_powerup',
+}
+EFFECTS = {
+    'shield': '_create_shield_effect',
+    'speed': '_create_speed_effect',
+}
+BACKGROUNDS = {
+    'default': '_create_background_tile',
+}
 
 class AssetManager:
-    def __init__(self):
-        """Initialize the asset manager."""
+    # Managers shared by every renderer: (cell size, converted) -> manager
+    _shared: 'OrderedDict[Tuple[int, bool], AssetManager]' = OrderedDict()
+
+    def __init__(self, cell_size: int = CELL_SIZE):
+        """Initialize the asset manager.
+
+        Args:
+            cell_size: Width and height of a grid cell in pixels
+        """
         self.assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets')
+        self.cell_size = cell_size
         self.sprites = {}
         self.backgrounds = {}
         self.effects = {}
-        self._load_assets()
-
-    def _load_assets(self):
-        """Load all game assets."""
-        # Create default assets if files don't exist
+        self.oriented = {}  # Name -> direction -> sprite facing that way
+        self.generated = 0  # Assets drawn so far
+        self._body_pieces = None
+        self._drawn = {}  # Generator method -> surface preload() drew, not converted yet
+        self._lock = threading.Lock()  # Held while drawing, so nothing is drawn twice
         self._create_default_assets()
-        
-        # Load background
-        bg = self._create_modern_background()
-        self.backgrounds['default'] = bg
-        
-        # Create snake segments
-        head = self._create_snake_head()
-        body = self._create_snake_body()
-        tail = self._create_snake_tail()
-        self.sprites['snake_head'] = head
-        self.sprites['snake_body'] = body
-        self.sprites['snake_tail'] = tail
-        
-        # Create food
-        food = self._create_food()
-        self.sprites['food'] = food
-        
-        # Create power-up sprites
-        speed = self._create_speed_powerup()
-        shield = self._create_shield_powerup()
-        score = self._create_score_powerup()
-        self.sprites['powerup_speed'] = speed
-        self.sprites['powerup_shield'] = shield
-        self.sprites['powerup_score'] = score
-        
-        # Create effect overlays
-        shield_effect = self._create_shield_effect()
-        speed_effect = self._create_speed_effect()
-        self.effects['shield'] = shield_effect
-        self.effects['speed'] = speed_effect
+
+    @classmethod
+    def shared(cls, cell_size: int = CELL_SIZE) -> 'AssetManager':
+        """Get the manager every caller with this cell size shares.
+
+        Managers for the last SCALE_VARIANTS cell sizes are kept, so
+        switching scale back and forth does not draw anything again.
+        Surfaces are converted to the display format when generated, so
+        managers created with and without a display are kept apart.
+        """
+        key = (cell_size, pygame.display.get_surface() is not None)
+        manager = cls._shared.get(key)
+        if manager is None:
+            manager = cls._shared[key] = cls(cell_size)
+            if len(cls._shared) > SCALE_VARIANTS:
+                cls._shared.popitem(last=False)
+        else:
+            cls._shared.move_to_end(key)
+        return manager
+
+    def _get(self, store: dict, generators: Dict[str, str], name: str) -> Optional[Surface]:
+        """Get an asset, generating it on first use. Main thread only."""
+        surface = store.get(name)
+        if surface is None and name in generators:
+            method = generators[name]
+            with self._lock:
+                surface = self._drawn.pop(method, None)
+                if surface is None:
+                    surface = self._draw(method)
+                surface = store[name] = self._to_display_format(surface)
+        return surface
+
+    def _draw(self, method: str) -> Surface:
+        """Draw an asset with its generator method, holding the lock."""
+        self.generated += 1
+        return getattr(self, method)()
+
+    def _stores(self):
+        """Get each kind of asset's store with its generators."""
+        return ((self.sprites, SPRITES), (self.effects, EFFECTS),
+                (self.backgrounds, BACKGROUNDS))
+
+    def _to_display_format(self, surface: Surface) -> Surface:
+        """Convert a surface to the display's pixel format for fast blits.
+
+        Without a display (e.g. in tools) the surface is returned as is.
+        """
+        if pygame.display.get_surface() is None:
+            return surface
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    def _create_orientations(self, sprite: Surface) -> dict:
+        """Rotate a right-facing sprite to face every direction."""
+        return {
+            direction: sprite if angle == 0 else transform.rotate(sprite, angle)
+            for direction, angle in ANGLES.items()
+        }
+
+    @property
+    def body_pieces(self) -> dict:
+        """Body segments keyed by (towards head, towards tail) directions."""
+        if self._body_pieces is None:
+            self._body_pieces = self._create_body_pieces(self.get_sprite('snake_body'),
+                                                         self.get_sprite('snake_corner'))
+        return self._body_pieces
+
+    def _create_body_pieces(self, body: Surface, corner: Surface) -> dict:
+        """Map each pair of neighbour directions to the body segment joining them."""
+        pieces = {}
+        for direction, rotated in self._create_orientations(corner).items():
+            # The corner opens towards direction and a quarter turn clockwise of it
+            clockwise = (-direction[1], direction[0])
+            pieces[(direction, clockwise)] = rotated
+            pieces[(clockwise, direction)] = rotated
+            opposite = (-direction[0], -direction[1])
+            pieces[(direction, opposite)] = body
+        return pieces
 
     def _create_default_assets(self):
         """Create modern-looking default assets."""
@@ -54,110 +158,133 @@ class AssetManager:
         if not os.path.exists(self.assets_dir):
             os.makedirs(self.assets_dir)
 
-    def _create_modern_background(self) -> Surface:
-        """Create a modern, subtle grid background."""
-        size = (800, 600)
-        bg = Surface(size)
-        bg.fill((20, 20, 30))  # Dark blue-gray
-        
-        # Draw subtle grid
-        for x in range(0, size[0], 20):
-            pygame.draw.line(bg, (30, 30, 40), (x, 0), (x, size[1]))
-        for y in range(0, size[1], 20):
-            pygame.draw.line(bg, (30, 30, 40), (0, y), (size[0], y))
-            
-        return bg
+    def _px(self, units: float) -> int:
+        """Convert design units, DESIGN_SIZE to a cell, to whole pixels."""
+        return round(units * self.cell_size / DESIGN_SIZE)
+
+    def _points(self, points) -> list:
+        """Scale a polygon from design units to pixels."""
+        scale = self.cell_size / DESIGN_SIZE
+        return [(x * scale, y * scale) for x, y in points]
+
+    def _new_sprite(self) -> Surface:
+        """Create a transparent surface the size of one cell."""
+        return Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
+
+    def _create_background_tile(self) -> Surface:
+        """Create one cell of a modern, subtle grid background."""
+        size = self.cell_size
+        tile = Surface((size, size))
+        tile.fill((20, 20, 30))  # Dark blue-gray
+
+        # Grid lines along the top and left edges join up when tiled
+        pygame.draw.line(tile, (30, 30, 40), (0, 0), (0, size))
+        pygame.draw.line(tile, (30, 30, 40), (0, 0), (size, 0))
+
+        return tile
 
     def _create_snake_head(self) -> Surface:
         """Create a modern snake head sprite."""
-        size = (20, 20)
-        head = Surface(size, pygame.SRCALPHA)
-        
+        px = self._px
+        head = self._new_sprite()
+
         # Create rounded rectangle for head
-        pygame.draw.rect(head, (50, 200, 50), (0, 0, 20, 20), border_radius=5)
-        
+        pygame.draw.rect(head, (50, 200, 50), (0, 0, px(20), px(20)), border_radius=px(5))
+
         # Add eyes
-        pygame.draw.circle(head, (255, 255, 255), (15, 7), 3)
-        pygame.draw.circle(head, (255, 255, 255), (15, 13), 3)
-        pygame.draw.circle(head, (0, 0, 0), (16, 7), 1)
-        pygame.draw.circle(head, (0, 0, 0), (16, 13), 1)
-        
+        eye, pupil = max(1, px(3)), max(1, px(1))
+        pygame.draw.circle(head, (255, 255, 255), (px(15), px(7)), eye)
+        pygame.draw.circle(head, (255, 255, 255), (px(15), px(13)), eye)
+        pygame.draw.circle(head, (0, 0, 0), (px(16), px(7)), pupil)
+        pygame.draw.circle(head, (0, 0, 0), (px(16), px(13)), pupil)
+
         return head
 
     def _create_snake_body(self) -> Surface:
         """Create a modern snake body segment sprite."""
-        size = (20, 20)
-        body = Surface(size, pygame.SRCALPHA)
-        
+        px = self._px
+        body = self._new_sprite()
+
         # Create rounded rectangle for body
-        pygame.draw.rect(body, (40, 180, 40), (0, 0, 20, 20), border_radius=5)
-        
+        pygame.draw.rect(body, (40, 180, 40), (0, 0, px(20), px(20)), border_radius=px(5))
+
         # Add subtle gradient effect
         for i in range(5):
-            pygame.draw.rect(body, (45, 190, 45, 50), 
-                           (i*2, i*2, 20-i*4, 20-i*4), 
-                           border_radius=3)
-            
+            pygame.draw.rect(body, (45, 190, 45, 50),
+                           (px(i*2), px(i*2), px(20-i*4), px(20-i*4)),
+                           border_radius=px(3))
+
         return body
 
+    def _create_snake_corner(self) -> Surface:
+        """Create a body segment turning between the right and bottom edges."""
+        px = self._px
+        corner = self._new_sprite()
+
+        # Round off the outside of the bend
+        pygame.draw.rect(corner, (40, 180, 40), (0, 0, px(20), px(20)),
+                         border_radius=px(5), border_top_left_radius=px(12))
+        for i in range(5):
+            pygame.draw.rect(corner, (45, 190, 45, 50),
+                           (px(i*2), px(i*2), px(20-i*2), px(20-i*2)),
+                           border_radius=px(3), border_top_left_radius=px(10))
+
+        return corner
+
     def _create_snake_tail(self) -> Surface:
         """Create a modern snake tail sprite."""
-        size = (20, 20)
-        tail = Surface(size, pygame.SRCALPHA)
-        
+        tail = self._new_sprite()
+
         # Create rounded triangle for tail
-        points = [(0, 0), (20, 10), (0, 20)]
+        points = self._points([(0, 0), (20, 10), (0, 20)])
         pygame.draw.polygon(tail, (35, 160, 35), points)
-        
+
         return tail
 
     def _create_food(self) -> Surface:
         """Create a modern food sprite."""
-        size = (20, 20)
-        food = Surface(size, pygame.SRCALPHA)
-        
+        px = self._px
+        food = self._new_sprite()
+
         # Create apple-like shape
-        pygame.draw.circle(food, (220, 40, 40), (10, 12), 8)
-        
+        pygame.draw.circle(food, (220, 40, 40), (px(10), px(12)), px(8))
+
         # Add leaf
-        pygame.draw.ellipse(food, (40, 180, 40), (8, 2, 8, 6))
-        
+        pygame.draw.ellipse(food, (40, 180, 40), (px(8), px(2), px(8), px(6)))
+
         # Add highlight
-        pygame.draw.circle(food, (240, 80, 80), (7, 8), 3)
-        
+        pygame.draw.circle(food, (240, 80, 80), (px(7), px(8)), max(1, px(3)))
+
         return food
 
     def _create_speed_powerup(self) -> Surface:
         """Create a modern speed power-up sprite."""
-        size = (20, 20)
-        speed = Surface(size, pygame.SRCALPHA)
-        
+        speed = self._new_sprite()
+
         # Create lightning bolt shape
         points = [(10, 0), (20, 8), (12, 12), (20, 20), (0, 12), (8, 8), (0, 0)]
-        pygame.draw.polygon(speed, (255, 255, 0), points)
-        
+        pygame.draw.polygon(speed, (255, 255, 0), self._points(points))
+
         return speed
 
     def _create_shield_powerup(self) -> Surface:
         """Create a modern shield power-up sprite."""
-        size = (20, 20)
-        shield = Surface(size, pygame.SRCALPHA)
-        
+        shield = self._new_sprite()
+
         # Create shield shape
-        pygame.draw.polygon(shield, (0, 255, 255), 
-                          [(10, 0), (20, 5), (20, 15), (10, 20), (0, 15), (0, 5)])
-        
+        pygame.draw.polygon(shield, (0, 255, 255), self._points(
+                          [(10, 0), (20, 5), (20, 15), (10, 20), (0, 15), (0, 5)]))
+
         # Add inner detail
-        pygame.draw.polygon(shield, (100, 255, 255), 
-                          [(10, 4), (16, 8), (16, 12), (10, 16), (4, 12), (4, 8)])
-        
+        pygame.draw.polygon(shield, (100, 255, 255), self._points(
+                          [(10, 4), (16, 8), (16, 12), (10, 16), (4, 12), (4, 8)]))
+
         return shield
 
     def _create_score_powerup(self) -> Surface:
         """Create a modern score multiplier power-up sprite."""
-        size = (20, 20)
-        score = Surface(size, pygame.SRCALPHA)
-        
+        score = self._new_sprite()
+
         # Create star shape
         points = []
         for i in range(10):
@@ -166,42 +293,69 @@ class AssetManager:
             x = 10 + radius * math.cos(math.radians(angle))
             y = 10 + radius * math.sin(math.radians(angle))
             points.append((x, y))
-            
-        pygame.draw.polygon(score, (128, 0, 128), points)
-        
+
+        pygame.draw.polygon(score, (128, 0, 128), self._points(points))
+
         return score
 
     def _create_shield_effect(self) -> Surface:
         """Create a shield effect overlay."""
-        size = (20, 20)
-        shield = Surface(size, pygame.SRCALPHA)
-        
+        px = self._px
+        shield = self._new_sprite()
+
         # Create pulsing shield effect
-        pygame.draw.circle(shield, (0, 255, 255, 128), (10, 10), 12, 2)
-        
+        pygame.draw.circle(shield, (0, 255, 255, 128), (px(10), px(10)), px(12), max(1, px(2)))
+
         return shield
 
     def _create_speed_effect(self) -> Surface:
         """Create a speed effect overlay."""
-        size = (20, 20)
-        speed = Surface(size, pygame.SRCALPHA)
-        
+        px = self._px
+        speed = self._new_sprite()
+
         # Create motion lines
         for i in range(3):
-            offset = i * 5
-            pygame.draw.line(speed, (255, 255, 0, 128), 
-                           (offset, 0), (offset, 20), 2)
-            
+            offset = px(i * 5)
+            pygame.draw.line(speed, (255, 255, 0, 128),
+                           (offset, 0), (offset, px(20)), max(1, px(2)))
+
         return speed
 
     def get_sprite(self, name: str) -> Surface:
         """Get a sprite by name."""
-        return self.sprites.get(name)
+        return self._get(self.sprites, SPRITES, name)
 
     def get_background(self, name: str = 'default') -> Surface:
-        """Get a background by name."""
-        return self.backgrounds.get(name)
+        """Get a background tile, one cell of the pattern, by name."""
+        return self._get(self.backgrounds, BACKGROUNDS, name)
 
     def get_effect(self, name: str) -> Surface:
         """Get an effect overlay by name."""
-        return self.effects.get(name)
+        return self._get(self.effects, EFFECTS, name)
+
+    def get_oriented_sprite(self, name: str, direction) -> Surface:
+        """Get a directional sprite facing direction, a (dx, dy) tuple."""
+        sprites = self.oriented.get(name)
+        if sprites is None:
+            # Pre-rotate all directions at once so drawing them is a lookup
+            sprites = self.oriented[name] = self._create_orientations(self.get_sprite(name))
+        return sprites[direction]
+
+    def preload(self) -> None:
+        """Draw every asset not made yet, e.g. on a worker thread.
+
+        The drawings are kept aside unconverted; finish_preload() moves
+        them into the stores.
+        """
+        for store, generators in self._stores():
+            for name, method in generators.items():
+                with self._lock:
+                    if name not in store and method not in self._drawn:
+                        self._drawn[method] = self._draw(method)
+
+    def finish_preload(self) -> None:
+        """Convert what preload() drew to the display format. Main thread only."""
+        for store, generators in self._stores():
+            for name, method in generators.items():
+                if method in self._drawn:
+                    self._get(store, generators, name)
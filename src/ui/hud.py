@@ -0,0 +1,148 @@
+"""Heads-up display: score, difficulty and effect timers.
+
+Text surfaces come from an LRU cache keyed on (font, text, color), and a
+Hud composites its text onto one surface that is only rebuilt when a line
+changes, so most frames render no text at all. Text far from the rest,
+like the debug stats, goes on a Hud of its own to keep that surface small.
+"""
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+import pygame
+from src.utils.config import COLORS, POWERUP_COLORS, WINDOW_HEIGHT
+
+Color = Tuple[int, int, int]
+# (font, text, color, position) of one line of HUD text
+Line = Tuple[pygame.font.Font, str, Color, Tuple[int, int]]
+
+TEXT_CACHE_SIZE = 256  # Enough for every timer value of every effect type
+
+class TextCache:
+    """Rendered text surfaces, least recently used evicted first."""
+
+    def __init__(self, max_size: int = TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces: 'OrderedDict[tuple, pygame.Surface]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def render(self, font: pygame.font.Font, text: str, color: Color) -> pygame.Surface:
+        """Get antialiased text, rendering it only on a cache miss."""
+        key = (font, text, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+class Hud:
+    """Collects the HUD lines of a frame and composites them when they change.
+
+    Call begin() at the start of a frame, the draw_* methods, then
+    compose(). The composited text is available as surface, placed at rect.
+    """
+
+    def __init__(self, font: pygame.font.Font, small_font: pygame.font.Font,
+                 cache: Optional[TextCache] = None, height: int = WINDOW_HEIGHT):
+        self.font = font
+        self.small_font = small_font
+        self.cache = cache or TextCache()
+        self.height = height
+        self.surface: Optional[pygame.Surface] = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self._lines: List[Line] = []
+        self._composed: Tuple[Line, ...] = ()
+
+    def begin(self) -> None:
+        """Start describing a new frame."""
+        self._lines = []
+
+    def draw_score(self, score: int) -> None:
+        """Show the score."""
+        self._lines.append((self.font, f'Score: {score}', COLORS['WHITE'], (10, 10)))
+
+    def draw_difficulty(self, difficulty: str) -> None:
+        """Show the current difficulty level."""
+        self._lines.append((
+            self.small_font,
+            f'Difficulty: {difficulty.capitalize()} (Press 1-3 to change)',
+            COLORS['WHITE'],
+            (10, 50)
+        ))
+
+    def draw_active_effects(self, effects: Iterable, current_time: Optional[float] = None) -> None:
+        """Show the time left on each active effect, timed against current_time."""
+        y_pos = 80
+        for effect in effects:
+            if effect.is_active and not effect.is_expired(current_time):
+                # Quantize to the displayed precision so the text only
+                # changes when the visible value does
+                tenths = round(effect.get_remaining_time(current_time) * 10)
+                self._lines.append((
+                    self.small_font,
+                    f'{effect.type.capitalize()}: {tenths / 10:.1f}s',
+                    POWERUP_COLORS.get(effect.type, COLORS['WHITE']),
+                    (10, y_pos)
+                ))
+                y_pos += 25
+
+    def draw_debug_stats(self, text: str) -> None:
+        """Show performance counters in the bottom left corner."""
+        self._lines.append((self.small_font, text, COLORS['GRAY'], (10, self.height - 25)))
+
+    def compose(self) -> bool:
+        """Rebuild the HUD surface if any line changed.
+
+        Returns:
+            True if the surface or its position changed since the last call
+        """
+        lines = tuple(self._lines)
+        if lines == self._composed:
+            return False
+        self._composed = lines
+
+        texts = [(self.cache.render(font, text, color), pos)
+                 for font, text, color, pos in lines]
+        if not texts:
+            self.surface = None
+            self.rect = pygame.Rect(0, 0, 0, 0)
+            return True
+        rect = texts[0][0].get_rect(topleft=texts[0][1])
+        rect.unionall_ip([surface.get_rect(topleft=pos) for surface, pos in texts[1:]])
+        surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+        for text, pos in texts:
+            # Lines never overlap, so MAX copies each one's pixels and alpha
+            # exactly, and blitting the HUD matches blitting each line
+            surface.blit(text, (pos[0] - rect.x, pos[1] - rect.y),
+                         special_flags=pygame.BLEND_RGBA_MAX)
+        self.surface = surface
+        self.rect = rect
+        return True
+
+    def draw(self, screen: pygame.Surface, area: Optional[pygame.Rect] = None) -> None:
+        """Blit the HUD, or just the part of it inside area."""
+        if self.surface is None:
+            return
+        if area is None:
+            screen.blit(self.surface, self.rect)
+        elif area.colliderect(self.rect):
+            clip = area.clip(self.rect)
+            screen.blit(self.surface, clip, clip.move(-self.rect.x, -self.rect.y))
+
+    def draw_areas(self, screen: pygame.Surface, areas: Iterable[pygame.Rect]) -> None:
+        """Blit the parts of the HUD inside each of areas, in one batch."""
+        if self.surface is None:
+            return
+        hud_rect = self.rect
+        clips = [area.clip(hud_rect) for area in areas if area.colliderect(hud_rect)]
+        if clips:
+            screen.blits([(self.surface, clip, clip.move(-hud_rect.x, -hud_rect.y))
+                          for clip in clips], doreturn=False)
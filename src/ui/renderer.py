@@ -1,140 +1,460 @@
-"""Game renderer module."""
+"""Game renderer module.
+
+Drawing is deferred: clear_screen() starts a frame, the draw_* methods
+describe it, and present() puts it on the display.
+
+The background, one cell-sized tile repeated across the window, and the
+snake live on a persistent playfield surface. Given
+the snake's move counter, draw_snake() works out which cells a move touched
+(the new head, the old head that became body, the vacated and the new tail)
+and present() repaints only those on the playfield, so the cost of a frame
+does not grow with the snake. Food, power-ups and effect overlays are small
+per-frame items drawn over the playfield, followed by the HUD. The debug
+stats line at the bottom has a HUD of its own, so its frequent changes
+only repaint the cells under it rather than everything between it and
+the score.
+
+With dirty_rects enabled, present() copies only the changed cells to the
+screen and passes just those rectangles to pygame.display.update().
+Frames with an overlay are redrawn in full, except that nothing is drawn
+at all while the overlay and everything under it stay the same.
+
+Sprites are submitted in batches through Surface.blits(), positioned by
+rectangles precomputed once per grid cell.
+"""
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Set, Tuple
 import pygame
-import time
-from src.utils.config import COLORS, POWERUP_COLORS, CELL_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT
+from src.utils.config import COLORS, CELL_SIZE
+from src.core.simulation import RIGHT
 from src.ui.asset_manager import AssetManager
+from src.ui.hud import Hud
+
+Cell = Tuple[int, int]
+# Past this many changed cells, repainting the whole playfield is cheaper
+MAX_DIRTY_CELLS = 256
+# Sprites stacked in a cell, bottom first
+Layers = Tuple[pygame.Surface, ...]
 
 class Renderer:
-    def __init__(self, screen):
-        """Initialize the renderer with a pygame screen."""
-        self.screen = screen
+    def __init__(self, screen, dirty_rects: bool = False, cell_size: int = CELL_SIZE):
+        """Initialize the renderer with a pygame screen.
+
+        Args:
+            screen: Surface to draw on, normally the display surface
+            dirty_rects: Update only the parts of the display that changed
+            cell_size: Width and height of a grid cell in pixels
+        """
+        self.dirty_rects = dirty_rects
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
-        self.asset_manager = AssetManager()
+        self.hud = Hud(self.font, self.small_font, height=screen.get_height())
+        self.debug_hud = Hud(self.font, self.small_font, self.hud.cache, screen.get_height())
+        self._huds = (self.hud, self.debug_hud)
 
-    def draw_snake(self, snake_positions, has_shield=False):
-        """Draw the snake on the screen."""
-        if not snake_positions:
+        # Per-frame items over the playfield
+        self._items: Dict[Cell, Layers] = {}
+        self._overlay: Optional[str] = None
+        self.resize(screen, cell_size)
+
+    def resize(self, screen, cell_size: Optional[int] = None):
+        """Start drawing onto another screen, at another cell size if given.
+
+        Sprites come from the shared AssetManager of the cell size, which
+        keeps recently used scales, so switching back and forth is cheap.
+        Everything is redrawn next frame.
+        """
+        self.screen = screen
+        if cell_size is not None:
+            self.cell_size = cell_size
+        size = self.cell_size
+        self.asset_manager = AssetManager.shared(size)
+        for hud in self._huds:
+            hud.height = screen.get_height()
+        self.grid_width = screen.get_width() // size
+        self.grid_height = screen.get_height() // size
+        self._body_layers = self._index_body_pieces()
+        self._cell_rects: Dict[Cell, pygame.Rect] = {
+            (x, y): pygame.Rect(x * size, y * size, size, size)
+            for x in range(self.grid_width) for y in range(self.grid_height)
+        }
+
+        # Background plus snake, kept between frames
+        self.playfield = screen.copy()
+        self._playfield_valid = False
+        self._snake_layers: Dict[Cell, Layers] = {}
+        self._snake_dirty: Set[Cell] = set()
+        # What the snake layer shows: the body deque it mirrors, its move
+        # counter at the time and a copy of the positions
+        self._snake_body = None
+        self._snake_moves = 0
+        self._mirror: Deque[Cell] = deque()
+        self._mirror_counts: Dict[Cell, int] = {}
+
+        # What is on screen
+        self._drawn_items: Dict[Cell, Layers] = {}
+        self._shown_overlay: Optional[str] = None
+        self._overlays: Dict[str, pygame.Surface] = {}
+        self._full_redraw = True
+
+    def _steps(self, direction: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Get the coordinate differences of a unit step, plain and across an edge."""
+        dx, dy = direction
+        return [direction, (dx - dx * self.grid_width, dy - dy * self.grid_height)]
+
+    def _index_body_pieces(self) -> Dict[Tuple[int, int, int, int], Layers]:
+        """Key body pieces by the raw offsets of both neighbours, wrapped or not.
+
+        This spares the per-segment loop in _rebuild_snake any arithmetic
+        beyond four subtractions.
+        """
+        layers = {}
+        for (ahead, behind), piece in self.asset_manager.body_pieces.items():
+            for a in self._steps(ahead):
+                for b in self._steps(behind):
+                    layers[a + b] = (piece,)
+        return layers
+
+    def _direction(self, to: Cell, origin: Cell) -> Tuple[int, int]:
+        """Get the unit step from origin to a neighbouring cell, across edges too."""
+        return ((to[0] - origin[0] + 1) % self.grid_width - 1,
+                (to[1] - origin[1] + 1) % self.grid_height - 1)
+
+    def _add_item(self, position: Cell, sprite: pygame.Surface) -> None:
+        """Stack a sprite on top of whatever items a cell already holds this frame."""
+        layers = self._items.get(position)
+        self._items[position] = (sprite,) if layers is None else layers + (sprite,)
+
+    def draw_snake(self, snake_positions, has_shield=False, moves=None):
+        """Draw the snake on the screen.
+
+        Args:
+            snake_positions: Body positions from head to tail
+            has_shield: Draw the shield effect over the head
+            moves: The snake's move counter. When given and the same body
+                is drawn again, only the cells touched by the moves since
+                the last frame are repainted.
+        """
+        if snake_positions and has_shield:
+            self._add_item(snake_positions[0], self.asset_manager.get_effect('shield'))
+        if (moves is not None and snake_positions is self._snake_body
+                and self._update_snake(snake_positions, moves)):
             return
+        self._rebuild_snake(snake_positions)
+        self._snake_body = snake_positions if moves is not None else None
+        self._snake_moves = moves or 0
+
+    def _segment_layer(self, snake_positions, i: int) -> Layers:
+        """Get the sprite for the i-th segment from the head."""
+        assets = self.asset_manager
+        position = snake_positions[i]
+        last = len(snake_positions) - 1
+        if i == 0:
+            direction = self._direction(position, snake_positions[1]) if last else RIGHT
+            return (assets.get_oriented_sprite('snake_head', direction),)
+        if i == last:
+            direction = self._direction(position, snake_positions[i - 1])
+            return (assets.get_oriented_sprite('snake_tail', direction),)
+        ahead, behind = snake_positions[i - 1], snake_positions[i + 1]
+        x, y = position
+        return self._body_layers.get(
+            (ahead[0] - x, ahead[1] - y, behind[0] - x, behind[1] - y),
+            (assets.get_sprite('snake_body'),)
+        )
+
+    def _update_snake(self, snake_positions, moves: int) -> bool:
+        """Apply the moves since the last frame to the snake layer.
+
+        Returns:
+            False if the change cannot be applied incrementally, e.g. when
+            segments overlap, and the layer must be rebuilt instead
+        """
+        mirror = self._mirror
+        counts = self._mirror_counts
+        length = len(snake_positions)
+        steps = moves - self._snake_moves
+        popped = len(mirror) + steps - length
+        if steps == 0 and popped == 0:
+            return True
+        if steps < 0 or steps >= length or popped < 0 or popped >= len(mirror) or length < 3:
+            return False
+
+        vacated = [mirror.pop() for _ in range(popped)]
+        for i in range(steps - 1, -1, -1):
+            mirror.appendleft(snake_positions[i])
+        if mirror[0] != snake_positions[0] or mirror[-1] != snake_positions[-1]:
+            return False
+
+        # New heads, the old head that is now body, and the tail
+        repaint = [(i, snake_positions[i]) for i in range(steps + 1)]
+        repaint.append((length - 1, snake_positions[-1]))
+        for cell in vacated:
+            counts[cell] -= 1
+        for _, cell in repaint[:steps]:
+            counts[cell] = counts.get(cell, 0) + 1
+        # Overlapping segments would need their stacking order worked out.
+        # A vacated cell may still be held by the new head, but nothing else.
+        repainted = {cell for _, cell in repaint}
+        if (any(counts[cell] > 1 for cell in repainted) or
+                any(counts[cell] and cell not in repainted for cell in vacated)):
+            return False
+
+        layers = self._snake_layers
+        for cell in vacated:
+            if not counts[cell]:
+                del counts[cell]
+                del layers[cell]
+        for i, cell in repaint:
+            layers[cell] = self._segment_layer(snake_positions, i)
+        self._snake_dirty.update(vacated)
+        self._snake_dirty.update(cell for _, cell in repaint)
+        self._snake_moves = moves
+        return True
 
-        # Draw each segment
-        for i, position in enumerate(snake_positions):
-            x = position[0] * CELL_SIZE
-            y = position[1] * CELL_SIZE
-            rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-
-            if i == 0:  # Head
-                sprite = self.asset_manager.get_sprite('snake_head')
-                # Rotate head based on direction
-                if i < len(snake_positions) - 1:
-                    next_pos = snake_positions[1]
-                    direction = (position[0] - next_pos[0], position[1] - next_pos[1])
-                    angle = {
-                        (0, -1): 0,    # Up
-                        (0, 1): 180,   # Down
-                        (-1, 0): 90,   # Left
-                        (1, 0): 270    # Right
-                    }.get(direction, 0)
-                    sprite = pygame.transform.rotate(sprite, angle)
-            elif i == len(snake_positions) - 1:  # Tail
-                sprite = self.asset_manager.get_sprite('snake_tail')
-                # Rotate tail based on direction
-                prev_pos = snake_positions[-2]
-                direction = (position[0] - prev_pos[0], position[1] - prev_pos[1])
-                angle = {
-                    (0, -1): 180,  # Up
-                    (0, 1): 0,     # Down
-                    (-1, 0): 270,  # Left
-                    (1, 0): 90     # Right
-                }.get(direction, 0)
-                sprite = pygame.transform.rotate(sprite, angle)
-            else:  # Body
-                sprite = self.asset_manager.get_sprite('snake_body')
-
-            self.screen.blit(sprite, rect)
-
-            # Add shield effect if active
-            if has_shield and i == 0:
-                shield_effect = self.asset_manager.get_effect('shield')
-                if shield_effect:
-                    self.screen.blit(shield_effect, rect)
+    def _rebuild_snake(self, snake_positions) -> None:
+        """Recompute the whole snake layer, marking the cells that changed."""
+        previous = self._snake_layers
+        layers = self._build_snake_layers(snake_positions)
+        self._snake_layers = layers
+        self._mirror = deque(snake_positions)
+        counts: Dict[Cell, int] = {}
+        for position in self._mirror:
+            counts[position] = counts.get(position, 0) + 1
+        self._mirror_counts = counts
+        dirty = self._snake_dirty
+        dirty.update(cell for cell in previous if cell not in layers)
+        dirty.update(cell for cell, stacked in layers.items() if previous.get(cell) != stacked)
+
+    def _build_snake_layers(self, snake_positions) -> Dict[Cell, Layers]:
+        """Get the sprites of every cell the snake covers."""
+        layers: Dict[Cell, Layers] = {}
+        if not snake_positions:
+            return layers
+
+        def add(position: Cell, layer: Layers) -> None:
+            stacked = layers.get(position)
+            layers[position] = layer if stacked is None else stacked + layer
+
+        last = len(snake_positions) - 1
+        add(snake_positions[0], self._segment_layer(snake_positions, 0))
+        if last < 1:
+            return layers
+
+        # Body, with corner pieces where it turns
+        pieces = self._body_layers
+        body = (self.asset_manager.get_sprite('snake_body'),)
+        ahead = snake_positions[0]
+        current = snake_positions[1]
+        for behind in islice(snake_positions, 2, None):
+            x, y = current
+            add(current, pieces.get((ahead[0] - x, ahead[1] - y, behind[0] - x, behind[1] - y), body))
+            ahead, current = current, behind
+        add(current, self._segment_layer(snake_positions, last))
+        return layers
 
     def draw_food(self, food_position):
         """Draw the food on the screen."""
-        x = food_position[0] * CELL_SIZE
-        y = food_position[1] * CELL_SIZE
-        rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-        food_sprite = self.asset_manager.get_sprite('food')
-        self.screen.blit(food_sprite, rect)
+        if food_position is None:
+            return
+        self._add_item(food_position, self.asset_manager.get_sprite('food'))
 
     def draw_power_ups(self, power_ups):
         """Draw power-ups on the screen."""
         for power_up in power_ups:
             if not power_up.collected:
-                pos = power_up.get_position()
-                x = pos[0] * CELL_SIZE
-                y = pos[1] * CELL_SIZE
-                rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-                
-                sprite_name = f'powerup_{power_up.type}'
-                sprite = self.asset_manager.get_sprite(sprite_name)
+                sprite = self.asset_manager.get_sprite(f'powerup_{power_up.type}')
                 if sprite:
-                    self.screen.blit(sprite, rect)
+                    self._add_item(power_up.get_position(), sprite)
 
     def draw_score(self, score):
         """Draw the score on the screen."""
-        score_text = self.font.render(f'Score: {score}', True, COLORS['WHITE'])
-        self.screen.blit(score_text, (10, 10))
+        self.hud.draw_score(score)
 
     def draw_difficulty(self, difficulty):
         """Draw the current difficulty level."""
-        diff_text = self.small_font.render(
-            f'Difficulty: {difficulty.capitalize()} (Press 1-3 to change)', 
-            True, 
-            COLORS['WHITE']
-        )
-        self.screen.blit(diff_text, (10, 50))
-
-    def draw_active_effects(self, effects):
-        """Draw active power-up effects."""
-        y_pos = 80
-        for effect in effects:
-            if effect.is_active and not effect.is_expired():
-                remaining = max(0, effect.duration - (time.time() - effect.start_time))
-                effect_text = self.small_font.render(
-                    f'{effect.type.capitalize()}: {remaining:.1f}s', 
-                    True, 
-                    POWERUP_COLORS.get(effect.type, COLORS['WHITE'])
-                )
-                self.screen.blit(effect_text, (10, y_pos))
-                y_pos += 25
+        self.hud.draw_difficulty(difficulty)
+
+    def draw_active_effects(self, effects, current_time=None):
+        """Draw active power-up effects, timed against current_time if given."""
+        self.hud.draw_active_effects(effects, current_time)
+
+    def draw_debug_stats(self, stats):
+        """Draw performance counters."""
+        self.debug_hud.draw_debug_stats(str(stats))
 
     def draw_game_over(self):
         """Draw the game over screen."""
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(128)
-        self.screen.blit(overlay, (0, 0))
-        
-        game_over_text = self.font.render('Game Over! Press SPACE to restart', True, COLORS['WHITE'])
-        text_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
-        self.screen.blit(game_over_text, text_rect)
+        self._overlay = 'Game Over! Press SPACE to restart'
 
     def draw_paused(self):
         """Draw the pause screen."""
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(128)
-        self.screen.blit(overlay, (0, 0))
-        
-        pause_text = self.font.render('PAUSED - Press SPACE to continue', True, COLORS['WHITE'])
-        text_rect = pause_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
-        self.screen.blit(pause_text, text_rect)
+        self._overlay = 'PAUSED - Press SPACE to continue'
+
+    def _get_overlay(self, message: str) -> pygame.Surface:
+        """Get the surface dimming the screen and showing a message, built once.
+
+        The dimming and the text are blended together with premultiplied
+        alpha, so one blit with BLEND_PREMULTIPLIED gives the same result
+        as dimming the screen and then drawing the text.
+        """
+        overlay = self._overlays.get(message)
+        if overlay is None:
+            overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 128))
+            rendered = self.font.render(message, True, COLORS['WHITE'])
+            # Copied first: premul_alpha() garbles surfaces with padded rows,
+            # which font rendering produces
+            text = pygame.Surface(rendered.get_size(), pygame.SRCALPHA)
+            text.blit(rendered, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            text = text.premul_alpha()
+            text_rect = text.get_rect(center=overlay.get_rect().center)
+            overlay.blit(text, text_rect, special_flags=pygame.BLEND_PREMULTIPLIED)
+            if pygame.display.get_surface() is not None:
+                overlay = overlay.convert_alpha()
+            self._overlays[message] = overlay
+        return overlay
 
     def clear_screen(self):
-        """Clear the screen with background."""
-        background = self.asset_manager.get_background()
-        if background:
-            self.screen.blit(background, (0, 0))
+        """Start a new frame over the background."""
+        self._items = {}
+        for hud in self._huds:
+            hud.begin()
+        self._overlay = None
+
+    def invalidate(self):
+        """Redraw everything next frame, e.g. after the window was exposed."""
+        self._full_redraw = True
+
+    def repaint_playfield(self):
+        """Repaint the background and snake next frame, e.g. after a theme change."""
+        self._playfield_valid = False
+
+    def present(self):
+        """Draw the frame described since clear_screen() and show it."""
+        changed = self._update_playfield()
+        hud_areas = []  # Where each changed HUD was and now is
+        for hud in self._huds:
+            old_rect = hud.rect
+            if hud.compose():
+                hud_areas += (old_rect, hud.rect)
+        hud_changed = bool(hud_areas)
+        overlay = self._overlay
+        if (overlay and overlay == self._shown_overlay and not self._full_redraw
+                and not changed and changed is not None and not hud_changed
+                and self._items == self._drawn_items):
+            return  # Still showing this very frame
+        if (not self.dirty_rects or self._full_redraw or overlay or self._shown_overlay
+                or changed is None):
+            self._draw_everything()
+            if overlay:
+                self.screen.blit(self._get_overlay(overlay), (0, 0),
+                                 special_flags=pygame.BLEND_PREMULTIPLIED)
+            pygame.display.flip()
+            self._full_redraw = False
         else:
-            self.screen.fill(COLORS['BLACK'])
+            previous, current = self._drawn_items, self._items
+            changed.update(cell for cell, layers in current.items()
+                           if previous.get(cell) != layers)
+            changed.update(cell for cell in previous if cell not in current)
+            for rect in hud_areas:
+                changed |= self._cells_under(rect)
+            rects = self._draw_cells(changed)
+            if rects:
+                pygame.display.update(rects)
+        self._shown_overlay = overlay
+        self._drawn_items = self._items
+
+    def _cell_rect(self, position: Cell) -> pygame.Rect:
+        """Get the screen rectangle of a grid cell.
+
+        The rectangle is shared between frames and must not be modified.
+        """
+        rect = self._cell_rects.get(position)
+        if rect is None:  # Off the grid
+            size = self.cell_size
+            rect = pygame.Rect(position[0] * size, position[1] * size, size, size)
+        return rect
+
+    def _sprite_blits(self, cells: Dict[Cell, Layers]) -> List[Tuple[pygame.Surface, pygame.Rect]]:
+        """Get the (sprite, rect) blits drawing each cell's layers, bottom first."""
+        cell_rect = self._cell_rect
+        return [(sprite, cell_rect(position))
+                for position, layers in cells.items() for sprite in layers]
+
+    def _draw_background(self, rects: Optional[List[pygame.Rect]] = None) -> None:
+        """Restore the playfield background, everywhere or within cell rects."""
+        tile = self.asset_manager.get_background()
+        if rects is None:
+            if not tile:
+                self.playfield.fill(COLORS['BLACK'])
+                return
+            # Cover partial cells at the edges too
+            width, height = self.playfield.get_size()
+            size = self.cell_size
+            rects = [(x, y) for x in range(0, width, size) for y in range(0, height, size)]
+        if tile:
+            self.playfield.blits([(tile, rect) for rect in rects], doreturn=False)
+        else:
+            for rect in rects:
+                self.playfield.fill(COLORS['BLACK'], rect)
+
+    def _update_playfield(self) -> Optional[Set[Cell]]:
+        """Bring the playfield up to date with the snake layer.
+
+        Returns:
+            The cells repainted, or None if the whole playfield was
+        """
+        layers = self._snake_layers
+        if not self._playfield_valid:
+            self._draw_background()
+            self.playfield.blits(self._sprite_blits(layers), doreturn=False)
+            self._playfield_valid = True
+            self._snake_dirty = set()
+            return None
+
+        dirty = self._snake_dirty
+        if len(dirty) > MAX_DIRTY_CELLS:
+            self._playfield_valid = False
+            return self._update_playfield()
+        # Cells never overlap, so every background can go down before the sprites
+        self._draw_background([self._cell_rect(position) for position in dirty])
+        self.playfield.blits(self._sprite_blits(
+            {position: layers[position] for position in dirty if position in layers}
+        ), doreturn=False)
+        self._snake_dirty = set()
+        return dirty
+
+    def _draw_everything(self) -> None:
+        """Redraw the whole frame."""
+        self.screen.blit(self.playfield, (0, 0))
+        self.screen.blits(self._sprite_blits(self._items), doreturn=False)
+        for hud in self._huds:
+            hud.draw(self.screen)
+
+    def _cells_under(self, rect: pygame.Rect) -> Set[Cell]:
+        """Get the grid cells a screen rectangle overlaps."""
+        size = self.cell_size
+        right = min((rect.right - 1) // size, self.grid_width - 1)
+        bottom = min((rect.bottom - 1) // size, self.grid_height - 1)
+        return {(x, y)
+                for x in range(max(rect.left // size, 0), right + 1)
+                for y in range(max(rect.top // size, 0), bottom + 1)}
+
+    def _draw_cells(self, cells: Set[Cell]) -> List[pygame.Rect]:
+        """Copy cells from the playfield to the screen and draw over them.
+
+        Returns:
+            The rectangles of the display that were repainted
+        """
+        rects = [self._cell_rect(position) for position in cells]
+        playfield = self.playfield
+        self.screen.blits([(playfield, rect, rect) for rect in rects], doreturn=False)
+        items = self._items
+        self.screen.blits(self._sprite_blits(
+            {position: items[position] for position in cells if position in items}
+        ), doreturn=False)
+        # Put back the parts of the HUD text covering these cells
+        for hud in self._huds:
+            hud.draw_areas(self.screen, rects)
+        return rects
@@ -0,0 +1,28 @@
+"""On-disk cache of what the game generates at startup.
+
+Entries are cached under one root: SNAKE_ASSET_CACHE if set, or
+CACHE_DIR. Each kind of entry lives in a versioned directory of its own,
+so bumping its version simply misses the old entries. Entries are written atomically, and a cache that cannot be
+written is not an error, only a slower next launch.
+"""
+import os
+import threading
+
+from src.utils.config import CACHE_DIR
+
+def cache_dir(name: str) -> str:
+    """Get the directory, under the cache root, that one kind of entry lives in."""
+    root = os.environ.get('SNAKE_ASSET_CACHE') or CACHE_DIR
+    return os.path.join(root, name)
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write a cache entry, creating its directory, unless the cache is read-only."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so readers never see half a file
+        temporary = f'{path}.{os.getpid()}-{threading.get_ident()}.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(data)
+        os.replace(temporary, path)
+    except OSError:
+        pass  # A read-only cache only costs the next launch some time
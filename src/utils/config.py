@@ -1,4 +1,5 @@
 """Game configuration settings."""
+import os
 
 # Window Configuration
 WINDOW_WIDTH = 800
@@ -7,6 +8,10 @@ WINDOW_TITLE = "Snake Game"
 
 # Game Configuration
 CELL_SIZE = 20
+GRID_WIDTH = WINDOW_WIDTH // CELL_SIZE  # Cells per row
+GRID_HEIGHT = WINDOW_HEIGHT // CELL_SIZE  # Cells per column
+MIN_CELL_SIZE = 8  # Zoom limits, in pixels per cell
+MAX_CELL_SIZE = 64
 INITIAL_SNAKE_LENGTH = 3
 
 # Difficulty Settings
@@ -21,7 +26,12 @@ SPEED_SETTINGS = {
     Difficulty.HARD: 16
 }
 
+# Where synthesized sounds are cached, unless the
+# SNAKE_ASSET_CACHE environment variable names another directory
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'snake-game')
+
 FPS = 60  # Display refresh rate
+IDLE_TIMEOUT = 0.5  # Seconds to sleep waiting for input while nothing moves
 
 # Colors (RGB)
 COLORS = {
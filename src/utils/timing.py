@@ -0,0 +1,188 @@
+"""Clocks and the fixed-timestep tick scheduler.
+
+The scheduler decides how many simulation ticks to run each frame from the
+time a clock reports, so swapping the clock changes how fast the game runs
+without touching the game rules: RealClock for normal play, ScaledClock to
+fast-forward, VirtualClock for tests and replays that advance time by hand.
+FrameStats measures how fast frames come and how busy they keep the CPU,
+and StartupTrace how long each phase of startup takes.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+class RealClock:
+    """Monotonic wall-clock time."""
+
+    def now(self) -> float:
+        """Get the current time in seconds."""
+        return time.perf_counter()
+
+class VirtualClock:
+    """Clock that only moves when advanced explicitly."""
+
+    def __init__(self, start: float = 0.0):
+        self.time = start
+
+    def now(self) -> float:
+        """Get the current time in seconds."""
+        return self.time
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward."""
+        self.time += seconds
+
+class ScaledClock:
+    """Runs another clock faster or slower by a constant factor."""
+
+    def __init__(self, scale: float, base=None):
+        self.scale = scale
+        self.base = base or RealClock()
+        self.origin = self.base.now()
+
+    def now(self) -> float:
+        """Get the current time in seconds."""
+        return (self.base.now() - self.origin) * self.scale
+
+class FixedTimestepScheduler:
+    """Accumulates clock time and hands it out as whole ticks.
+
+    Each frame, call update() once and then consume() with the current tick
+    length until it returns False. Several ticks run in one frame if the
+    frame took longer than a tick, so movement speed no longer depends on
+    the frame rate. The leftover fraction carries over to the next frame.
+    """
+
+    def __init__(self, clock=None, max_ticks_per_frame: int = 8,
+                 unbounded: bool = False):
+        """
+        Args:
+            clock: Any object with a now() method; defaults to RealClock
+            max_ticks_per_frame: Catch-up limit. Time beyond it is dropped
+                so a long stall does not snowball into ever longer frames.
+            unbounded: Ignore the clock and always run max_ticks_per_frame
+                ticks, for soak tests at the fastest possible speed
+        """
+        self.clock = clock or RealClock()
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.unbounded = unbounded
+        self.accumulator = 0.0
+        self.ticks_this_frame = 0
+        self.paused = False
+        self._last_time: Optional[float] = self.clock.now()
+
+    def update(self) -> None:
+        """Start a frame by adding the time elapsed since the last one."""
+        now = self.clock.now()
+        if not self.paused:
+            self.accumulator += now - self._last_time
+        self._last_time = now
+        self.ticks_this_frame = 0
+
+    def consume(self, tick_interval: float) -> bool:
+        """Take one tick of tick_interval seconds if enough time has built up."""
+        if self.ticks_this_frame >= self.max_ticks_per_frame:
+            # Drop the backlog rather than falling further behind
+            self.accumulator = min(self.accumulator, tick_interval)
+            return False
+        if self.paused:
+            return False
+        if not self.unbounded:
+            if self.accumulator < tick_interval:
+                return False
+            self.accumulator -= tick_interval
+        self.ticks_this_frame += 1
+        return True
+
+    def pause(self) -> None:
+        """Stop accumulating time."""
+        self.paused = True
+
+    def resume(self) -> None:
+        """Accumulate time again, ignoring the time spent paused."""
+        self.paused = False
+        self._last_time = self.clock.now()
+
+    def reset(self) -> None:
+        """Forget any accumulated time, e.g. when a new game starts."""
+        self.accumulator = 0.0
+        self._last_time = self.clock.now()
+
+class FrameStats:
+    """Frame rate and CPU load, averaged over windows of wall time.
+
+    Call frame() once per frame. Every interval seconds, fps and cpu_load
+    (CPU seconds used per second of wall time, 1.0 being one busy core)
+    are recomputed for the window that just ended.
+    """
+
+    def __init__(self, clock=None, cpu_clock: Callable[[], float] = time.process_time,
+                 interval: float = 1.0):
+        self.clock = clock or RealClock()
+        self.cpu_clock = cpu_clock
+        self.interval = interval
+        self.fps = 0.0
+        self.cpu_load = 0.0
+        self._frames = 0
+        self._start = self.clock.now()
+        self._cpu_start = self.cpu_clock()
+
+    def frame(self) -> bool:
+        """Count a frame; return True if the averages were just updated."""
+        self._frames += 1
+        now = self.clock.now()
+        elapsed = now - self._start
+        if elapsed < self.interval:
+            return False
+        cpu = self.cpu_clock()
+        self.fps = self._frames / elapsed
+        self.cpu_load = (cpu - self._cpu_start) / elapsed
+        self._frames = 0
+        self._start = now
+        self._cpu_start = cpu
+        return True
+
+    def __str__(self) -> str:
+        return f'{self.fps:.0f} fps, CPU {self.cpu_load:.0%}'
+
+class StartupTrace:
+    """Timeline of startup phases, which may run on any thread.
+
+    Times are in seconds since origin, a time.perf_counter() reading taken
+    as early as possible, e.g. before the first heavy import.
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.phases: List[Tuple[str, str, float, float]] = []  # Name, thread, start, end
+        self.marks: List[Tuple[str, float]] = []  # Milestones such as the first frame
+
+    def now(self) -> float:
+        """Get the time since origin in seconds."""
+        return time.perf_counter() - self.origin
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the body of a with statement as a phase."""
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.add(name, start, self.now())
+
+    def add(self, name: str, start: float, end: float) -> None:
+        """Record a phase timed by the caller."""
+        self.phases.append((name, threading.current_thread().name, start, end))
+
+    def mark(self, name: str) -> None:
+        """Record that a milestone has been reached."""
+        self.marks.append((name, self.now()))
+
+    def report(self) -> str:
+        """Format the phases and milestones in time order, in milliseconds."""
+        rows = [(start, f'{start * 1000:8.1f} {(end - start) * 1000:8.1f}  {name} [{thread}]')
+                for name, thread, start, end in self.phases]
+        rows += [(at, f'{at * 1000:8.1f} {"":8}  -- {name}') for name, at in self.marks]
+        rows.sort(key=lambda row: row[0])
+        return '\n'.join([f'{"start ms":>8} {"took ms":>8}  phase'] + [text for _, text in rows])
@@ -0,0 +1,45 @@
+"""Test cases for the asset manager."""
+from collections import OrderedDict
+import pygame
+from src.ui.asset_manager import AssetManager, BACKGROUNDS, EFFECTS, SCALE_VARIANTS, SPRITES
+
+def contents(manager):
+    """Get the pixels of every asset a manager provides."""
+    surfaces = [manager.get_sprite(name) for name in SPRITES]
+    surfaces += [manager.get_effect(name) for name in EFFECTS]
+    surfaces += [manager.get_background(name) for name in BACKGROUNDS]
+    return [pygame.image.tobytes(surface, 'RGBA' if surface.get_flags() & pygame.SRCALPHA
+                                 else 'RGB') for surface in surfaces]
+
+def test_assets_are_generated_lazily():
+    """Test that only requested assets are drawn, each once."""
+    manager = AssetManager()
+    assert manager.generated == 0
+    food = manager.get_sprite('food')
+    assert manager.get_sprite('food') is food
+    assert manager.generated == 1
+
+    manager.preload()
+    total = len(SPRITES) + len(EFFECTS) + len(BACKGROUNDS)
+    assert manager.generated == total
+    assert list(manager.sprites) == ['food']  # The rest wait for the main thread
+    manager.finish_preload()
+    assert len(manager.sprites) == len(SPRITES) and manager.generated == total
+    assert contents(AssetManager()) == contents(manager)
+
+def test_shared_managers_keep_recent_scales(monkeypatch):
+    """Test that sprites follow the cell size and recent scales are reused."""
+    monkeypatch.setattr(AssetManager, '_shared', OrderedDict())
+    small = AssetManager.shared(10)
+    assert AssetManager.shared(10) is small
+    assert small.get_sprite('snake_head').get_size() == (10, 10)
+    assert small.get_background().get_size() == (10, 10)
+    large = AssetManager.shared(40)
+    assert large.get_oriented_sprite('snake_tail', (0, 1)).get_size() == (40, 40)
+
+    for cell_size in range(41, 40 + SCALE_VARIANTS - 1):
+        AssetManager.shared(cell_size)
+    assert AssetManager.shared(10) is small  # Now the most recently used
+    AssetManager.shared(60)  # Evicts the least recently used, 40
+    assert AssetManager.shared(10) is small
+    assert AssetManager.shared(40) is not large
@@ -0,0 +1,128 @@
+"""Test that BatchSimulation follows the same rules as GameSimulation."""
+import random
+import numpy as np
+import pytest
+from src.core.batch import BatchSimulation, EMPTY, NO_ACTION, POWER_UP_TYPES
+from src.core.powerup import PowerUpType
+from src.core.simulation import GameSimulation, EventType, DIRECTIONS
+from src.utils.config import Difficulty
+
+GRID_WIDTH = 12
+GRID_HEIGHT = 9
+DIFFICULTIES = [Difficulty.EASY, Difficulty.MEDIUM, Difficulty.HARD]
+
+def record_spawns(manager, log):
+    """Log every power-up the scalar manager spawns (None if it could not)."""
+    spawn = manager._spawn_power_up
+
+    def recording_spawn(snake_positions):
+        before = len(manager.power_ups)
+        spawn(snake_positions)
+        log.append(manager.power_ups[-1] if len(manager.power_ups) > before else None)
+
+    manager._spawn_power_up = recording_spawn
+
+class MirroredBatch(BatchSimulation):
+    """Batch simulation that takes spawn placement from scalar games.
+
+    Spawn positions are the only randomness in the rules, so pinning them to
+    the scalar games' choices makes every other difference a rule mismatch.
+    """
+
+    def __init__(self, reference, spawn_logs, **kwargs):
+        self.reference = reference
+        self.spawn_logs = spawn_logs
+        super().__init__(len(reference), **kwargs)
+
+    def _cell(self, position):
+        return EMPTY if position is None else position[1] * self.grid_width + position[0]
+
+    def _place_food(self, envs):
+        for env in envs:
+            self.food[env] = self._cell(self.reference[env].food.get_position())
+        return self.food[envs] != EMPTY
+
+    def _spawn_power_ups(self, envs):
+        placed = np.zeros(len(envs), dtype=bool)
+        for i, env in enumerate(envs):
+            power_up = self.spawn_logs[env].pop(0)
+            if power_up is None:
+                continue
+            slot = list(self.power_up_cells[env]).index(EMPTY)
+            self.power_up_cells[env, slot] = self._cell(power_up.get_position())
+            self.power_up_types[env, slot] = POWER_UP_TYPES.index(PowerUpType(power_up.type))
+            placed[i] = True
+        return placed
+
+def test_batch_matches_scalar_tick_for_tick():
+    """Test that both engines agree on every board after every tick."""
+    num_envs = 12
+    simulation = GameSimulation(GRID_WIDTH, GRID_HEIGHT)
+    difficulties = [DIFFICULTIES[i % 3] for i in range(num_envs)]
+    spawn_logs = [[] for _ in range(num_envs)]
+    next_seed = num_envs
+
+    def new_game(env, seed):
+        state = simulation.reset(seed=seed, difficulty=difficulties[env])
+        record_spawns(state.power_up_manager, spawn_logs[env])
+        return state
+
+    states = [new_game(env, env) for env in range(num_envs)]
+    batch = MirroredBatch(states, spawn_logs, grid_width=GRID_WIDTH,
+                          grid_height=GRID_HEIGHT, difficulty=difficulties)
+    rng = random.Random(0)
+    collected = set()
+    deaths = 0
+
+    for tick in range(4000):
+        actions = np.array([rng.randrange(4) if rng.random() < 0.3 else NO_ACTION
+                            for _ in range(num_envs)])
+        scalar_events = []
+        for env, state in enumerate(states):
+            action = None if actions[env] == NO_ACTION else DIRECTIONS[actions[env]]
+            scalar_events.append(simulation.step(state, action)[1])
+
+        events = batch.step(actions)
+
+        for env, state in enumerate(states):
+            kinds = {kind for kind, _ in scalar_events[env]}
+            assert list(state.snake.get_body_positions()) == batch.get_body_positions(env)
+            assert state.food.get_position() == batch.get_food_position(env)
+            assert sorted((p.get_position(), p.type) for p in state.power_up_manager.power_ups) \
+                == sorted(batch.get_power_ups(env))
+            assert state.score == batch.score[env]
+            assert state.time == batch.time[env]
+            assert state.game_over != batch.alive[env]
+            assert (EventType.ATE_FOOD in kinds) == events.ate_food[env]
+            assert (EventType.DIED in kinds) == events.died[env]
+            assert (EventType.BOARD_FULL in kinds) == events.board_full[env]
+            for kind, detail in scalar_events[env]:
+                if kind == EventType.POWER_UP_COLLECTED:
+                    assert POWER_UP_TYPES[events.power_up[env]].value == detail
+                    collected.add(detail)
+
+        # Restart finished games in both engines
+        finished = ~batch.alive
+        for env in np.flatnonzero(finished):
+            states[env] = new_game(env, next_seed)
+            next_seed += 1
+            deaths += 1
+        batch.reset(finished)
+
+    # Make sure the run exercised every rule
+    assert collected == {t.value for t in PowerUpType}
+    assert deaths > 0
+
+def test_batch_games_progress_independently():
+    """Test that unmirrored batches step, eat and die on their own."""
+    batch = BatchSimulation(64, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT, seed=1)
+    rng = np.random.default_rng(2)
+    died = 0
+    for _ in range(500):
+        events = batch.step(rng.integers(0, 4, size=64))
+        died += events.died.sum()
+        batch.reset(~batch.alive)
+
+    assert died > 0
+    assert (batch.length >= 3).all()
+    assert (batch.occupancy.sum(axis=1) == batch.length).all()
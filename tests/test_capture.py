@@ -0,0 +1,38 @@
+"""Test cases for headless frame capture."""
+import hashlib
+import numpy as np
+import pygame
+import pytest
+from src.capture import capture, compare_hashes, frame_hash, open_display, seeded_states
+from src.core.simulation import GameSimulation
+from src.ui.renderer import Renderer
+
+@pytest.fixture
+def screen():
+    """Open a dummy display fitting the default board."""
+    simulation = GameSimulation()
+    yield open_display(simulation.grid_width, simulation.grid_height)
+    pygame.display.quit()
+
+def test_captures_are_reproducible_across_update_modes(screen):
+    """Test that a seeded game hashes the same, dirty rects or not."""
+    full = capture(Renderer(screen, False), seeded_states(7, 'greedy', 150), 150)
+    dirty = capture(Renderer(screen, True), seeded_states(7, 'greedy', 150), 150)
+    assert full.frames == 150
+    assert len(set(full.hashes)) > 100  # Frames do change
+    assert dirty.hashes == full.hashes
+    assert full.render_fps > 0 and full.total_fps > 0
+
+def test_raw_frames_match_their_hashes(screen, tmp_path):
+    """Test the memory-mapped output and the golden comparison."""
+    path = str(tmp_path / 'frames.npy')
+    result = capture(Renderer(screen, True), seeded_states(1, 'greedy', 10), 10, raw_path=path)
+    frames = np.load(path, mmap_mode='r')
+    assert frames.shape == (10, screen.get_height(), screen.get_width(), 3)
+    assert [frame_hash(frame.tobytes()) for frame in frames] == result.hashes
+    assert frames[3, 0, 0].tolist() == list(screen.get_at((0, 0)))[:3]
+
+    golden = list(result.hashes)
+    assert compare_hashes(result.hashes, golden) == []
+    golden[4] = hashlib.sha256(b'other').hexdigest()[:16]
+    assert compare_hashes(result.hashes, golden[:8]) == [4, 8, 9]
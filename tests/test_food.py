@@ -1,6 +1,7 @@
 """Test cases for Food class."""
 import pytest
 from src.core.food import Food
+from src.core.grid import FreeCellIndex
 from src.utils.config import WINDOW_WIDTH, WINDOW_HEIGHT, CELL_SIZE
 
 def test_food_initialization():
@@ -12,6 +13,13 @@ def test_food_initialization():
     assert 0 <= pos[0] < WINDOW_WIDTH // CELL_SIZE
     assert 0 <= pos[1] < WINDOW_HEIGHT // CELL_SIZE
 
+def test_food_positions_stay_on_a_custom_grid():
+    """Test that positions come from the index's grid, not the window's."""
+    food = Food(FreeCellIndex(3, 2))
+    for _ in range(50):
+        x, y = food.generate_position()
+        assert 0 <= x < 3 and 0 <= y < 2
+
 def test_food_respawn():
     """Test food respawning."""
     food = Food()
@@ -28,3 +36,13 @@ def test_food_respawn():
     # New position should be different and not in snake positions
     assert new_pos not in snake_positions
     assert new_pos != initial_pos
+
+def test_food_respawn_full_board():
+    """Test that respawning on a full board reports failure."""
+    index = FreeCellIndex(2, 1)
+    food = Food(index)
+    index.occupy((0, 0))
+    index.occupy((1, 0))
+
+    assert not food.respawn()
+    assert food.get_position() is None
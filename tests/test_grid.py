@@ -0,0 +1,66 @@
+"""Test cases for FreeCellIndex class."""
+import random
+import pytest
+from src.core.grid import FreeCellIndex
+from src.core.snake import Snake
+
+def test_free_cell_index_occupy_and_release():
+    """Test that occupying and releasing cells updates the free count."""
+    index = FreeCellIndex(4, 3)
+    assert len(index) == 12
+
+    index.occupy((1, 2))
+    assert len(index) == 11
+    assert not index.is_free((1, 2))
+
+    index.release((1, 2))
+    assert len(index) == 12
+    assert index.is_free((1, 2))
+
+def test_free_cell_index_counts_shared_cells():
+    """Test that a cell stays occupied until every holder releases it."""
+    index = FreeCellIndex(4, 3)
+    index.occupy((0, 0))
+    index.occupy((0, 0))
+    index.release((0, 0))
+    assert not index.is_free((0, 0))
+    index.release((0, 0))
+    assert index.is_free((0, 0))
+
+def test_free_cell_index_samples_only_free_cells():
+    """Test that sampling never returns an occupied cell."""
+    rng = random.Random(1)
+    index = FreeCellIndex.from_occupied(5, 5, [(x, y) for x in range(5) for y in range(5) if (x, y) != (3, 1)])
+    for _ in range(20):
+        assert index.sample(rng) == (3, 1)
+
+def test_free_cell_index_full_board():
+    """Test that sampling a full board returns None."""
+    index = FreeCellIndex.from_occupied(2, 2, [(0, 0), (1, 0), (0, 1), (1, 1)])
+    assert index.is_full()
+    assert index.sample() is None
+
+def test_snake_keeps_free_cell_index_in_sync():
+    """Test that the snake occupies and releases cells as it moves."""
+    index = FreeCellIndex(10, 10)
+    snake = Snake((5, 5), 3, index)
+    assert len(index) == 97
+
+    snake.move()
+    assert not index.is_free((6, 5))
+    assert index.is_free((3, 5))
+    assert len(index) == 97
+
+def test_free_cell_index_restore_keeps_sampling_order():
+    """Test that a restored index samples exactly like the original."""
+    index = FreeCellIndex.from_occupied(6, 5, [(1, 1), (2, 3), (5, 4)])
+    snapshot = index.snapshot()
+    expected = [index.sample(random.Random(seed)) for seed in range(10)]
+
+    index.occupy((0, 0))
+    index.release((2, 3))
+    index.restore(snapshot)
+
+    assert len(index) == 27
+    assert not index.is_free((2, 3))
+    assert [index.sample(random.Random(seed)) for seed in range(10)] == expected
@@ -0,0 +1,52 @@
+"""Test cases for the HUD and its text cache."""
+import pygame
+import pytest
+from src.core.powerup import PowerUpEffect, PowerUpType
+from src.ui.hud import Hud, TextCache
+
+@pytest.fixture
+def fonts():
+    """Provide the HUD's two fonts."""
+    pygame.font.init()
+    yield pygame.font.Font(None, 36), pygame.font.Font(None, 24)
+    pygame.font.quit()
+
+def test_text_cache_evicts_least_recently_used(fonts):
+    """Test that the cache reuses surfaces and drops the stalest entry."""
+    font = fonts[0]
+    cache = TextCache(max_size=2)
+    first = cache.render(font, 'a', (255, 255, 255))
+    cache.render(font, 'b', (255, 255, 255))
+    assert cache.render(font, 'a', (255, 255, 255)) is first  # 'a' is now freshest
+    cache.render(font, 'c', (255, 255, 255))  # Evicts 'b'
+
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 3)
+    cache.render(font, 'b', (255, 255, 255))
+    assert cache.misses == 4
+    # Same text in another color is a different entry
+    cache.render(font, 'c', (255, 0, 0))
+    assert cache.misses == 5
+
+def test_hud_recomposes_only_when_visible_text_changes(fonts):
+    """Test that timers re-render only when their displayed tenths change."""
+    hud = Hud(*fonts)
+    effect = PowerUpEffect(PowerUpType.SHIELD, 8.0, 1.0, start_time=0.0)
+
+    def frame(score, time):
+        hud.begin()
+        hud.draw_score(score)
+        hud.draw_difficulty('medium')
+        hud.draw_active_effects([effect], time)
+        return hud.compose()
+
+    assert frame(0, 1.0)
+    misses = hud.cache.misses
+    assert not frame(0, 1.01)  # Still shows 7.0s
+    assert not frame(0, 1.04)
+    assert hud.cache.misses == misses
+
+    assert frame(0, 1.1)  # 6.9s
+    assert hud.cache.misses == misses + 1
+    assert frame(1, 1.1)
+    assert hud.surface.get_size() == hud.rect.size
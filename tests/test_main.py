@@ -0,0 +1,142 @@
+"""Test cases for the Game loop, using SDL's dummy video and audio drivers."""
+import threading
+from collections import OrderedDict
+import pygame
+import pytest
+from src.audio import MusicTrack
+from src.audio.sound_manager import MUSIC_CROSSFADE_MS
+from src.core.powerup import PowerUp, PowerUpType
+from src.main import Game
+from src.ui.asset_manager import AssetManager, SPRITES
+from src.utils.config import FPS, IDLE_TIMEOUT, GameState
+from src.utils.timing import VirtualClock
+
+class StopLoop(Exception):
+    """Raised to leave Game.run() after the frames a test needs."""
+
+class FrameClock:
+    """Stands in for pygame.time.Clock, logging the frame rate of each tick."""
+
+    def __init__(self):
+        self.ticks = []
+
+    def tick(self, framerate=0):
+        self.ticks.append(framerate)
+        return 0
+
+class MusicLog:
+    """Stands in for the SoundManager, logging every change of music."""
+
+    def __init__(self, track):
+        self.current_music = track
+        self.changes = []
+
+    def play_music(self, track, loop=True, fade_ms=0):
+        self.changes.append((track, fade_ms))
+        self.current_music = track
+
+    def play_sound(self, effect):
+        return True
+
+@pytest.fixture
+def game(monkeypatch, tmp_path):
+    """Start a game on the dummy drivers, caching sounds in a temporary directory."""
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    monkeypatch.setenv('SDL_AUDIODRIVER', 'dummy')
+    monkeypatch.setenv('SNAKE_ASSET_CACHE', str(tmp_path))
+    monkeypatch.setattr(AssetManager, '_shared', OrderedDict())
+    game = Game(VirtualClock())
+    yield game
+    pygame.mixer.quit()
+    pygame.display.quit()
+
+def test_loader_leaves_the_display_and_music_to_the_main_thread(game, monkeypatch):
+    """Test that run() loads on a worker, then converts sprites and starts music itself."""
+    threads = {'convert': set(), 'music': []}
+    convert = AssetManager._to_display_format
+    start_music = game.sound_manager.start_pending_music
+
+    def recording_convert(manager, surface):
+        threads['convert'].add(threading.current_thread())
+        return convert(manager, surface)
+
+    def recording_start_music():
+        threads['music'].append(threading.current_thread())
+        start_music()
+
+    def wait_for_next_frame():
+        if game.loader is None:
+            raise StopLoop
+        game.loader.join()
+        return []
+
+    monkeypatch.setattr(AssetManager, '_to_display_format', recording_convert)
+    monkeypatch.setattr(game.sound_manager, 'start_pending_music', recording_start_music)
+    monkeypatch.setattr(game, 'wait_for_next_frame', wait_for_next_frame)
+    with pytest.raises(StopLoop):
+        game.run()
+
+    assert game.loader is None and game.sound_manager.loaded
+    assert threads['music'] == [threading.main_thread()]
+    assert game.sound_manager.current_music == MusicTrack.GAME
+    assert threads['convert'] == {threading.main_thread()}
+    assert len(game.renderer.asset_manager.sprites) == len(SPRITES)
+
+def test_idle_frames_wait_for_events_instead_of_ticking(game, monkeypatch):
+    """Test that paused and game-over frames block on the queue and pass on what woke them."""
+    space = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)
+    arriving = [pygame.event.Event(pygame.NOEVENT), space, space]
+    waits = []
+
+    def wait(timeout):
+        waits.append(timeout)
+        return arriving.pop(0)
+
+    monkeypatch.setattr(pygame.event, 'wait', wait)
+    monkeypatch.setattr(pygame.event, 'get', lambda: [])
+    game.clock = FrameClock()
+
+    # Playing: tick at the frame rate and leave the queue to handle_input
+    assert game.wait_for_next_frame() is None
+    assert (game.clock.ticks, waits) == ([FPS], [])
+
+    game.game_state = GameState.PAUSED
+    assert game.wait_for_next_frame() == []  # Nothing came within the timeout
+    events = game.wait_for_next_frame()
+    assert events == [space]
+    assert waits == [int(IDLE_TIMEOUT * 1000)] * 2
+    assert game.clock.ticks == [FPS, 0, 0]  # Timing only, never a frame-rate sleep
+    game.handle_input(events)
+    assert game.game_state == GameState.PLAYING
+
+    game.game_state = GameState.GAME_OVER
+    events = game.wait_for_next_frame()
+    assert len(waits) == 3
+    game.handle_input(events)
+    assert game.game_state == GameState.PLAYING
+
+def test_music_crossfades_once_each_way_around_the_speed_effect(game):
+    """Test one switch to the fast track on pickup and one back on expiry."""
+    music = game.sound_manager = MusicLog(MusicTrack.GAME)
+    state = game.state
+    head = state.snake.get_head_position()
+    target = (head[0] + 1, head[1])
+    if state.food.get_position() == target:
+        state.food.respawn()
+    state.power_up_manager.power_ups.append(PowerUp(target, PowerUpType.SPEED, 0.0))
+    state.free_cells.occupy(target)
+
+    def frame():
+        game.scheduler.clock.advance(1 / FPS)
+        game.update()
+        return game.power_up_manager.has_active_effect(PowerUpType.SPEED)
+
+    while not frame():
+        pass
+    assert music.changes == [(MusicTrack.GAME_FAST, MUSIC_CROSSFADE_MS)]
+    while frame():
+        assert len(music.changes) == 1  # Not again while the effect lasts
+    assert music.changes[1:] == [(MusicTrack.GAME, MUSIC_CROSSFADE_MS)]
+    for _ in range(FPS):
+        frame()
+    assert len(music.changes) == 2
@@ -0,0 +1,76 @@
+"""Test cases for PowerUpManager class."""
+import pytest
+from src.core.grid import FreeCellIndex
+from src.core.powerup import PowerUp, PowerUpManager, PowerUpType
+
+def test_power_up_spawns_on_free_cell():
+    """Test that spawned power-ups take a free cell and hold it."""
+    free_cells = FreeCellIndex.from_occupied(3, 1, [(0, 0), (2, 0)])
+    manager = PowerUpManager(free_cells)
+
+    manager._spawn_power_up([])
+
+    assert manager.power_ups[0].get_position() == (1, 0)
+    assert free_cells.is_full()
+
+def test_power_up_spawn_skipped_on_full_board():
+    """Test that nothing spawns when no cell is free."""
+    free_cells = FreeCellIndex.from_occupied(2, 1, [(0, 0), (1, 0)])
+    manager = PowerUpManager(free_cells)
+
+    manager._spawn_power_up([])
+
+    assert manager.power_ups == []
+
+def test_collecting_power_up_releases_cell():
+    """Test that collecting a power-up frees its cell."""
+    free_cells = FreeCellIndex(3, 1)
+    manager = PowerUpManager(free_cells)
+    manager._spawn_power_up([])
+    position = manager.power_ups[0].get_position()
+
+    effect = manager.check_collision(position)
+
+    assert effect is not None
+    assert manager.power_ups == []
+    assert free_cells.is_free(position)
+
+def place(manager, position, type_, current_time=0.0):
+    """Put a power-up on the board by hand."""
+    manager.power_ups.append(PowerUp(position, type_, current_time))
+    manager.free_cells.occupy(position)
+
+def test_effects_expire_in_order_of_game_time():
+    """Test that effects end once game time passes their duration."""
+    manager = PowerUpManager(FreeCellIndex(3, 1), clock=lambda: 0.0)
+    place(manager, (0, 0), PowerUpType.SPEED)
+    place(manager, (1, 0), PowerUpType.SHIELD)
+
+    manager.update([], 1.0)
+    manager.check_collision((0, 0))  # Speed lasts 5s
+    manager.check_collision((1, 0))  # Shield lasts 8s
+    assert manager.get_effect_magnitude(PowerUpType.SPEED) == 1.5
+    assert manager.has_active_effect(PowerUpType.SHIELD)
+
+    manager.update([], 6.0)
+    assert manager.get_effect_magnitude(PowerUpType.SPEED) == 1.0
+    assert manager.has_active_effect(PowerUpType.SHIELD)
+    assert [e.type for e in manager.get_active_effects()] == [PowerUpType.SHIELD.value]
+
+    manager.update([], 9.0)
+    assert not manager.has_active_effect(PowerUpType.SHIELD)
+    assert manager.get_active_effects() == []
+
+def test_overlapping_effects_keep_type_active():
+    """Test that a second pickup of the same type extends the effect."""
+    manager = PowerUpManager(FreeCellIndex(3, 1), clock=lambda: 0.0)
+    place(manager, (0, 0), PowerUpType.SCORE)
+    manager.check_collision((0, 0))
+
+    manager.update([], 8.0)
+    place(manager, (1, 0), PowerUpType.SCORE, 8.0)
+    manager.check_collision((1, 0))
+
+    manager.update([], 12.0)
+    assert manager.get_effect_magnitude(PowerUpType.SCORE) == 2.0
+    assert len(manager.get_active_effects()) == 1
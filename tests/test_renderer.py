@@ -0,0 +1,192 @@
+"""Test cases for the Renderer, using SDL's dummy video driver."""
+import random
+import pygame
+import pytest
+from src.core.policies import POLICIES
+from src.core.powerup import PowerUp, PowerUpType
+from src.core.simulation import GameSimulation, UP, DOWN, LEFT, RIGHT
+from src.ui.renderer import Renderer
+from src.utils.config import CELL_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT
+
+@pytest.fixture(scope='module', autouse=True)
+def environment(tmp_path_factory):
+    """Use the dummy video driver and a temporary cache for this module only."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+        monkeypatch.setenv('SNAKE_ASSET_CACHE', str(tmp_path_factory.mktemp('cache')))
+        yield
+
+@pytest.fixture(autouse=True)
+def display():
+    """Open a dummy display for the renderer to present to."""
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    yield
+    pygame.display.quit()
+
+def make_renderer(dirty_rects):
+    """Create a renderer drawing onto its own off-screen surface."""
+    return Renderer(pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)), dirty_rects)
+
+def render(renderer, state, paused=False, moves=None, stats=None):
+    """Draw a frame the way Game.render does."""
+    manager = state.power_up_manager
+    renderer.clear_screen()
+    renderer.draw_snake(state.snake.get_body_positions(),
+                        manager.has_active_effect(PowerUpType.SHIELD), moves)
+    renderer.draw_food(state.food.get_position())
+    renderer.draw_power_ups(manager.power_ups)
+    renderer.draw_score(state.score)
+    renderer.draw_difficulty(state.difficulty)
+    renderer.draw_active_effects(manager.get_active_effects(), state.time)
+    if stats:
+        renderer.draw_debug_stats(stats)
+    if paused:
+        renderer.draw_paused()
+    renderer.present()
+
+def pixels(renderer):
+    """Get the renderer's screen contents."""
+    return pygame.image.tobytes(renderer.screen, 'RGB')
+
+def test_dirty_rects_match_full_redraw():
+    """Test that partial updates leave the same picture as full redraws."""
+    simulation = GameSimulation()
+    state = simulation.reset(seed=2)
+    # Start with a shield so the effect overlay and HUD timer are drawn
+    target = state.snake.get_next_head_position()
+    if state.food.get_position() == target:
+        state.food.respawn()
+    state.power_up_manager.power_ups.append(PowerUp(target, PowerUpType.SHIELD, 0.0))
+    state.free_cells.occupy(target)
+
+    policy = POLICIES['greedy'](random.Random(2))
+    full, dirty = make_renderer(False), make_renderer(True)
+    for tick in range(300):
+        if state.game_over:
+            break
+        simulation.step(state, policy(state))
+        paused = 100 <= tick < 103
+        render(full, state, paused)
+        render(dirty, state, paused, state.snake.moves)
+        assert pixels(dirty) == pixels(full), f"frames differ at tick {tick}"
+
+def test_incremental_snake_layer_matches_rebuilt_one():
+    """Test that per-move playfield updates survive growth, wraps and resets."""
+    simulation = GameSimulation()
+    state = simulation.reset(seed=5)
+    policy = POLICIES['greedy'](random.Random(5))
+    rebuilt, incremental = make_renderer(False), make_renderer(False)
+    saved = state.snapshot()
+    for tick in range(400):
+        if state.game_over or tick == 200:
+            # Restoring swaps in a new body, which must be redrawn from scratch
+            state.restore(saved)
+        simulation.step(state, policy(state))
+        render(rebuilt, state)
+        render(incremental, state, moves=state.snake.moves)
+        assert incremental._snake_layers.keys() == rebuilt._snake_layers.keys()
+        assert pixels(incremental) == pixels(rebuilt), f"frames differ at tick {tick}"
+
+def test_dirty_rects_repaint_only_changed_cells(monkeypatch):
+    """Test that a plain move repaints a handful of cells, not the window."""
+    updates = []
+    monkeypatch.setattr(pygame.display, 'update', lambda rects: updates.append(rects))
+    simulation = GameSimulation()
+    state = simulation.reset(seed=3)
+    renderer = make_renderer(True)
+    render(renderer, state)
+    assert updates == []  # The first frame is a full flip
+
+    simulation.step(state)
+    render(renderer, state)
+    render(renderer, state)
+
+    # Old tail, new tail, old head (now body) and new head
+    assert len(updates) == 1
+    assert len(updates[0]) == 4
+
+def test_debug_stats_repaint_only_their_own_line(monkeypatch):
+    """Test that new stats repaint the bottom rows, not a column up to the score."""
+    updates = []
+    monkeypatch.setattr(pygame.display, 'update', lambda rects: updates.append(rects))
+    state = GameSimulation().reset(seed=3)
+    renderer = make_renderer(True)
+    render(renderer, state, moves=state.snake.moves, stats='60 fps')
+    render(renderer, state, moves=state.snake.moves, stats='59 fps')
+
+    assert len(updates) == 1
+    assert min(rect.top for rect in updates[0]) >= WINDOW_HEIGHT - 2 * CELL_SIZE
+
+def test_static_overlay_frames_are_skipped(monkeypatch):
+    """Test that the pause screen is drawn once and matches dim-then-text."""
+    flips = []
+    monkeypatch.setattr(pygame.display, 'flip', lambda: flips.append(True))
+    state = GameSimulation().reset(seed=4)
+    renderer = make_renderer(True)
+    render(renderer, state)
+    before = renderer.screen.copy()
+    for _ in range(5):
+        render(renderer, state, paused=True)
+    assert len(flips) == 2  # The first frame and the first paused one
+
+    # The old way: dim the frame, then draw the text over it
+    dim = pygame.Surface(before.get_size())
+    dim.set_alpha(128)
+    before.blit(dim, (0, 0))
+    text = renderer.font.render('PAUSED - Press SPACE to continue', True, (255, 255, 255))
+    before.blit(text, text.get_rect(center=before.get_rect().center))
+    expected = pygame.image.tobytes(before, 'RGB')
+    assert max(abs(a - b) for a, b in zip(pixels(renderer), expected)) <= 2
+
+    render(renderer, state)  # Unpausing redraws
+    assert len(flips) == 3
+
+def test_switching_scale_redraws_at_the_new_cell_size():
+    """Test that a resized renderer draws like one built for that scale."""
+    simulation = GameSimulation()
+    state = simulation.reset(seed=6)
+    renderer = make_renderer(True)
+    render(renderer, state, moves=state.snake.moves)
+
+    size = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+    renderer.resize(pygame.Surface(size), CELL_SIZE // 2)
+    reference = Renderer(pygame.Surface(size), False, CELL_SIZE // 2)
+    assert renderer.asset_manager is reference.asset_manager
+    for tick in range(20):
+        render(renderer, state, moves=state.snake.moves)
+        render(reference, state)
+        assert pixels(renderer) == pixels(reference), f"frames differ at tick {tick}"
+        simulation.step(state)
+
+def test_snake_sprites_face_their_direction_across_edges():
+    """Test head, tail and corner pieces, including a snake wrapping an edge."""
+    renderer = make_renderer(False)
+    assets = renderer.asset_manager
+    width = renderer.grid_width
+    # Heading right across the edge, having turned from going down
+    snake = [(0, 5), (width - 1, 5), (width - 1, 4), (width - 1, 3)]
+
+    renderer.clear_screen()
+    renderer.draw_snake(snake)
+
+    cells = renderer._snake_layers
+    assert cells[(0, 5)] == (assets.get_oriented_sprite('snake_head', RIGHT),)
+    assert cells[(width - 1, 5)] == (assets.body_pieces[(RIGHT, UP)],)
+    assert cells[(width - 1, 4)] == (assets.get_sprite('snake_body'),)
+    assert cells[(width - 1, 3)] == (assets.get_oriented_sprite('snake_tail', UP),)
+    assert assets.body_pieces[(RIGHT, UP)] is not assets.get_sprite('snake_body')
+
+def test_directional_sprites_are_pre_rotated():
+    """Test that every orientation exists up front in display format."""
+    assets = make_renderer(False).asset_manager
+    for name in ('snake_head', 'snake_tail'):
+        sprites = {d: assets.get_oriented_sprite(name, d) for d in (UP, DOWN, LEFT, RIGHT)}
+        assert len({id(sprite) for sprite in sprites.values()}) == 4
+        for sprite in sprites.values():
+            assert sprite.get_bitsize() == pygame.display.get_surface().get_bitsize()
+    # A right-facing head keeps its eyes on the right
+    head = assets.get_oriented_sprite('snake_head', RIGHT)
+    assert head.get_at((13, 7))[:3] == (255, 255, 255)
+    assert assets.get_oriented_sprite('snake_head', LEFT).get_at((6, 12))[:3] == (255, 255, 255)
@@ -0,0 +1,106 @@
+"""Test cases for replay recording and playback."""
+import random
+import pygame
+import pytest
+from src.core.policies import POLICIES
+from src.core.replay import Replay, ReplayError, ReplayPlayer, ReplayRecorder
+from src.core.simulation import GameSimulation
+from src.utils.config import Difficulty
+from src.utils.timing import VirtualClock
+
+def fingerprint(state):
+    """Summarize everything that playback must reproduce."""
+    return (
+        state.ticks, state.time, state.score, state.game_over, state.difficulty,
+        list(state.snake.get_body_positions()), state.food.get_position(),
+        [(p.get_position(), p.type) for p in state.power_up_manager.power_ups],
+        [(e.type, e.start_time) for e in state.power_up_manager.get_active_effects()],
+        state.rng.getstate(),
+    )
+
+def record_game(ticks, snapshot_interval):
+    """Play a cycle-following game, recording it and fingerprinting every tick."""
+    simulation = GameSimulation(16, 12)
+    state = simulation.reset(seed=11, difficulty=Difficulty.EASY)
+    recorder = ReplayRecorder(simulation, state, snapshot_interval)
+    policy = POLICIES['cycle'](random.Random(3))
+    fingerprints = {}
+    while state.ticks < ticks and not state.game_over:
+        if state.ticks == 40:
+            state.difficulty = Difficulty.HARD
+            recorder.record_difficulty(state, Difficulty.HARD)
+        action = policy(state)
+        recorder.record_action(state, action)
+        simulation.step(state, action)
+        recorder.on_tick(state)
+        fingerprints[state.ticks] = fingerprint(state)
+    return recorder, fingerprints
+
+def test_playback_reproduces_every_tick():
+    """Test that playing a replay from the start matches the recording."""
+    recorder, fingerprints = record_game(600, 100)
+    player = ReplayPlayer(Replay(recorder.to_bytes()))
+
+    while not player.is_finished():
+        player.step()
+        assert fingerprint(player.state) == fingerprints[player.state.ticks]
+    assert player.state.ticks == max(fingerprints)
+
+def test_seek_restores_snapshots_exactly():
+    """Test that seeking lands on the same state as continuous playback."""
+    recorder, fingerprints = record_game(600, 100)
+    player = ReplayPlayer(Replay(recorder.to_bytes()))
+
+    for tick in (450, 100, 37, 299, 300, max(fingerprints)):
+        player.seek(tick)
+        assert fingerprint(player.state) == fingerprints[tick]
+
+    # Playback continues correctly after a seek
+    player.seek(250)
+    for _ in range(60):
+        player.step()
+    assert fingerprint(player.state) == fingerprints[310]
+
+def test_seek_by_time_follows_the_recorded_tick_times():
+    """Test that seeking to a game time lands on the tick that reaches it."""
+    recorder, fingerprints = record_game(600, 100)
+    player = ReplayPlayer(Replay(recorder.to_bytes()))
+    times = {tick: state[1] for tick, state in fingerprints.items()}
+    times[0] = 0.0
+
+    # Ticks last 1/8 s on EASY, then 1/16 s from tick 40 on HARD
+    for target in (30.0, 3.0, 12.34, 5.0):
+        player.seek_time(target)
+        tick = player.state.ticks
+        assert times[tick - 1] < target <= times[tick]
+        assert fingerprint(player.state) == fingerprints[tick]
+    player.seek_time(-1.0)
+    assert player.state.ticks == 0
+
+def test_game_shows_the_difficulty_the_replay_plays_at(monkeypatch, tmp_path):
+    """Test that the HUD follows difficulty changes during playback and seeks."""
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    monkeypatch.setenv('SNAKE_ASSET_CACHE', str(tmp_path))
+    from src.main import Game
+    recorder, _ = record_game(200, 100)
+    clock = VirtualClock()
+    game = Game(clock, replay=Replay(recorder.to_bytes()))
+    shown = []
+    monkeypatch.setattr(game.renderer, 'draw_difficulty', shown.append)
+    try:
+        while game.state.ticks <= 40:
+            clock.advance(0.5)
+            game.update()
+        game.render()
+        assert shown[-1] == game.state.difficulty == Difficulty.HARD
+
+        game.seek_replay(-100)
+        game.render()
+        assert shown[-1] == game.state.difficulty == Difficulty.EASY
+    finally:
+        pygame.display.quit()
+
+def test_replay_rejects_foreign_data():
+    """Test that loading garbage fails cleanly."""
+    with pytest.raises(ReplayError):
+        Replay(b'not a replay at all, definitely not' * 2)
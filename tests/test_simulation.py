@@ -0,0 +1,173 @@
+"""Test cases for the headless GameSimulation."""
+import random
+import pytest
+from src.core.policies import POLICIES
+from src.core.simulation import GameSimulation, EventType, UP, DOWN, LEFT, RIGHT
+from src.core.powerup import PowerUp, PowerUpType
+from src.utils.config import Difficulty, SPEED_SETTINGS
+
+def play(simulation, state, actions):
+    """Step through a list of actions and collect every event."""
+    events = []
+    for action in actions:
+        state, tick_events = simulation.step(state, action)
+        events.extend(tick_events)
+    return events
+
+def test_same_seed_gives_same_game():
+    """Test that games are reproducible from their seed."""
+    simulation = GameSimulation()
+    actions = [None, UP, None, LEFT, None, None, DOWN, RIGHT] * 50
+    first = simulation.reset(seed=42)
+    second = simulation.reset(seed=42)
+
+    play(simulation, first, actions)
+    play(simulation, second, actions)
+
+    assert list(first.snake.get_body_positions()) == list(second.snake.get_body_positions())
+    assert first.food.get_position() == second.food.get_position()
+    assert first.score == second.score
+    assert first.time == second.time
+
+def test_step_advances_game_time_by_move_interval():
+    """Test that each tick advances game time by one move interval."""
+    simulation = GameSimulation()
+    state = simulation.reset(seed=1, difficulty=Difficulty.HARD)
+
+    simulation.step(state)
+
+    assert state.ticks == 1
+    assert state.time == pytest.approx(1.0 / SPEED_SETTINGS[Difficulty.HARD])
+
+def test_snake_wraps_around_edges():
+    """Test that the head reappears on the opposite side of the board."""
+    simulation = GameSimulation(grid_width=6, grid_height=4)
+    state = simulation.reset(seed=3)
+
+    play(simulation, state, [None] * 3)
+
+    assert state.snake.get_head_position() == (0, 2)
+
+def test_eating_food_grows_and_scores():
+    """Test that reaching the food emits an event and grows the snake."""
+    simulation = GameSimulation()
+    state = simulation.reset(seed=5)
+    head = state.snake.get_head_position()
+    state.food.free_cells.release(state.food.get_position())
+    state.food.position = None
+    state.food._place((head[0] + 1, head[1]))
+
+    _, events = simulation.step(state)
+    simulation.step(state)
+
+    assert (EventType.ATE_FOOD, None) in events
+    assert state.score == 1
+    assert state.snake.get_length() == 4
+
+def test_collecting_score_power_up_awards_bonus():
+    """Test that the score power-up gives its bonus and reports its type."""
+    simulation = GameSimulation()
+    state = simulation.reset(seed=7)
+    head = state.snake.get_head_position()
+    target = (head[0] + 1, head[1])
+    if state.food.get_position() == target:
+        state.food.respawn()
+    state.power_up_manager.power_ups.append(PowerUp(target, PowerUpType.SCORE, 0.0))
+    state.free_cells.occupy(target)
+
+    _, events = simulation.step(state)
+
+    assert events == [(EventType.POWER_UP_COLLECTED, PowerUpType.SCORE.value)]
+    assert state.score == 10
+    assert state.power_ups_collected == 1
+
+def test_board_is_not_full_while_a_power_up_holds_a_cell():
+    """Test that food takes a power-up's cell when the snake covers the rest."""
+    simulation = GameSimulation(grid_width=5, grid_height=1)
+    state = simulation.reset(seed=11)
+    state.food._place(None)
+    state.food._place((3, 0))
+    state.power_up_manager.power_ups.append(PowerUp((4, 0), PowerUpType.SPEED, 0.0))
+    state.free_cells.occupy((4, 0))
+    state.snake.grow()
+
+    _, events = simulation.step(state)
+
+    assert events == [(EventType.ATE_FOOD, None)]
+    assert not state.game_over
+    assert state.food.get_position() == (4, 0)
+    assert state.power_up_manager.power_ups == []
+    assert state.free_cells.is_full()
+
+    # Now the snake does cover every cell
+    _, events = simulation.step(state)
+    assert (EventType.BOARD_FULL, None) in events
+
+def test_running_into_body_ends_game():
+    """Test that self collision without a shield ends the game."""
+    simulation = GameSimulation()
+    state = simulation.reset(seed=9)
+    for _ in range(2):
+        state.snake.grow()
+        simulation.step(state)
+
+    events = play(simulation, state, [DOWN, LEFT, UP])
+
+    assert (EventType.DIED, None) in events
+    assert state.game_over
+    # Ticks after game over are ignored
+    assert simulation.step(state)[1] == []
+
+def fingerprint(state):
+    """Summarize everything a restored game must reproduce."""
+    return (
+        state.ticks, state.time, state.score, state.game_over,
+        list(state.snake.get_body_positions()), state.food.get_position(),
+        [(p.get_position(), p.type) for p in state.power_up_manager.power_ups],
+        [(e.type, e.start_time) for e in state.power_up_manager.get_active_effects()],
+        len(state.free_cells), state.rng.getstate(),
+    )
+
+def test_restore_replays_the_same_future():
+    """Test that a restored snapshot continues exactly like the original."""
+    simulation = GameSimulation(16, 12)
+    state = simulation.reset(seed=4)
+    policy = POLICIES['greedy'](random.Random(4))
+    play(simulation, state, [policy(state) for _ in range(100)])
+    # Collect a shield so the snapshot carries an active effect
+    target = state.snake.get_next_head_position()
+    target = (target[0] % 16, target[1] % 12)
+    if state.food.get_position() == target:
+        state.food.respawn()
+    if state.free_cells.is_free(target):
+        state.power_up_manager.power_ups.append(PowerUp(target, PowerUpType.SHIELD, state.time))
+        state.free_cells.occupy(target)
+    simulation.step(state)
+    assert state.power_up_manager.has_active_effect(PowerUpType.SHIELD)
+    snapshot = state.snapshot()
+
+    actions = []
+    expected = []
+    for _ in range(400):
+        actions.append(policy(state))
+        simulation.step(state, actions[-1])
+        expected.append(fingerprint(state))
+
+    state.restore(snapshot)
+    for action, fingerprint_ in zip(actions, expected):
+        simulation.step(state, action)
+        assert fingerprint(state) == fingerprint_
+
+def test_clone_is_independent():
+    """Test that stepping a clone leaves the original untouched."""
+    simulation = GameSimulation()
+    state = simulation.reset(seed=8)
+    play(simulation, state, [None, UP, None, LEFT] * 5)
+    before = fingerprint(state)
+
+    clone = state.clone()
+    assert fingerprint(clone) == before
+    play(simulation, clone, [DOWN, None, RIGHT] * 10)
+
+    assert fingerprint(state) == before
+    assert fingerprint(clone) != before
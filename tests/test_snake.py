@@ -51,3 +51,36 @@ def test_snake_collision():
     
     # Now the snake should have collided with itself
     assert snake.check_collision() == True
+
+def test_snake_occupancy_follows_movement():
+    """Test that occupied cells are updated as the snake moves and grows."""
+    snake = Snake((5, 5))
+    assert snake.is_occupied((3, 5))
+
+    snake.move()  # Tail leaves (3, 5)
+    assert snake.is_occupied((6, 5))
+    assert not snake.is_occupied((3, 5))
+
+    snake.grow()
+    snake.move()  # Tail stays at (4, 5)
+    assert snake.is_occupied((4, 5))
+    assert snake.get_length() == 4
+    assert list(snake.get_body_positions()) == [(7, 5), (6, 5), (5, 5), (4, 5)]
+
+def test_snake_moving_into_vacated_tail_is_not_collision():
+    """Test that the head may follow directly into the cell the tail leaves."""
+    snake = Snake((5, 5), initial_length=4)
+    for direction in (Vector2(0, 1), Vector2(-1, 0), Vector2(0, -1)):
+        snake.change_direction(direction)
+        snake.move()
+
+    assert snake.get_head_position() == (4, 5)
+    assert not snake.check_collision()
+
+def test_snake_last_turn_before_a_move_wins():
+    """Test that only the last of several turns between moves is taken."""
+    snake = Snake((5, 5))
+    snake.change_direction(Vector2(0, -1))
+    snake.change_direction(Vector2(0, 1))
+    snake.move()
+    assert snake.get_head_position() == (5, 6)
@@ -0,0 +1,109 @@
+"""Test cases for the sound effect channel pool."""
+import pygame
+import pytest
+from src.audio.sound_manager import MusicTrack, SoundEffect, SoundManager
+from src.utils.timing import VirtualClock
+
+@pytest.fixture
+def mixer(monkeypatch, tmp_path):
+    """Open the mixer on the dummy audio driver, caching sounds in a temporary directory."""
+    monkeypatch.setenv('SNAKE_ASSET_CACHE', str(tmp_path))
+    monkeypatch.setenv('SDL_AUDIODRIVER', 'dummy')
+    pygame.mixer.init()
+    yield
+    pygame.mixer.quit()
+
+def make_manager(channels=8):
+    """Create a sound manager whose effects all last long enough to keep channels busy."""
+    manager = SoundManager(VirtualClock(), channels)
+    tone = bytes(44100 * 4 * 10)  # Ten seconds of silence
+    manager.sounds = {effect: pygame.mixer.Sound(buffer=tone) for effect in SoundEffect}
+    return manager
+
+def test_repeated_moves_are_coalesced_and_hold_one_voice(mixer):
+    """Test the rate limit and the per-effect voice limit."""
+    manager = make_manager()
+    for _ in range(10):
+        manager.play_sound(SoundEffect.MOVE)
+    assert manager.stats.played == 1
+    assert manager.stats.coalesced == 9
+
+    for _ in range(10):
+        manager.clock.advance(0.1)
+        assert manager.play_sound(SoundEffect.MOVE)
+    busy = [channel for channel in manager.channels if channel.get_busy()]
+    assert len(busy) == 1
+    assert manager.stats.stolen == 10
+
+def test_important_sounds_steal_voices_from_lesser_ones(mixer):
+    """Test that a full pool gives way to more important sounds only."""
+    manager = make_manager(channels=3)
+    for effect in (SoundEffect.MOVE, SoundEffect.SHIELD, SoundEffect.GAME_OVER):
+        manager.play_sound(effect)
+    manager.clock.advance(1)
+
+    assert manager.play_sound(SoundEffect.EAT)
+    assert manager._voices == [SoundEffect.EAT, SoundEffect.SHIELD, SoundEffect.GAME_OVER]
+    assert manager.play_sound(SoundEffect.EAT)
+    assert manager._voices == [SoundEffect.EAT, SoundEffect.EAT, SoundEffect.GAME_OVER]
+    assert not manager.play_sound(SoundEffect.MOVE)
+    assert not manager.play_sound(SoundEffect.SCORE)
+
+    # Effects at their voice limit restart their oldest voice
+    first, second = manager._started[:2]
+    assert manager.play_sound(SoundEffect.EAT)
+    assert manager._started[0] > second > first
+    assert manager.play_sound(SoundEffect.GAME_OVER)
+    assert all(channel.get_busy() for channel in manager.channels)
+    assert str(manager.stats) == 'sfx 7/9 played, 0 coalesced, 4 stolen, 2 dropped'
+
+def test_deferred_loading_starts_the_music_asked_for(mixer):
+    """Test that music requested before loading plays once it has loaded."""
+    manager = SoundManager(VirtualClock(), load=False)
+    manager.play_music(MusicTrack.GAME)
+    manager.pause_music()
+    assert not manager.play_sound(SoundEffect.EAT)
+    assert manager.current_music is None
+
+    manager.load()
+    manager.start_pending_music()
+    assert manager.current_music == MusicTrack.GAME
+    current = manager.music_channels[0]
+    assert current.get_sound() is manager.music_tracks[MusicTrack.GAME]
+    manager.unpause_music()
+    assert current.get_busy()
+
+def test_music_crossfades_on_its_own_channels(mixer):
+    """Test that synthesized tracks switch between the two music channels."""
+    manager = make_manager(channels=3)
+    assert set(manager.music_tracks) == set(MusicTrack)
+    assert not manager.channels[0].get_busy()
+
+    manager.play_music(MusicTrack.GAME)
+    first = manager.music_channels[0]
+    manager.play_music(MusicTrack.GAME_FAST, fade_ms=500)
+    second = manager.music_channels[0]
+    assert second is not first
+    assert second.get_sound() is manager.music_tracks[MusicTrack.GAME_FAST]
+    assert first.get_busy() and second.get_busy()  # Fading across
+    assert manager.play_sound(SoundEffect.EAT)
+    assert first.get_sound() is manager.music_tracks[MusicTrack.GAME]
+
+    manager.stop_music()
+    assert manager.current_music is None
+    assert not first.get_busy() and not second.get_busy()
+
+def test_missing_audio_device_leaves_the_game_silent(monkeypatch, capsys):
+    """Test that a mixer that cannot open is not fatal."""
+    monkeypatch.setenv('SDL_AUDIODRIVER', 'no-such-driver')
+    manager = SoundManager(VirtualClock(), load=False)
+    manager.play_music(MusicTrack.GAME)
+    manager.load()
+    assert 'No audio' in capsys.readouterr().out
+    assert manager.loaded and not pygame.mixer.get_init()
+
+    manager.start_pending_music()
+    manager.pause_music()
+    manager.set_music_volume(0.2)
+    assert not manager.play_sound(SoundEffect.EAT)
+    manager.stop_music()
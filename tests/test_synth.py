@@ -0,0 +1,49 @@
+"""Test cases for sound synthesis and its on-disk cache."""
+import os
+import numpy as np
+import pygame
+import pytest
+from src.audio.synth import MUSIC_PATCHES, SOUND_PATCHES, Synthesizer, Voice, render_patch, render_voice
+
+@pytest.fixture
+def mixer(monkeypatch):
+    """Open the mixer on the dummy audio driver."""
+    monkeypatch.setenv('SDL_AUDIODRIVER', 'dummy')
+    pygame.mixer.init(44100, -16, 2)
+    yield
+    pygame.mixer.quit()
+
+def test_voice_plays_notes_at_their_pitch():
+    """Test note timing, pitch, rests and the volume limit."""
+    samples = render_voice(Voice('pulse', (69, None), 0.1, volume=0.5), 44100)
+    assert len(samples) == 8820
+    assert np.abs(samples).max() == pytest.approx(0.5)
+    assert not samples[4410:].any()
+
+    # 440 Hz for 0.1 s crosses zero upwards 44 times
+    rising = np.count_nonzero((samples[:4409] <= 0) & (samples[1:4410] > 0))
+    assert rising == 44
+
+def test_patch_is_mixed_to_16_bit_frames():
+    """Test the layout of rendered PCM."""
+    patch = (Voice('triangle', (60,), 0.2), Voice('noise', (90, 90), 0.05, volume=1.0))
+    pcm = render_patch(patch, 22050, 2)
+    assert pcm.shape == (4410, 2) and pcm.dtype == np.int16
+    assert (pcm[:, 0] == pcm[:, 1]).all()
+    assert np.abs(pcm.astype(int)).max() <= 32767
+
+def test_cached_sounds_are_loaded_unchanged(mixer, tmp_path):
+    """Test that a second launch reads every sound back instead of rendering it."""
+    names = list(SOUND_PATCHES) + list(MUSIC_PATCHES)
+    first = Synthesizer(str(tmp_path))
+    sounds = {name: first.sound(name).get_raw() for name in names}
+    assert first.synthesized == len(names)
+    assert len(sounds['game']) == round(0.14 * 44100) * 32 * 4  # 32 steps, 4 bytes a frame
+    assert len(os.listdir(tmp_path)) == len(names)
+
+    second = Synthesizer(str(tmp_path))
+    assert {name: second.sound(name).get_raw() for name in names} == sounds
+    assert (second.synthesized, second.loaded) == (0, len(names))
+
+    uncached = Synthesizer(use_cache=False)
+    assert uncached.sound('eat').get_raw() == sounds['eat']
@@ -0,0 +1,106 @@
+"""Test cases for clocks and the fixed-timestep scheduler."""
+import threading
+import pytest
+from src.utils.timing import (
+    FixedTimestepScheduler, FrameStats, ScaledClock, StartupTrace, VirtualClock
+)
+
+def run_frame(scheduler, tick_interval):
+    """Count the ticks the scheduler hands out for one frame."""
+    scheduler.update()
+    ticks = 0
+    while scheduler.consume(tick_interval):
+        ticks += 1
+    return ticks
+
+def test_scheduler_catches_up_on_slow_frames():
+    """Test that a long frame runs several ticks and keeps the remainder."""
+    clock = VirtualClock()
+    scheduler = FixedTimestepScheduler(clock)
+
+    clock.advance(0.625)
+    assert run_frame(scheduler, 0.25) == 2
+
+    clock.advance(0.125)
+    assert run_frame(scheduler, 0.25) == 1
+
+def test_scheduler_runs_no_tick_on_fast_frames():
+    """Test that frames shorter than a tick accumulate."""
+    clock = VirtualClock()
+    scheduler = FixedTimestepScheduler(clock)
+
+    ticks = 0
+    for _ in range(6):
+        clock.advance(1 / 64)
+        ticks += run_frame(scheduler, 1 / 32)
+
+    assert ticks == 3
+
+def test_scheduler_drops_backlog_beyond_limit():
+    """Test that a stall does not queue up unlimited ticks."""
+    clock = VirtualClock()
+    scheduler = FixedTimestepScheduler(clock, max_ticks_per_frame=4)
+
+    clock.advance(10.0)
+    assert run_frame(scheduler, 0.1) == 4
+    assert run_frame(scheduler, 0.1) == 1
+
+def test_scheduler_ignores_time_while_paused():
+    """Test that paused time is never turned into ticks."""
+    clock = VirtualClock()
+    scheduler = FixedTimestepScheduler(clock)
+
+    scheduler.pause()
+    clock.advance(5.0)
+    assert run_frame(scheduler, 0.125) == 0
+
+    scheduler.resume()
+    clock.advance(0.125)
+    assert run_frame(scheduler, 0.125) == 1
+
+def test_unbounded_scheduler_runs_full_frames():
+    """Test that unbounded mode always runs the per-frame limit."""
+    scheduler = FixedTimestepScheduler(VirtualClock(), max_ticks_per_frame=50, unbounded=True)
+    assert run_frame(scheduler, 0.1) == 50
+
+def test_scaled_clock_runs_faster():
+    """Test that a scaled clock multiplies elapsed time."""
+    base = VirtualClock(3.0)
+    clock = ScaledClock(10, base)
+
+    base.advance(0.5)
+
+    assert clock.now() == pytest.approx(5.0)
+
+def test_frame_stats_report_cpu_time_per_wall_second():
+    """Test that averages cover whole windows and reset between them."""
+    clock, cpu = VirtualClock(), VirtualClock()
+    stats = FrameStats(clock, cpu.now, interval=1.0)
+    for _ in range(29):
+        clock.advance(0.025)
+        cpu.advance(0.005)
+        assert not stats.frame()
+    clock.advance(0.275)  # A long idle frame burning no CPU
+    assert stats.frame()
+    assert stats.fps == pytest.approx(30)
+    assert stats.cpu_load == pytest.approx(0.145)
+    assert str(stats) == '30 fps, CPU 14%'
+
+def test_startup_trace_orders_phases_from_every_thread():
+    """Test that phases and milestones are reported in time order."""
+    trace = StartupTrace(origin=0.0)
+    trace.add('imports', 0.0, 0.05)
+    trace.marks.append(('first frame', 0.08))
+    worker = threading.Thread(target=trace.add, args=('sounds', 0.09, 0.2), name='loader')
+    worker.start()
+    worker.join()
+    trace.add('window', 0.05, 0.07)
+
+    lines = trace.report().splitlines()
+    assert [line.split()[-2:] for line in lines[1:]] == [
+        ['imports', '[MainThread]'], ['window', '[MainThread]'],
+        ['first', 'frame'], ['sounds', '[loader]']]
+    assert lines[4].split()[:2] == ['90.0', '110.0']
+    with trace.phase('render'):
+        pass
+    assert trace.phases[-1][0] == 'render'
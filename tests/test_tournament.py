@@ -0,0 +1,25 @@
+"""Test cases for the tournament runner."""
+import pytest
+from src.tournament import run_tournament, summarize
+
+def test_tournament_results_do_not_depend_on_sharding():
+    """Test that every seed is played once with the same outcome however it is split."""
+    seeds = list(range(12))
+    single = [r for batch in run_tournament('greedy', seeds, 1, 12, max_ticks=300) for r in batch]
+    sharded = [r for batch in run_tournament('greedy', seeds, 2, 5, max_ticks=300) for r in batch]
+
+    assert sorted(single, key=lambda r: r['seed']) == sorted(sharded, key=lambda r: r['seed'])
+    assert len(single) == len(seeds)
+
+def test_summary_reports_throughput():
+    """Test aggregation of per-game results."""
+    results = [
+        {'seed': 0, 'score': 4, 'length': 5, 'ticks': 100, 'power_ups': 1},
+        {'seed': 1, 'score': 2, 'length': 3, 'ticks': 300, 'power_ups': 0},
+    ]
+    summary = summarize(results, 2.0, 1)
+
+    assert summary['games_per_s'] == 1.0
+    assert summary['ticks_per_s'] == 200.0
+    assert summary['mean_score'] == 3.0
+    assert summary['max_length'] == 5